@@ -0,0 +1,97 @@
+"""Concurrent requests through the async services.
+
+Run with ``python -m benchmarks.bench_async [--requests N] [--tasks T] [--backend memory|sqlite]``.
+Fires N ``add_task`` calls and N edits at once with ``asyncio.gather``, then
+runs a full-scan ``find_tasks`` over T tasks through the async service and
+inline while a ticker measures how late the event loop wakes up. Through the
+async service the scan runs on a worker thread, so the loop keeps ticking.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from dataclasses import replace
+
+from todolist.config.settings import Settings
+from todolist.core.domain.task import Task
+from todolist.core.services.async_project_service import AsyncProjectService
+from todolist.core.services.async_task_service import AsyncTaskService, AsyncUpdateTask
+from todolist.core.services.project_service import ProjectService
+from todolist.core.services.task_service import TaskService, UpdateTask
+from todolist.data.factory import create_repositories
+
+
+async def ticker(stop: asyncio.Event, lags: list) -> None:
+    interval = 0.005
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def max_lag(work) -> float:
+    stop = asyncio.Event()
+    lags: list = [0.0]
+    tick = asyncio.ensure_future(ticker(stop, lags))
+    await asyncio.sleep(0.02)
+    await work()
+    stop.set()
+    await tick
+    return max(lags)
+
+
+async def run(settings: Settings, requests: int, preload: int) -> None:
+    sync_projects, sync_tasks = create_repositories(settings)
+    sync_service = TaskService(sync_tasks, sync_projects, settings = settings)
+    projects = AsyncProjectService(ProjectService(sync_projects, sync_tasks, settings = settings))
+    tasks = AsyncTaskService(sync_service)
+    update = AsyncUpdateTask(UpdateTask(sync_tasks))
+
+    project = await projects.create_project("bench")
+    for i in range(preload):
+        sync_tasks.add(Task(id = sync_tasks.next_available_id(), project_id = project.id, name = f"preloaded {i}"))
+
+    start = time.perf_counter()
+    added = await asyncio.gather(*(tasks.add_task(project.id, name = f"task {i}") for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    print(f"{requests} concurrent add_task: {elapsed:.3f}s ({requests / elapsed:,.0f}/s)")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(update.edit_task_name(t.id, name = f"renamed {t.id}") for t in added))
+    elapsed = time.perf_counter() - start
+    print(f"{requests} concurrent edits:    {elapsed:.3f}s ({requests / elapsed:,.0f}/s)")
+
+    threaded = await max_lag(lambda: tasks.find_tasks(order_by = "-deadline"))
+
+    async def inline() -> None:
+        sync_service.find_tasks(order_by = "-deadline")
+
+    blocking = await max_lag(inline)
+    print(f"event loop lag during find over {preload + requests} tasks: "
+          f"{threaded * 1e3:.1f}ms threaded, {blocking * 1e3:.1f}ms inline")
+    sync_tasks.close()
+    sync_projects.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--requests", type = int, default = 5000)
+    parser.add_argument("--tasks", type = int, default = 200_000)
+    parser.add_argument("--backend", choices = ("memory", "sqlite"), default = "memory")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = replace(
+            Settings(),
+            MAX_TASKS = args.requests + args.tasks,
+            STORAGE_BACKEND = args.backend,
+            DATA_DIR = os.path.join(tmp, "data"),
+        )
+        asyncio.run(run(settings, args.requests, args.tasks))
+
+
+if __name__ == "__main__":
+    main()
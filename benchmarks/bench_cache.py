@@ -0,0 +1,154 @@
+"""Service lookups on the sqlite backend with and without the read-through caches.
+
+Run with ``python -m benchmarks.bench_cache [--projects N] [--tasks N] [--ops N] [--cache-size N]``.
+Two workloads run with traffic skewed toward a hot set: bare lookups (a
+project by name or id, a task by id, as services make before every
+operation), and mixed service calls (stats, listings, status changes,
+renames). Each reports operations per second with and without caches, and
+the cached run prints hit, miss and eviction counters and then checks that
+every cached lookup matches the wrapped repository. Exits with status 1 if
+one does not.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from typing import Callable, List
+
+from todolist.config.settings import Settings
+from todolist.core.domain.status import TaskStatus
+from todolist.core.repositories.project_repository import ProjectRepository
+from todolist.core.repositories.task_repository import TaskRepository
+from todolist.core.services.project_service import ProjectService, UpdateProject
+from todolist.core.services.task_service import TaskService, UpdateTask
+from todolist.data.factory import create_repositories
+from todolist.data.repositories.caching_repository import CachingProjectRepository, CachingTaskRepository
+
+STATUSES = list(TaskStatus)
+
+
+def lookups(project_repo: ProjectRepository, task_repo: TaskRepository, ops: int, rng: random.Random) -> None:
+    """Resolve projects by name and id and read tasks, as services do before every operation."""
+    n_projects: int = project_repo.count()
+    n_tasks: int = task_repo.next_available_id() - 1
+    for i in range(ops):
+        project_id: int = _skewed(rng, n_projects)
+        if i % 3 == 0:
+            project_repo.get_by_name(f"project {project_id}")
+        elif i % 3 == 1:
+            project_repo.get_by_id(project_id)
+        else:
+            task_repo.get_by_id(_skewed(rng, n_tasks))
+
+
+def services(project_repo: ProjectRepository, task_repo: TaskRepository, ops: int, rng: random.Random) -> None:
+    """Mixed service traffic: stats, listings, status changes and renames."""
+    tasks = TaskService(task_repo, project_repo, settings = Settings(MAX_TASKS = 1 << 30))
+    update = UpdateTask(task_repo)
+    rename = UpdateProject(project_repo)
+    n_projects: int = project_repo.count()
+    n_tasks: int = task_repo.next_available_id() - 1
+    for i in range(ops):
+        project_id: int = _skewed(rng, n_projects)
+        kind: int = i % 10
+        if kind < 4:
+            tasks.stats(f"project {project_id}")
+        elif kind < 6:
+            tasks.list_tasks_by_project(f"project {project_id}", limit = 10)
+        elif kind < 9:
+            task_id: int = _skewed(rng, n_tasks)
+            task = task_repo.get_by_id(task_id)
+            update.change_status(task_id, STATUSES[(STATUSES.index(task.status) + 1) % 3])
+        else:
+            project = project_repo.get_by_id(project_id)
+            # rename and rename back, so names stay resolvable
+            rename.edit_project_name(project_id, name = project.name + "!")
+            rename.edit_project_name(project_id, name = project.name)
+
+
+def _skewed(rng: random.Random, n: int) -> int:
+    # most traffic goes to a small hot set
+    return int(rng.paretovariate(1.2) * 3) % n + 1
+
+
+def run(settings: Settings, workload: Callable, ops: int) -> float:
+    project_repo, task_repo = create_repositories(settings)
+    start = time.perf_counter()
+    workload(project_repo, task_repo, ops, random.Random(1))
+    rate: float = ops / (time.perf_counter() - start)
+    if isinstance(project_repo, CachingProjectRepository) and isinstance(task_repo, CachingTaskRepository):
+        for label, stats in (
+            ("project ids", project_repo.by_id.stats()),
+            ("project names", project_repo.by_name.stats()),
+            ("task ids", task_repo.by_id.stats()),
+        ):
+            print(
+                f"    {label:<14} hit rate {stats.hit_rate:6.1%}  hits {stats.hits:>8,}  misses {stats.misses:>7,}"
+                f"  evictions {stats.evictions:>6,}  size {stats.size:,}/{stats.capacity:,}"
+            )
+        FAILURES.extend(stale(project_repo, task_repo))
+    task_repo.close()
+    project_repo.close()
+    return rate
+
+
+def stale(project_repo: CachingProjectRepository, task_repo: CachingTaskRepository) -> List[str]:
+    """Compare every cached lookup with a read from the wrapped repository."""
+    failures: List[str] = []
+    for project in project_repo.repo.list_all_projects():
+        if project_repo.get_by_name(project.name.upper()) != project or project_repo.get_by_id(project.id) != project:
+            failures.append(f"project {project.name!r} is stale")
+        for task in task_repo.repo.list_by_project(project.id):
+            if task_repo.get_by_id(task.id) != task:
+                failures.append(f"task {task.id} is stale")
+    return failures
+
+
+FAILURES: List[str] = []
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--projects", type = int, default = 200)
+    parser.add_argument("--tasks", type = int, default = 50)
+    parser.add_argument("--ops", type = int, default = 50_000)
+    parser.add_argument("--cache-size", type = int, default = 1024)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = replace(
+            Settings(),
+            MAX_PROJECTS = args.projects,
+            MAX_TASKS = args.tasks,
+            STORAGE_BACKEND = "sqlite",
+            DATA_DIR = os.path.join(tmp, "data"),
+        )
+        project_repo, task_repo = create_repositories(settings)
+        seed_service = TaskService(task_repo, project_repo, settings = settings)
+        projects = ProjectService(project_repo, task_repo, settings = settings)
+        for p in range(1, args.projects + 1):
+            projects.create_project(f"project {p}")
+            for t in range(args.tasks):
+                seed_service.add_task(p, name = f"task {t}")
+        task_repo.close()
+        project_repo.close()
+
+        print(f"sqlite, {args.projects} projects x {args.tasks} tasks, {args.ops:,} operations each")
+        cached_settings = replace(settings, CACHE_SIZE = args.cache_size)
+        for name, workload in (("lookups", lookups), ("services", services)):
+            plain = run(settings, workload, args.ops)
+            print(f"  {name:<9} no cache        {plain:>10,.0f} ops/s")
+            cached = run(cached_settings, workload, args.ops)
+            print(f"  {name:<9} cache of {args.cache_size:<6} {cached:>10,.0f} ops/s  ({cached / plain:.1f}x)")
+    for failure in FAILURES:
+        print(f"STALE: {failure}")
+    return 1 if FAILURES else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
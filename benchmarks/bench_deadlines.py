@@ -0,0 +1,150 @@
+"""Deadline queries from the scheduler against scanning every task.
+
+Run with ``python -m benchmarks.bench_deadlines [--tasks N] [--ops N] [--backend NAME]``.
+Seeds ``--tasks`` tasks, most of them with deadlines, and times
+``overdue()`` and ``next_due(10)`` on a ``DeadlineScheduler`` against the
+same answers computed with ``TaskService.find_tasks``. Then it runs
+``--ops`` random deadline changes, status changes, adds and deletes through
+the services, reporting what keeping the scheduler current adds per call,
+and checks that the scheduler still agrees with a scan and that ``tick()``
+reported every task whose deadline passed. Exits with status 1 if it does
+not.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from datetime import date, timedelta
+from typing import Callable, List, Set
+
+from todolist.config.settings import Settings
+from todolist.core.domain.project import Project
+from todolist.core.domain.status import TaskStatus
+from todolist.core.domain.task import Task
+from todolist.core.services.deadline_service import OPEN, DeadlineScheduler
+from todolist.core.services.project_service import ProjectService
+from todolist.core.services.task_service import TaskService, UpdateTask
+from todolist.data.factory import create_repositories
+
+TODAY = date(2024, 6, 1)
+STATUSES = list(TaskStatus)
+
+
+def per_call(fn: Callable[[], object], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def workload(tasks: TaskService, update: UpdateTask, project_ids: List[int], ops: int, seed: int) -> float:
+    rng = random.Random(seed)
+    task_ids: List[int] = [t.id for p in project_ids for t in tasks.list_tasks_by_project(p)]
+    start = time.perf_counter()
+    for i in range(ops):
+        choice = i % 4
+        if choice == 0:
+            update.edit_task_deadline(rng.choice(task_ids), deadline = TODAY + timedelta(days = rng.randint(-30, 30)))
+        elif choice == 1:
+            update.change_status(rng.choice(task_ids), rng.choice(STATUSES))
+        elif choice == 2:
+            task = tasks.add_task(rng.choice(project_ids), name = f"new {i}", deadline = TODAY + timedelta(days = rng.randint(-5, 60)))
+            task_ids.append(task.id)
+        else:
+            j = rng.randrange(len(task_ids))
+            task_ids[j], task_ids[-1] = task_ids[-1], task_ids[j]
+            tasks.delete_task(task_ids.pop())
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type = int, default = 200_000)
+    parser.add_argument("--ops", type = int, default = 20_000)
+    parser.add_argument("--backend", default = "memory")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = replace(
+            Settings(),
+            MAX_PROJECTS = 1 << 30,
+            MAX_TASKS = 1 << 30,
+            STORAGE_BACKEND = args.backend,
+            DATA_DIR = os.path.join(tmp, "data"),
+        )
+        project_repo, task_repo = create_repositories(settings)
+        rng = random.Random(1)
+        project_ids: List[int] = []
+        for i in range(0, args.tasks, 100):
+            project = project_repo.add(Project(id = project_repo.next_available_id(), name = f"project {i // 100}"))
+            project_ids.append(project.id)
+            for j in range(min(100, args.tasks - i)):
+                deadline = TODAY + timedelta(days = rng.randint(-60, 365)) if j % 5 else None
+                task_repo.add(Task(id = task_repo.next_available_id(), project_id = project.id, name = f"task {j}",
+                                   status = STATUSES[j % 3], deadline = deadline))
+
+        scheduler = DeadlineScheduler(task_repo)
+        tasks = TaskService(task_repo, project_repo, settings = settings, deadlines = scheduler)
+        update = UpdateTask(task_repo, deadlines = scheduler)
+        plain_tasks = TaskService(task_repo, project_repo, settings = settings)
+        plain_update = UpdateTask(task_repo)
+
+        # plain writes first: the scheduler would miss them once built
+        plain = workload(plain_tasks, plain_update, project_ids, args.ops, 2)
+        start = time.perf_counter()
+        scheduler.rebuild()
+        print(f"{args.tasks:,} tasks on {args.backend}; scheduler built in {time.perf_counter() - start:.2f}s")
+
+        def scan_overdue() -> List[Task]:
+            return plain_tasks.find_tasks(status = OPEN, due_before = TODAY, order_by = "deadline")
+
+        def scan_next_due() -> List[Task]:
+            return plain_tasks.find_tasks(status = OPEN, due_after = TODAY, order_by = "deadline", limit = 10)
+
+        scan = per_call(scan_next_due, 20)
+        heap = per_call(lambda: scheduler.next_due(10, TODAY), 2000)
+        print(f"  next_due(10):  scan {scan * 1e3:8.2f} ms   scheduler {heap * 1e6:8.1f} us")
+        overdue_count: int = len(scan_overdue())
+        scan = per_call(scan_overdue, 20)
+        heap = per_call(lambda: scheduler.overdue(TODAY), 20)
+        print(f"  overdue() of {overdue_count:,}: scan {scan * 1e3:8.2f} ms   scheduler {heap * 1e3:8.2f} ms")
+
+        fired: List[int] = []
+        scheduler.on_overdue(lambda due: fired.extend(t.id for t in due))
+        scheduler.tick(TODAY)
+        tracked = workload(tasks, update, project_ids, args.ops, 3)
+        print(f"  {args.ops:,} writes: {plain / args.ops * 1e6:6.1f} us/op plain, {tracked / args.ops * 1e6:6.1f} us/op with the scheduler")
+
+        failures: List[str] = []
+        for when in (TODAY, TODAY + timedelta(days = 20)):
+            expected = [t.id for t in scan_overdue()] if when == TODAY else \
+                [t.id for t in plain_tasks.find_tasks(status = OPEN, due_before = when, order_by = "deadline")]
+            got = [t.id for t in scheduler.overdue(when)]
+            if sorted(got) != sorted(expected):
+                failures.append(f"overdue({when}) has {len(got)} tasks, a scan finds {len(expected)}")
+        expected_next = [(t.deadline, t.id) for t in scan_next_due()]
+        got_next = [(t.deadline, t.id) for t in scheduler.next_due(10, TODAY)]
+        if [d for d, _ in got_next] != [d for d, _ in expected_next]:
+            failures.append(f"next_due deadlines {got_next} differ from a scan's {expected_next}")
+        later = TODAY + timedelta(days = 20)
+        scheduler.tick(later)
+        passed: Set[int] = {t.id for t in plain_tasks.find_tasks(status = OPEN, due_before = later)}
+        if not passed <= set(fired):
+            failures.append(f"tick() missed {len(passed - set(fired))} tasks whose deadline passed")
+        task_repo.close()
+        project_repo.close()
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("scheduler agrees with a full scan")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""Incremental views from the change feed against rescanning the repositories.
+
+Run with ``python -m benchmarks.bench_feed [--tasks N] [--ops N] [--backend NAME] [--queue-size N]``.
+Seeds ``--tasks`` tasks in a store whose repositories publish to a
+``ChangeFeed``, and keeps per-project status counts in two views: one
+applying changes as they are published, one reading them from a queue of
+``--queue-size`` changes and refreshed every 100 operations (reloading when
+the queue overflows). ``--ops`` random service calls follow, some of them in
+units of work that raise and roll back.
+
+Reports the cost per write with and without the feed, and reading the
+counts from a view against recounting them. Checks that both views match a
+rescan, that sequence numbers grew by one per change, and that rolled-back
+units of work published nothing. Exits with status 1 if a check fails.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import replace
+from typing import Dict, List, Tuple
+
+from todolist.config.settings import Settings
+from todolist.core.domain.project import Project
+from todolist.core.domain.status import TaskStatus
+from todolist.core.domain.task import Task
+from todolist.core.repositories.change_feed import PROJECT, Change, ChangeFeed, MaterializedView
+from todolist.core.repositories.project_repository import ProjectRepository
+from todolist.core.repositories.task_repository import TaskRepository
+from todolist.core.repositories.unit_of_work import UnitOfWork
+from todolist.core.services.project_service import ProjectService
+from todolist.core.services.task_service import TaskService, UpdateTask
+from todolist.data.factory import create_repositories
+
+STATUSES = list(TaskStatus)
+Counts = Dict[Tuple[int, TaskStatus], int]
+
+
+def recount(project_repo: ProjectRepository, task_repo: TaskRepository) -> Counts:
+    counts: Counter = Counter()
+    for project in project_repo.list_all_projects():
+        for task in task_repo.list_by_project(project.id):
+            counts[project.id, task.status] += 1
+    return dict(counts)
+
+
+class StatusCounts(MaterializedView):
+    """Tasks per project and status."""
+
+    def __init__(self, feed: ChangeFeed, project_repo: ProjectRepository, task_repo: TaskRepository, **options) -> None:
+        self.project_repo = project_repo
+        self.task_repo = task_repo
+        super().__init__(feed, **options)
+
+    def load(self) -> None:
+        self.counts: Counter = Counter(recount(self.project_repo, self.task_repo))
+
+    def apply(self, change: Change) -> None:
+        if change.entity == PROJECT:
+            return
+        if change.before is not None:
+            self.counts[change.before.project_id, change.before.status] -= 1
+        if change.after is not None:
+            self.counts[change.after.project_id, change.after.status] += 1
+
+    def snapshot(self) -> Counts:
+        self.refresh()
+        return {key: n for key, n in self.counts.items() if n}
+
+
+class Abort(Exception):
+    pass
+
+
+def workload(uow: UnitOfWork, projects: ProjectService, tasks: TaskService, update: UpdateTask, ops: int, seed: int, on_step=None) -> float:
+    rng = random.Random(seed)
+    project_ids: List[int] = [p.id for p in projects.list_projects()]
+    task_ids: List[int] = [t.id for p in project_ids for t in tasks.list_tasks_by_project(p)]
+    start = time.perf_counter()
+    for i in range(ops):
+        choice = i % 10
+        if choice < 3 and task_ids:
+            update.change_status(rng.choice(task_ids), rng.choice(STATUSES))
+        elif choice < 5:
+            task_ids.append(tasks.add_task(rng.choice(project_ids), name = f"new {i}").id)
+        elif choice < 7 and task_ids:
+            j = rng.randrange(len(task_ids))
+            task_ids[j], task_ids[-1] = task_ids[-1], task_ids[j]
+            tasks.delete_task(task_ids.pop())
+        elif choice == 7:
+            project_ids.append(projects.create_project(f"p{seed}-{i}").id)
+        elif choice == 8 and len(project_ids) > 1:
+            doomed = project_ids.pop(rng.randrange(len(project_ids)))
+            projects.delete_project(doomed)
+            task_ids = [t for t in task_ids if tasks.task_repo.get_by_id(t) is not None]
+        else:
+            # a unit of work that rolls back: none of its writes may reach the feed
+            try:
+                with uow:
+                    uow.tasks.add(Task(id = uow.tasks.next_available_id(), project_id = project_ids[0], name = "ghost"))
+                    if task_ids:
+                        update.change_status(rng.choice(task_ids), TaskStatus.DONE)
+                    uow.tasks.remove_by_project(project_ids[-1])
+                    raise Abort()
+            except Abort:
+                pass
+        if on_step is not None:
+            on_step(i)
+    return time.perf_counter() - start
+
+
+def seed_store(settings: Settings, size: int, feed: ChangeFeed = None):
+    project_repo, task_repo = create_repositories(settings, feed = feed)
+    for i in range(0, size, 100):
+        project = project_repo.add(Project(id = project_repo.next_available_id(), name = f"project {i // 100}"))
+        for j in range(min(100, size - i)):
+            task_repo.add(Task(id = task_repo.next_available_id(), project_id = project.id, name = f"task {j}", status = STATUSES[j % 3]))
+    uow = UnitOfWork(project_repo, task_repo)
+    projects = ProjectService(uow.projects, uow.tasks, settings = settings, uow = uow)
+    tasks = TaskService(uow.tasks, uow.projects, settings = settings, uow = uow)
+    return project_repo, task_repo, uow, projects, tasks, UpdateTask(uow.tasks)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type = int, default = 100_000)
+    parser.add_argument("--ops", type = int, default = 20_000)
+    parser.add_argument("--backend", default = "memory")
+    parser.add_argument("--queue-size", type = int, default = 1024)
+    args = parser.parse_args()
+    failures: List[str] = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = replace(Settings(), MAX_PROJECTS = 1 << 30, MAX_TASKS = 1 << 30, STORAGE_BACKEND = args.backend)
+        plain_repos = seed_store(replace(settings, DATA_DIR = os.path.join(tmp, "plain")), args.tasks)
+        plain = workload(*plain_repos[2:], args.ops, 1)
+        plain_repos[0].close()
+        plain_repos[1].close()
+
+        feed = ChangeFeed()
+        project_repo, task_repo, uow, projects, tasks, update = seed_store(replace(settings, DATA_DIR = os.path.join(tmp, "feed")), args.tasks, feed)
+        live = StatusCounts(feed, project_repo, task_repo)
+        queued = StatusCounts(feed, project_repo, task_repo, queue_size = args.queue_size)
+        seqs: List[int] = []
+        kinds: Counter = Counter()
+
+        def record(change: Change) -> None:
+            seqs.append(change.seq)
+            kinds[change.kind] += 1
+
+        feed.subscribe(record)
+        reloads: List[int] = [0]
+        original_reload = queued.reload
+
+        def counting_reload() -> None:
+            reloads[0] += 1
+            original_reload()
+
+        queued.reload = counting_reload
+
+        def refresh_sometimes(i: int) -> None:
+            if i % 100 == 99:
+                queued.refresh()
+
+        with_feed = workload(uow, projects, tasks, update, args.ops, 1, refresh_sometimes)
+        print(f"{args.tasks:,} tasks on {args.backend}, {args.ops:,} service calls")
+        print(f"  per call: {plain / args.ops * 1e6:6.1f} us plain, {with_feed / args.ops * 1e6:6.1f} us publishing to the feed and two views")
+        print(f"  changes: {len(seqs):,} ({', '.join(f'{k.value} {n}' for k, n in sorted(kinds.items()))}); queued view reloaded {reloads[0]} times")
+
+        start = time.perf_counter()
+        expected = recount(project_repo, task_repo)
+        scan = time.perf_counter() - start
+        start = time.perf_counter()
+        got_live = live.snapshot()
+        got_queued = queued.snapshot()
+        view = (time.perf_counter() - start) / 2
+        print(f"  status counts: rescan {scan * 1e3:.1f} ms, view {view * 1e3:.2f} ms")
+
+        if got_live != expected:
+            failures.append("the live view differs from a rescan")
+        if got_queued != expected:
+            failures.append("the queued view differs from a rescan")
+        if seqs and seqs != list(range(seqs[0], seqs[0] + len(seqs))):
+            failures.append("sequence numbers are not consecutive")
+        ghosts = [t for p in project_repo.list_all_projects() for t in task_repo.list_by_project(p.id) if t.name == "ghost"]
+        if ghosts:
+            failures.append(f"{len(ghosts)} rolled-back tasks were stored")
+        project_repo.close()
+        task_repo.close()
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("views match a rescan; rolled-back units of work published nothing")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
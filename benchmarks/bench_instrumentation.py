@@ -0,0 +1,70 @@
+"""Per-call overhead of the instrumentation wrappers.
+
+Run with ``python -m benchmarks.bench_instrumentation [--ops N]``. Times
+status changes through ``UpdateTask`` and bare ``get_by_id`` lookups on the
+memory backend, first plain and then with the services and repositories
+instrumented, and prints the difference per call. A status change passes
+through three instrumented calls: ``change_status``, ``get_by_id`` and
+``update``.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, Dict
+
+from todolist.core.domain.project import Project
+from todolist.core.domain.status import TaskStatus
+from todolist.core.domain.task import Task
+from todolist.core.services.task_service import UpdateTask
+from todolist.data.repositories.in_memory_task_repository import InMemoryTaskRepository
+from todolist.instrumentation.hooks import disable, enable, instrument
+
+STATUSES = list(TaskStatus)
+
+
+def measure(instrumented: bool, ops: int) -> Dict[str, float]:
+    registry = enable() if instrumented else None
+    task_repo = instrument(InMemoryTaskRepository())
+    update = instrument(UpdateTask(task_repo))
+    project = Project(id = 1, name = "bench")
+    for i in range(1000):
+        task_repo.add(Task(id = task_repo.next_available_id(), project_id = project.id, name = f"task {i}"))
+    disable()
+
+    def statuses() -> None:
+        for i in range(ops):
+            update.change_status(i % 1000 + 1, STATUSES[i % 3])
+
+    def lookups() -> None:
+        for i in range(ops):
+            task_repo.get_by_id(i % 1000 + 1)
+
+    results: Dict[str, float] = {}
+    for name, fn in (("change_status", statuses), ("get_by_id", lookups)):
+        results[name] = min(_timed(fn) for _ in range(3)) / ops * 1e6
+    if registry is not None:
+        calls = sum(series.calls for _, series in registry.items())
+        print(f"  recorded {calls:,} calls in {len(registry.items())} series")
+    return results
+
+
+def _timed(fn: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--ops", type = int, default = 200_000)
+    args = parser.parse_args()
+
+    plain = measure(False, args.ops)
+    timed = measure(True, args.ops)
+    for name in plain:
+        print(f"{name:<16}{plain[name]:>8.2f} us plain {timed[name]:>8.2f} us instrumented  (+{timed[name] - plain[name]:.2f} us)")
+
+
+if __name__ == "__main__":
+    main()
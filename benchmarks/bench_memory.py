@@ -0,0 +1,61 @@
+"""Per-task memory of the in-memory task repository, object vs compact storage.
+
+Run with ``python -m benchmarks.bench_memory [--tasks N] [--projects P]``.
+Fills an ``InMemoryTaskRepository`` in both modes through ``add`` and reports
+bytes per task as measured by ``tracemalloc`` (indexes included).
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import date
+
+from todolist.core.domain.status import TaskStatus
+from todolist.data.records import task_from_record
+from todolist.data.repositories.in_memory_task_repository import InMemoryTaskRepository
+
+_STATUSES = list(TaskStatus)
+
+
+def measure(compact: bool, tasks: int, projects: int) -> None:
+    gc.collect()
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    repo = InMemoryTaskRepository(compact = compact)
+    first = date(2024, 1, 1).toordinal()
+    for i in range(1, tasks + 1):
+        deadline = first + i % 365 if i % 2 else 0
+        record = (i, 1 + i % projects, f"task {i}", "benchmark task", i % len(_STATUSES), deadline)
+        repo.add(task_from_record(record))
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    label = "compact" if compact else "objects"
+    print(f"{label:8} {tasks} tasks: {(used - base) / tasks:7.1f} bytes/task  (fill {elapsed:.2f}s)")
+
+    start = time.perf_counter()
+    for task_id in range(1, min(tasks, 10_000) + 1):
+        repo.get_by_id(task_id)
+    print(f"{label:8} get_by_id x{min(tasks, 10_000)}: {(time.perf_counter() - start) * 1e3:.2f}ms")
+    start = time.perf_counter()
+    repo.stats_by_project(1, today = date(2024, 7, 1))
+    print(f"{label:8} stats_by_project: {(time.perf_counter() - start) * 1e3:.3f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--tasks", type = int, default = 200_000)
+    parser.add_argument("--projects", type = int, default = 100)
+    args = parser.parse_args()
+
+    measure(False, args.tasks, args.projects)
+    measure(True, args.tasks, args.projects)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Scaling of per-project operations in the in-memory task repository.
+
+Run with ``python -m benchmarks.bench_project_index [--sizes 25000 50000 100000]``.
+For each size N, fills one project with N tasks, moves half of them to a
+second project, then deletes them one by one and reports the cost per
+operation. Per-operation cost should stay flat as N grows; the script exits
+with status 1 when it grows by more than ``--max-ratio`` between the smallest
+and largest size.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Dict, List
+
+from todolist.data.records import task_from_record
+from todolist.data.repositories.in_memory_task_repository import InMemoryTaskRepository
+
+
+def run(size: int, compact: bool) -> Dict[str, float]:
+    repo = InMemoryTaskRepository(compact = compact)
+    timings: Dict[str, float] = {}
+
+    start = time.perf_counter()
+    for i in range(1, size + 1):
+        repo.add(task_from_record((i, 1, f"task {i}", "", 0, 0)))
+    timings["add"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(2, size + 1, 2):
+        task = repo.get_by_id(i)
+        task.project_id = 2
+        repo.update(task)
+    timings["move"] = time.perf_counter() - start
+    if repo.count_by_project(1) != len(list(repo.list_by_project(1))):
+        raise AssertionError("moved tasks are still listed under their old project")
+
+    start = time.perf_counter()
+    for i in range(1, size + 1):
+        repo.remove(i)
+    timings["remove"] = time.perf_counter() - start
+    if list(repo.list_by_project(1)) or list(repo.list_by_project(2)):
+        raise AssertionError("removed tasks are still listed")
+
+    ops = {"add": size, "move": size // 2, "remove": size}
+    return {name: seconds / ops[name] * 1e6 for name, seconds in timings.items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--sizes", type = int, nargs = "+", default = [25_000, 50_000, 100_000])
+    parser.add_argument("--max-ratio", type = float, default = 3.0)
+    args = parser.parse_args()
+
+    failed = False
+    for compact in (False, True):
+        label = "compact" if compact else "objects"
+        results: List[Dict[str, float]] = []
+        for size in sorted(args.sizes):
+            per_op = run(size, compact)
+            results.append(per_op)
+            print(f"{label:8} N={size:>8}: " + "  ".join(f"{name} {us:6.2f}us/op" for name, us in per_op.items()))
+        for name in results[0]:
+            ratio = results[-1][name] / results[0][name]
+            if ratio > args.max_ratio:
+                print(f"{label}: {name} per-op cost grew {ratio:.1f}x")
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
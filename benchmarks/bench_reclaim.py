@@ -0,0 +1,145 @@
+"""Deleting a large project: synchronous cascade against deferred reclamation.
+
+Run with ``python -m benchmarks.bench_reclaim [--tasks N] [--chunk N] [--backend NAME]``.
+Seeds a project of ``--tasks`` tasks next to a small one, through
+repositories publishing to a ``ChangeFeed``, and deletes the large project
+three ways:
+
+* ``cascade``: ``ProjectService`` without a reclaimer, removing every task
+  before ``delete_project`` returns
+* ``background``: thread-safe repositories under a ``ReclaimingTaskRepository``
+  whose thread frees ``--chunk`` tasks at a time
+* ``inline``: plain repositories under a ``ReclaimingTaskRepository`` that
+  frees one chunk after each write
+
+For the deferred modes it times ``delete_project``, the slowest of the
+writes made to the small project while the tasks are freed, and draining
+the rest with ``wait()``.
+
+Checks that the deleted project's tasks are invisible to ``get_by_id``,
+listings, counters and ``find`` from the moment ``delete_project`` returns,
+that progress only grows, and that ``wait()`` leaves none of them stored.
+Exits with status 1 otherwise.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from typing import List, Optional
+
+from todolist.config.settings import Settings
+from todolist.core.domain.project import Project
+from todolist.core.domain.status import TaskStatus
+from todolist.core.domain.task import Task
+from todolist.core.repositories.change_feed import ChangeFeed
+from todolist.core.repositories.reclaiming import ReclaimingTaskRepository
+from todolist.core.repositories.task_query import TaskQuery
+from todolist.core.repositories.unit_of_work import UnitOfWork
+from todolist.core.services.project_service import ProjectService
+from todolist.core.services.task_service import TaskService, UpdateTask
+from todolist.data.factory import create_repositories
+
+STATUSES = list(TaskStatus)
+MODES = ("cascade", "background", "inline")
+
+
+def run(settings: Settings, mode: str, args: argparse.Namespace, failures: List[str]) -> None:
+    feed = ChangeFeed()
+    project_repo, task_repo = create_repositories(settings, thread_safe = mode == "background", feed = feed)
+    reclaimer: Optional[ReclaimingTaskRepository] = None
+    if mode != "cascade":
+        task_repo = reclaimer = ReclaimingTaskRepository(task_repo, chunk = args.chunk, background = mode == "background")
+    uow = UnitOfWork(project_repo, task_repo)
+    projects = ProjectService(uow.projects, uow.tasks, settings = settings, uow = uow, reclaimer = reclaimer)
+    tasks = TaskService(uow.tasks, uow.projects, settings = settings, uow = uow)
+    update = UpdateTask(uow.tasks)
+    try:
+        big = project_repo.add(Project(id = project_repo.next_available_id(), name = "big"))
+        small = projects.create_project("small")
+        with task_repo.batch():
+            for j in range(args.tasks):
+                task_repo.add(Task(id = task_repo.next_available_id(), project_id = big.id, name = f"task {j}", status = STATUSES[j % 3]))
+        kept = [tasks.add_task(small.id, name = f"kept {j}").id for j in range(10)]
+        first = next(iter(task_repo.page_by_project(big.id, 0, 1))).id
+
+        start = time.perf_counter()
+        projects.delete_project(big.id)
+        delete = time.perf_counter() - start
+        if mode == "cascade":
+            print(f"  {mode:<10}  delete_project {delete * 1e3:>9.1f} ms")
+            return
+
+        if task_repo.get_by_id(first) is not None:
+            failures.append(f"{mode}: get_by_id returned a task of the deleted project")
+        if list(task_repo.list_by_project(big.id)) or task_repo.page_by_project(big.id) or task_repo.count_by_project(big.id):
+            failures.append(f"{mode}: listings or counters still show the deleted project's tasks")
+        if task_repo.stats_by_project(big.id).task_count:
+            failures.append(f"{mode}: stats still count the deleted project's tasks")
+        found = task_repo.find(TaskQuery(limit = 10))
+        if [t.id for t in found] != kept:
+            failures.append(f"{mode}: find returned {[t.id for t in found]}, expected the small project's {kept}")
+
+        # writes to the other project while the tasks are freed
+        slowest: float = 0.0
+        freed: List[int] = []
+        writes: int = 0
+        while reclaimer.progress() and writes < 100_000:
+            start = time.perf_counter()
+            update.change_status(kept[writes % len(kept)], STATUSES[writes % 3])
+            slowest = max(slowest, time.perf_counter() - start)
+            writes += 1
+            progress = reclaimer.progress()
+            if progress:
+                freed.append(progress[0].freed)
+        if freed != sorted(freed):
+            failures.append(f"{mode}: progress went backwards")
+        start = time.perf_counter()
+        if not reclaimer.wait(60):
+            failures.append(f"{mode}: wait() timed out")
+        drain = time.perf_counter() - start
+        if reclaimer.repo.count_by_project(big.id):
+            failures.append(f"{mode}: {reclaimer.repo.count_by_project(big.id)} tasks of the deleted project are still stored")
+        if task_repo.count_by_project(small.id) != len(kept):
+            failures.append(f"{mode}: the small project lost tasks")
+        print(f"  {mode:<10}  delete_project {delete * 1e3:>9.3f} ms, slowest of {writes:,} writes while freeing "
+              f"{slowest * 1e3:.2f} ms, wait() {drain * 1e3:.1f} ms")
+    finally:
+        task_repo.close()
+        project_repo.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type = int, default = 300_000)
+    parser.add_argument("--chunk", type = int, default = 1000)
+    parser.add_argument("--backend", default = "memory")
+    args = parser.parse_args()
+
+    failures: List[str] = []
+    print(f"deleting a project of {args.tasks:,} tasks on {args.backend}, chunks of {args.chunk:,}")
+    for mode in MODES:
+        if mode == "background" and args.backend in ("journal", "snapshot"):
+            continue
+        with tempfile.TemporaryDirectory() as tmp:
+            settings = replace(
+                Settings(),
+                MAX_PROJECTS = 1 << 30,
+                MAX_TASKS = 1 << 30,
+                STORAGE_BACKEND = args.backend,
+                DATA_DIR = os.path.join(tmp, "data"),
+            )
+            run(settings, mode, args, failures)
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("deleted tasks stayed invisible and were all freed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
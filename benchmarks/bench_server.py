@@ -0,0 +1,122 @@
+"""Requests per second through ``todolist serve``.
+
+Run with ``python -m benchmarks.bench_server [--clients N] [--requests N] [--batch B] [--workers W] [--backend memory|sqlite|sharded]``.
+Starts a server in a subprocess, then N client threads, each on its own
+persistent connection, send alternating ``task.add`` and ``task.stats``
+calls: first one call per round trip, then B calls per batch. For contrast
+it also times starting a fresh ``todolist`` process, the cost every call
+paid before the server existed.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import List
+
+from todolist.server.client import Client
+
+
+def wait_for(path: str, process: subprocess.Popen, timeout: float = 10.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"server exited with status {process.returncode}")
+        try:
+            Client(path).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise SystemExit("server did not start")
+
+
+def run_clients(path: str, clients: int, requests: int, batch: int) -> float:
+    """Requests per second with ``clients`` connections sending ``batch`` calls per round trip."""
+    per_client = requests // clients
+    barrier = threading.Barrier(clients + 1)
+    errors: List[str] = []
+
+    def work(index: int) -> None:
+        with Client(path) as client:
+            project = f"bench {index}"
+            calls = [
+                ("task.add", {"project": project, "name": f"task {i}"}) if i % 2 == 0 else ("task.stats", {"project": project})
+                for i in range(max(2, batch))
+            ]
+            barrier.wait()
+            sent = 0
+            while sent < per_client:
+                if batch == 1:
+                    method, params = calls[sent % 2]
+                    client.call(method, **params)
+                else:
+                    results = client.batch(calls[:batch])
+                    errors.extend(str(r) for r in results if isinstance(r, Exception))
+                sent += batch
+
+    threads = [threading.Thread(target = work, args = (i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if errors:
+        raise SystemExit(f"calls failed: {errors[0]}")
+    return clients * per_client / elapsed
+
+
+def process_start_seconds(env: dict, runs: int = 5) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        subprocess.run([sys.executable, "-m", "todolist.main", "--help"], env = env, stdout = subprocess.DEVNULL, check = True)
+    return (time.perf_counter() - start) / runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--clients", type = int, default = 4)
+    parser.add_argument("--requests", type = int, default = 20_000)
+    parser.add_argument("--batch", type = int, default = 100)
+    parser.add_argument("--workers", type = int, default = 4)
+    parser.add_argument("--backend", choices = ("memory", "sqlite", "sharded"), default = "memory")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "todolist.sock")
+        env = dict(
+            os.environ,
+            STORAGE_BACKEND = args.backend,
+            DATA_DIR = os.path.join(tmp, "data"),
+            MAX_NUMBER_OF_PROJECT = str(args.clients),
+            MAX_NUMBER_OF_TASK = str(args.requests),
+        )
+        server = subprocess.Popen(
+            [sys.executable, "-m", "todolist.main", "serve", "--socket", path, "--workers", str(args.workers)],
+            env = env,
+            stderr = subprocess.DEVNULL,
+        )
+        try:
+            wait_for(path, server)
+            with Client(path) as client:
+                client.batch([("project.create", {"name": f"bench {i}"}) for i in range(args.clients)])
+            single = run_clients(path, args.clients, args.requests, 1)
+            batched = run_clients(path, args.clients, args.requests, args.batch)
+        finally:
+            server.terminate()
+            server.wait()
+        spawn = process_start_seconds(env)
+
+    print(f"{args.backend} backend, {args.workers} workers, {args.clients} clients")
+    print(f"  one call per round trip   {single:>10,.0f} req/s")
+    print(f"  batches of {args.batch:<5}          {batched:>10,.0f} req/s")
+    print(f"  new process per call      {1 / spawn:>10,.1f} req/s ({spawn * 1000:.0f} ms each)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Service throughput on the sharded backend from 1 to N worker processes.
+
+Run with ``python -m benchmarks.bench_shards [--tasks N] [--per-project N] [--ops N] [--max-shards N]``.
+For each shard count (1, 2, 4, ... up to ``--max-shards``, default one per
+CPU) the store is seeded with ``--tasks`` tasks in projects of
+``--per-project``, and as many client threads as shards each make ``--ops``
+service calls on random projects:
+
+* ``query``: ``find_tasks`` on one project, by status and deadline
+* ``write``: ``add_task`` followed by ``change_status`` of the new task
+
+The in-process ``memory`` backend, shared by the same number of threads,
+is the reference: its threads share one GIL, the shards do not. The table
+gives calls per second and the speed-up over one shard, followed by the
+cost of a ``find_tasks`` across all projects, which asks every shard at
+once. Speed-ups need that many free cores.
+
+Checks that ids handed out to concurrent writers were unique and that the
+sharded store answers a cross-project query like the memory backend. Exits
+with status 1 if it does not.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import replace
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from todolist.config.settings import Settings
+from todolist.core.domain.project import Project
+from todolist.core.domain.status import TaskStatus
+from todolist.core.domain.task import Task
+from todolist.core.services.task_service import TaskService, UpdateTask
+from todolist.data.factory import create_repositories
+
+TODAY = date(2024, 6, 1)
+STATUSES = list(TaskStatus)
+SCENARIOS = ("query", "write")
+
+
+def seed(project_repo, task_repo, size: int, per_project: int) -> List[int]:
+    rng = random.Random(1)
+    project_ids: List[int] = []
+    for i in range(0, size, per_project):
+        project = project_repo.add(Project(id = project_repo.next_available_id(), name = f"project {i // per_project}"))
+        project_ids.append(project.id)
+        for j in range(min(per_project, size - i)):
+            task_repo.add(Task(id = task_repo.next_available_id(), project_id = project.id, name = f"task {j}",
+                               status = STATUSES[j % 3], deadline = TODAY + timedelta(days = rng.randint(-60, 60))))
+    return project_ids
+
+
+def run_threads(threads: int, body: Callable[[int], None]) -> float:
+    workers = [threading.Thread(target = body, args = (i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def measure(settings: Settings, threads: int, args: argparse.Namespace, added: List[int]) -> Tuple[Dict[str, float], float, List[int]]:
+    """Calls per second of each scenario, a cross-project find's cost, and its answer."""
+    project_repo, task_repo = create_repositories(settings, thread_safe = True)
+    try:
+        project_ids = seed(project_repo, task_repo, args.tasks, args.per_project)
+        tasks = TaskService(task_repo, project_repo, settings = settings)
+        update = UpdateTask(task_repo)
+        rates: Dict[str, float] = {}
+        for scenario in SCENARIOS:
+            def body(n: int) -> None:
+                rng = random.Random(n)
+                for i in range(args.ops):
+                    project_id = rng.choice(project_ids)
+                    if scenario == "query":
+                        tasks.find_tasks(project_id, status = TaskStatus.DOING, due_before = TODAY, order_by = "deadline", limit = 10)
+                    else:
+                        task = tasks.add_task(project_id, name = f"new {n}-{i}")
+                        update.change_status(task.id, STATUSES[i % 3])
+                        added.append(task.id)
+
+            rates[scenario] = threads * args.ops / run_threads(threads, body)
+        start = time.perf_counter()
+        for _ in range(10):
+            found = tasks.find_tasks(status = TaskStatus.TODO, due_before = TODAY, order_by = "deadline", limit = 50)
+        fan_out = (time.perf_counter() - start) / 10
+        return rates, fan_out, [t.id for t in found]
+    finally:
+        project_repo.close()
+        task_repo.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type = int, default = 100_000)
+    parser.add_argument("--per-project", type = int, default = 1000)
+    parser.add_argument("--ops", type = int, default = 2000)
+    parser.add_argument("--max-shards", type = int, default = os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    settings = replace(Settings(), MAX_PROJECTS = 1 << 30, MAX_TASKS = 1 << 30)
+    counts: List[int] = []
+    shards = 1
+    while shards < args.max_shards:
+        counts.append(shards)
+        shards *= 2
+    counts.append(args.max_shards)
+
+    failures: List[str] = []
+    print(f"{args.tasks:,} tasks in projects of {args.per_project:,}; {os.cpu_count()} CPUs; calls per second")
+    print(f"  {'shards':>6}  " + "".join(f"{name:>22}" for name in SCENARIOS) + f"{'find across projects':>24}")
+    base: Dict[str, float] = {}
+    for shards in counts:
+        for backend in ("memory", "sharded"):
+            added: List[int] = []
+            rates, fan_out, found = measure(replace(settings, STORAGE_BACKEND = backend, SHARDS = shards), shards, args, added)
+            if backend == "memory":
+                expected = found
+            elif found != expected:
+                failures.append(f"{shards} shards: a cross-project find differs from the memory backend")
+            if len(set(added)) != len(added):
+                failures.append(f"{backend} with {shards} threads handed out {len(added) - len(set(added))} duplicate ids")
+            if backend == "sharded" and shards == 1:
+                base = rates
+            label = f"{shards}" if backend == "sharded" else f"({shards})"
+            cells = "".join(
+                f"{rates[name]:>12,.0f}" + (f" x{rates[name] / base[name]:>4.2f}    " if backend == "sharded" else " " * 10)
+                for name in SCENARIOS
+            )
+            print(f"  {label:>6}  {cells}{fan_out * 1e3:>21.2f} ms" + ("   in-process memory backend" if backend == "memory" else ""))
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("ids were unique and shards answered like the memory backend")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""Cold-start cost of the binary snapshot backend.
+
+Run with ``python -m benchmarks.bench_snapshot [--tasks N] [--projects P]``.
+Writes a snapshot of N tasks spread over P projects, then times opening it,
+listing one project and point lookups. Opening should stay flat as N grows.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+from todolist.core.domain.status import TaskStatus
+from todolist.data.records import project_from_record, task_from_record
+from todolist.data.repositories.snapshot_project_repository import SnapshotProjectRepository
+from todolist.data.repositories.snapshot_task_repository import SnapshotTaskRepository
+from todolist.data.snapshot import SnapshotStore, write_snapshot
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--tasks", type = int, default = 1_000_000)
+    parser.add_argument("--projects", type = int, default = 100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.snap")
+        projects = [project_from_record((i, f"project {i}", "")) for i in range(1, args.projects + 1)]
+        tasks = (
+            task_from_record((i, 1 + i % args.projects, f"task {i}", "benchmark task", i % len(TaskStatus), 0))
+            for i in range(1, args.tasks + 1)
+        )
+        start = time.perf_counter()
+        write_snapshot(path, projects, tasks, next_project_id = args.projects + 1, next_task_id = args.tasks + 1)
+        print(f"write snapshot ({args.tasks} tasks): {time.perf_counter() - start:.3f}s")
+
+        start = time.perf_counter()
+        store = SnapshotStore(path)
+        project_repo = SnapshotProjectRepository(store)
+        task_repo = SnapshotTaskRepository(store)
+        print(f"open:                    {(time.perf_counter() - start) * 1e3:.3f}ms")
+
+        start = time.perf_counter()
+        listed = list(task_repo.list_by_project(1))
+        print(f"list_by_project ({len(listed)} tasks): {(time.perf_counter() - start) * 1e3:.3f}ms")
+
+        start = time.perf_counter()
+        for task_id in range(1, 10_001):
+            task_repo.get_by_id(task_id)
+        print(f"get_by_id x10000:        {(time.perf_counter() - start) * 1e3:.3f}ms")
+
+        start = time.perf_counter()
+        project_repo.get_by_name(f"project {args.projects}")
+        print(f"first get_by_name:       {(time.perf_counter() - start) * 1e3:.3f}ms")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Throughput of the sqlite backend against the in-memory one.
+
+Run with ``python -m benchmarks.bench_sqlite [--tasks N]``. Each backend gets
+one project holding N tasks; the script reports operations per second for
+adding, point lookups, listing the project and the cascade delete.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, Dict, Tuple
+
+from todolist.core.domain.project import Project
+from todolist.core.domain.task import Task
+from todolist.core.repositories.project_repository import ProjectRepository
+from todolist.core.repositories.task_repository import TaskRepository
+from todolist.data.repositories.in_memory_project_repository import InMemoryProjectRepository
+from todolist.data.repositories.in_memory_task_repository import InMemoryTaskRepository
+from todolist.data.repositories.sqlite_project_repository import SqliteProjectRepository
+from todolist.data.repositories.sqlite_task_repository import SqliteTaskRepository
+from todolist.data.sqlite import SqliteDatabase
+
+
+def _timed(fn: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(project_repo: ProjectRepository, task_repo: TaskRepository, n_tasks: int) -> Dict[str, float]:
+    project = project_repo.add(Project(id = project_repo.next_available_id(), name = "bench"))
+    results: Dict[str, float] = {}
+
+    def add_tasks() -> None:
+        for i in range(n_tasks):
+            task_repo.add(Task(id = task_repo.next_available_id(), project_id = project.id, name = f"task {i}"))
+
+    def lookups() -> None:
+        for task_id in range(1, n_tasks + 1):
+            task_repo.get_by_id(task_id)
+
+    results["add ops/s"] = n_tasks / _timed(add_tasks)
+    results["get_by_id ops/s"] = n_tasks / _timed(lookups)
+    results["get_by_name ops/s"] = 10_000 / _timed(lambda: [project_repo.get_by_name("bench") for _ in range(10_000)])
+    results["list_by_project tasks/s"] = n_tasks / _timed(lambda: list(task_repo.list_by_project(project.id)))
+    results["remove_by_project tasks/s"] = n_tasks / _timed(lambda: task_repo.remove_by_project(project.id))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--tasks", type = int, default = 100_000)
+    args = parser.parse_args()
+
+    backends: Dict[str, Tuple[ProjectRepository, TaskRepository]] = {
+        "memory": (InMemoryProjectRepository(), InMemoryTaskRepository()),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        db = SqliteDatabase(os.path.join(tmp, "bench.db"))
+        backends["sqlite"] = (SqliteProjectRepository(db), SqliteTaskRepository(db))
+        for name, (project_repo, task_repo) in backends.items():
+            print(f"{name} ({args.tasks} tasks)")
+            for metric, value in run(project_repo, task_repo, args.tasks).items():
+                print(f"  {metric:<28}{value:>14,.0f}")
+            task_repo.close()
+            project_repo.close()
+
+
+if __name__ == "__main__":
+    main()
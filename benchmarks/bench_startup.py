@@ -0,0 +1,140 @@
+"""Cold-start cost of the ``todolist`` command, checked against a budget.
+
+Run with ``python -m benchmarks.bench_startup [--runs N] [--budget X] [--command-budget X]``.
+Each run starts a fresh interpreter under ``python -X importtime``. It
+reports the import time of ``todolist.main`` (what ``--help`` pays) and the
+total import time of a full ``todolist project list`` (memory backend, all
+settings in the environment), each the fastest of N runs, since a busy
+machine only ever adds time. Budgets are multiples of the imports of
+``python -c pass`` measured in the same run, so a slower machine raises
+them too. It also checks
+that modules only some commands need are not imported at start-up or by
+``project list``, and that python-dotenv is skipped when the environment is
+complete. Exits with status 1 if a budget or a check fails;
+``tests/test_startup.py`` always runs the module checks, and the budgets
+when ``TODOLIST_TIMING`` is set.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+# modules that a plain start must not import
+DEFERRED = (
+    "dotenv", "sqlite3", "asyncio", "csv", "cProfile",
+    "todolist.server.server", "todolist.cli.menu", "todolist.cli.transfer", "todolist.instrumentation.hooks",
+)
+
+# collaborators main builds only for the commands using them, not for `project list`
+COMMAND_DEFERRED = (
+    "todolist.core.repositories.change_feed", "todolist.core.repositories.reclaiming",
+    "todolist.core.repositories.unit_of_work", "todolist.core.services.deadline_service",
+    "todolist.core.services.search_service", "todolist.core.services.version_service",
+    "todolist.data.journal",
+)
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def import_times(args: List[str], env: Dict[str, str]) -> Dict[str, int]:
+    """Cumulative import time in microseconds of each top-level module imported by ``args``."""
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], env = env, capture_output = True, text = True, check = True)
+    times: Dict[str, int] = {}
+    for match in _LINE.finditer(result.stderr):
+        _, cumulative, indent, module = match.groups()
+        if len(indent) == 1:
+            times[module] = times.get(module, 0) + int(cumulative)
+    return times
+
+
+def loaded_modules(code: str, env: Dict[str, str]) -> List[str]:
+    result = subprocess.run([sys.executable, "-c", code + "\nimport sys; print('\\n'.join(sys.modules))"], env = env, capture_output = True, text = True, check = True)
+    return result.stdout.split()
+
+
+@contextmanager
+def _environment() -> Iterator[Dict[str, str]]:
+    """A complete environment for the memory backend, with a throwaway DATA_DIR."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as tmp:
+        yield dict(
+            os.environ,
+            PYTHONPATH = root,
+            MAX_NUMBER_OF_PROJECT = "5",
+            MAX_NUMBER_OF_TASK = "10",
+            MAX_NAME_LENGTH = "30",
+            MAX_DESCRIPTION_LENGTH = "150",
+            STORAGE_BACKEND = "memory",
+            DATA_DIR = os.path.join(tmp, "data"),
+            COMPACT_TASKS = "false",
+            CACHE_SIZE = "0",
+            SHARDS = "0",
+        )
+
+
+def deferral_failures() -> List[str]:
+    """Return the modules imported earlier than they should be."""
+    failures: List[str] = []
+    with _environment() as env:
+        started = loaded_modules("import todolist.main", env)
+        failures += [f"{name} is imported by todolist.main" for name in DEFERRED if name in started]
+        ran = loaded_modules("from todolist.main import main; main(['project', 'list'])", env)
+        if "dotenv" in ran:
+            failures.append("dotenv is imported although every setting is in the environment")
+        failures += [f"{name} is imported by project list" for name in COMMAND_DEFERRED if name in ran]
+    return failures
+
+
+def timing_failures(runs: int, budget: float, command_budget: float) -> List[str]:
+    """Measure the start-up imports, print them and return what is over budget.
+
+    Budgets are multiples of the imports of a bare interpreter.
+    """
+    failures: List[str] = []
+    with _environment() as env:
+        # the first run compiles bytecode; it is not a start-up users pay twice
+        import_times(["-c", "import todolist.main"], env)
+        main_ms = min(
+            import_times(["-c", "import todolist.main"], env).get("todolist.main", 0) / 1000 for _ in range(runs)
+        )
+        command_ms = min(
+            sum(import_times(["-m", "todolist.main", "project", "list"], env).values()) / 1000 for _ in range(runs)
+        )
+        baseline_ms = min(sum(import_times(["-c", "pass"], env).values()) / 1000 for _ in range(runs))
+
+    print(f"interpreter alone          {baseline_ms:7.1f} ms of imports")
+    print(f"import todolist.main       {main_ms:7.1f} ms ({main_ms / baseline_ms:.1f}x, budget {budget:.0f}x)")
+    print(f"todolist project list      {command_ms:7.1f} ms of imports ({command_ms / baseline_ms:.1f}x, budget {command_budget:.0f}x)")
+    if main_ms > budget * baseline_ms:
+        failures.append(f"importing todolist.main took {main_ms:.1f} ms, {main_ms / baseline_ms:.1f}x the interpreter")
+    if command_ms > command_budget * baseline_ms:
+        failures.append(f"project list imports took {command_ms:.1f} ms, {command_ms / baseline_ms:.1f}x the interpreter")
+    return failures
+
+
+def check(runs: int, budget: float, command_budget: float) -> List[str]:
+    """Return what is over budget or imported too early."""
+    return timing_failures(runs, budget, command_budget) + deferral_failures()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--runs", type = int, default = 7)
+    parser.add_argument("--budget", type = float, default = 5.0, help = "budget for importing todolist.main, in interpreter start-ups")
+    parser.add_argument("--command-budget", type = float, default = 15.0, help = "budget for all imports of `project list`, in interpreter start-ups")
+    args = parser.parse_args()
+
+    failures = check(args.runs, args.budget, args.command_budget)
+    for failure in failures:
+        print(f"OVER BUDGET: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""Delta export against full export for a mirror kept in sync.
+
+Run with ``python -m benchmarks.bench_sync [--tasks N] [--changed N] [--backend NAME]``.
+Seeds ``--tasks`` tasks through repositories publishing to a ``ChangeFeed``
+followed by a ``VersionTracker``, and copies the store into a mirror with
+``task_change_records(0)``. Then it makes ``--changed`` random writes
+through the services (status changes, renames, adds, deletes and one
+project delete, whose tasks leave tombstones) and times bringing the
+mirror up to date from ``task_change_records(version)`` against
+re-exporting every task with ``iter_task_records()``.
+
+Checks that the updated mirror equals the store. Exits with status 1 if it
+does not.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from typing import Dict, List, Tuple
+
+from todolist.config.settings import Settings
+from todolist.core.domain.project import Project
+from todolist.core.domain.status import TaskStatus
+from todolist.core.domain.task import Task
+from todolist.core.repositories.change_feed import ChangeFeed
+from todolist.core.repositories.unit_of_work import UnitOfWork
+from todolist.core.services.project_service import ProjectService
+from todolist.core.services.task_service import TaskService, UpdateTask
+from todolist.core.services.version_service import VersionTracker
+from todolist.data.factory import create_repositories, create_version_log
+
+STATUSES = list(TaskStatus)
+Mirror = Dict[int, Tuple]
+
+
+def apply(mirror: Mirror, records) -> int:
+    count: int = 0
+    for record in records:
+        count += 1
+        if record["deleted"]:
+            mirror.pop(record["id"], None)
+        else:
+            mirror[record["id"]] = (record["project"], record["name"], record["status"])
+    return count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type = int, default = 1_000_000)
+    parser.add_argument("--changed", type = int, default = 100)
+    parser.add_argument("--backend", default = "memory")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = replace(
+            Settings(),
+            MAX_PROJECTS = 1 << 30,
+            MAX_TASKS = 1 << 30,
+            STORAGE_BACKEND = args.backend,
+            DATA_DIR = os.path.join(tmp, "data"),
+        )
+        feed = ChangeFeed()
+        project_repo, task_repo = create_repositories(settings, feed = feed)
+        versions = VersionTracker(feed, project_repo, task_repo, log = create_version_log(settings))
+        start = time.perf_counter()
+        project_ids: List[int] = []
+        for i in range(0, args.tasks, 1000):
+            project = project_repo.add(Project(id = project_repo.next_available_id(), name = f"project {i // 1000}"))
+            project_ids.append(project.id)
+            for j in range(min(1000, args.tasks - i)):
+                task_repo.add(Task(id = task_repo.next_available_id(), project_id = project.id, name = f"task {j}", status = STATUSES[j % 3]))
+        print(f"{args.tasks:,} tasks on {args.backend} seeded in {time.perf_counter() - start:.1f}s, store at version {versions.version:,}")
+
+        uow = UnitOfWork(project_repo, task_repo)
+        projects = ProjectService(uow.projects, uow.tasks, settings = settings, uow = uow, versions = versions)
+        tasks = TaskService(uow.tasks, uow.projects, settings = settings, uow = uow, versions = versions)
+        update = UpdateTask(uow.tasks)
+
+        mirror: Mirror = {}
+        start = time.perf_counter()
+        apply(mirror, tasks.task_change_records(0))
+        print(f"  initial copy: {len(mirror):,} tasks in {time.perf_counter() - start:.2f}s")
+        synced: int = versions.version
+
+        rng = random.Random(1)
+        # a small project, so its cascade adds a handful of tombstones
+        doomed = projects.create_project("doomed")
+        for j in range(5):
+            tasks.add_task(doomed.id, name = f"doomed {j}")
+        for i in range(args.changed):
+            choice = i % 4
+            task_id = rng.randrange(1, args.tasks + 1)
+            try:
+                if choice == 0:
+                    update.change_status(task_id, rng.choice(STATUSES))
+                elif choice == 1:
+                    update.edit_task_name(task_id, name = f"renamed {i}")
+                elif choice == 2:
+                    tasks.add_task(rng.choice(project_ids), name = f"new {i}")
+                else:
+                    tasks.delete_task(task_id)
+            except ValueError:
+                # the task was deleted earlier in the run
+                pass
+        projects.delete_project(doomed.id)
+
+        start = time.perf_counter()
+        applied = apply(mirror, tasks.task_change_records(synced))
+        delta = time.perf_counter() - start
+        start = time.perf_counter()
+        full = sum(1 for _ in tasks.iter_task_records())
+        export = time.perf_counter() - start
+        print(f"  after {args.changed} writes: delta of {applied} records in {delta * 1e3:.2f} ms, "
+              f"full export of {full:,} in {export * 1e3:.0f} ms ({export / max(delta, 1e-9):,.0f}x)")
+
+        expected: Mirror = {
+            task.id: (task.project_id, task.name, task.status.value)
+            for project in project_repo.list_all_projects()
+            for task in task_repo.list_by_project(project.id)
+        }
+        failures: List[str] = []
+        if mirror != expected:
+            missing = len(expected.keys() - mirror.keys())
+            extra = len(mirror.keys() - expected.keys())
+            stale = sum(1 for key in expected.keys() & mirror.keys() if expected[key] != mirror[key])
+            failures.append(f"mirror differs from the store: {missing} missing, {extra} extra, {stale} stale tasks")
+        task_repo.close()
+        project_repo.close()
+        versions.close()
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("the mirror matches the store after applying the delta")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
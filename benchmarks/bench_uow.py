@@ -0,0 +1,143 @@
+"""Cost of grouped writes under a unit of work, and rollback checks.
+
+Run with ``python -m benchmarks.bench_uow [--tasks N] [--group N] [--durable]``.
+For each backend one project gets N tasks; the script reports status changes
+per second made one by one and in units of work of ``--group`` changes each.
+It then deletes the project and renames tasks inside a unit of work that
+raises, and checks that the stored state is unchanged, both in the running
+repositories and, for persistent backends, after reopening them. Exits with
+status 1 if a rollback check fails.
+
+By default the journal and sqlite already group their own flushes.
+``--durable`` runs only those two, flushing every write made outside a unit,
+which is where one flush per unit pays off.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from typing import List, Tuple
+
+from todolist.config.settings import Settings
+from todolist.core.domain.status import TaskStatus
+from todolist.core.domain.task import Task
+from todolist.core.repositories.unit_of_work import UnitOfWork
+from todolist.core.services.project_service import ProjectService
+from todolist.core.services.task_service import UpdateTask
+from todolist.data.factory import create_repositories
+from todolist.data.journal import Journal
+from todolist.data.repositories.journal_project_repository import JournalProjectRepository
+from todolist.data.repositories.journal_task_repository import JournalTaskRepository
+from todolist.data.repositories.sqlite_project_repository import SqliteProjectRepository
+from todolist.data.repositories.sqlite_task_repository import SqliteTaskRepository
+from todolist.data.sqlite import SqliteDatabase
+
+BACKENDS = ("memory", "compact", "journal", "sqlite", "snapshot")
+
+
+class Abort(Exception):
+    pass
+
+
+def dump(uow: UnitOfWork) -> Tuple[list, list]:
+    projects = sorted((p.id, p.name, p.description) for p in uow.projects.list_all_projects())
+    tasks = sorted(
+        (t.id, t.project_id, t.name, t.description, t.status.value, t.deadline)
+        for p in uow.projects.list_all_projects()
+        for t in uow.tasks.list_by_project(p.id)
+    )
+    return projects, tasks
+
+
+def open_uow(settings: Settings, durable: bool = False) -> UnitOfWork:
+    if durable and settings.STORAGE_BACKEND == "journal":
+        return UnitOfWork(
+            JournalProjectRepository(Journal(settings.DATA_DIR, "projects", group_size = 1)),
+            JournalTaskRepository(Journal(settings.DATA_DIR, "tasks", group_size = 1)),
+        )
+    if durable and settings.STORAGE_BACKEND == "sqlite":
+        db = SqliteDatabase(os.path.join(settings.DATA_DIR, "todolist.db"), batch_size = 1)
+        return UnitOfWork(SqliteProjectRepository(db), SqliteTaskRepository(db))
+    return UnitOfWork(*create_repositories(settings))
+
+
+def close(uow: UnitOfWork) -> None:
+    uow.tasks.close()
+    uow.projects.close()
+
+
+def run(settings: Settings, n_tasks: int, group: int, durable: bool) -> List[str]:
+    uow = open_uow(settings, durable)
+    projects = ProjectService(uow.projects, uow.tasks, settings = settings, uow = uow)
+    update = UpdateTask(uow.tasks)
+    project = projects.create_project("bench")
+    with uow:
+        for i in range(n_tasks):
+            uow.tasks.add(Task(id = uow.tasks.next_available_id(), project_id = project.id, name = f"task {i}"))
+    ids = [t.id for t in uow.tasks.list_by_project(project.id)]
+
+    start = time.perf_counter()
+    for task_id in ids:
+        update.change_status(task_id, TaskStatus.DOING)
+    single = len(ids) / (time.perf_counter() - start)
+    start = time.perf_counter()
+    for offset in range(0, len(ids), group):
+        with uow:
+            for task_id in ids[offset:offset + group]:
+                update.change_status(task_id, TaskStatus.DONE)
+    grouped = len(ids) / (time.perf_counter() - start)
+    print(f"  change_status one by one   {single:>12,.0f} ops/s")
+    print(f"  change_status in units     {grouped:>12,.0f} ops/s  ({group} per unit)")
+
+    failures: List[str] = []
+    before = dump(uow)
+    try:
+        with uow:
+            for task_id in ids[:10]:
+                update.edit_task_name(task_id, name = "renamed")
+            projects.delete_project(project.id)
+            projects.create_project("replacement")
+            raise Abort()
+    except Abort:
+        pass
+    if dump(uow) != before:
+        failures.append(f"{settings.STORAGE_BACKEND}: state differs after rollback")
+    close(uow)
+    if settings.STORAGE_BACKEND != "memory":
+        reopened = open_uow(settings)
+        if dump(reopened) != before:
+            failures.append(f"{settings.STORAGE_BACKEND}: state differs after reopening")
+        close(reopened)
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--tasks", type = int, default = 20_000)
+    parser.add_argument("--group", type = int, default = 1000)
+    parser.add_argument("--durable", action = "store_true", help = "flush every write made outside a unit")
+    args = parser.parse_args()
+
+    failures: List[str] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in BACKENDS if not args.durable else ("journal", "sqlite"):
+            settings = replace(
+                Settings(),
+                MAX_TASKS = args.tasks,
+                STORAGE_BACKEND = "memory" if backend == "compact" else backend,
+                COMPACT_TASKS = backend == "compact",
+                DATA_DIR = os.path.join(tmp, backend),
+            )
+            print(f"{backend} ({args.tasks} tasks)")
+            failures += run(settings, args.tasks, max(1, args.group), args.durable)
+    for failure in failures:
+        print(f"ROLLBACK FAILED: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""Validation cost of bulk task imports, and checks of where the limits come from.
+
+Run with ``python -m benchmarks.bench_validation [--rows N] [--batch-size N]``.
+First it times checking ``--rows`` import records field by field, the way
+``add_tasks_bulk`` did by constructing and validating a ``Task`` per row,
+against ``Validator.task_records`` checking each batch in one pass. Then
+it times ``add_tasks_bulk`` end to end on the memory backend.
+
+Last it runs the services with a name limit of 5 set on the ``Settings``
+instance and checks that adds, edits and imports all enforce it, that row
+errors come back in row order, and that no service call runs the domain
+``__post_init__`` validation. Exits with status 1 if a check fails.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from dataclasses import replace
+from typing import Iterator, List
+
+from todolist.config.settings import Settings
+from todolist.core.domain.project import Project
+from todolist.core.domain.task import Task
+from todolist.core.services.bulk import batched
+from todolist.core.services.project_service import ProjectService, UpdateProject
+from todolist.core.services.task_service import TaskService, UpdateTask
+from todolist.core.validation import Record, parse_deadline, parse_status, text, validator_for
+from todolist.data.factory import create_repositories
+
+
+def records(rows: int, projects: int) -> Iterator[Record]:
+    for i in range(rows):
+        # one row in fifty has a name over the default limit
+        name = "n" * 40 if i % 50 == 0 else f"task {i % 1000}"
+        yield {"project": f"p{i % projects}", "name": name, "description": "imported", "status": "todo", "deadline": "2024-06-01"}
+
+
+def per_row(rows: List[Record]) -> int:
+    """Construct a validated ``Task`` per record, as imports used to."""
+    failed: int = 0
+    for i, record in enumerate(rows):
+        try:
+            Task(
+                id = i,
+                project_id = 1,
+                name = text(record, "name"),
+                description = text(record, "description"),
+                status = parse_status(record.get("status")),
+                deadline = parse_deadline(record.get("deadline")),
+            )
+        except ValueError:
+            failed += 1
+    return failed
+
+
+def per_batch(rows: List[Record], batch_size: int) -> int:
+    validator = validator_for(Settings())
+    failed: int = 0
+    for batch in batched(rows, batch_size):
+        _, errors = validator.task_records(batch)
+        failed += len(errors)
+    return failed
+
+
+def bulk_import(rows: List[Record], batch_size: int, projects: int) -> float:
+    settings = replace(Settings(), MAX_PROJECTS = projects, MAX_TASKS = len(rows))
+    project_repo, task_repo = create_repositories(settings)
+    for i in range(projects):
+        project_repo.add(Project(id = project_repo.next_available_id(), name = f"p{i}"))
+    service = TaskService(task_repo, project_repo, settings = settings)
+    start = time.perf_counter()
+    service.add_tasks_bulk(rows, batch_size = batch_size)
+    return time.perf_counter() - start
+
+
+def check_limits() -> List[str]:
+    failures: List[str] = []
+    constructed: List[int] = [0]
+    task_init, project_init = Task.__post_init__, Project.__post_init__
+
+    def counting(original):
+        def __post_init__(self) -> None:
+            constructed[0] += 1
+            original(self)
+        return __post_init__
+
+    settings = replace(Settings(), MAX_NAME_LEN = 5, MAX_PROJECTS = 10, MAX_TASKS = 10)
+    project_repo, task_repo = create_repositories(settings)
+    projects = ProjectService(project_repo, task_repo, settings = settings)
+    tasks = TaskService(task_repo, project_repo, settings = settings)
+    rename_project = UpdateProject(project_repo, settings = settings)
+    rename_task = UpdateTask(task_repo, settings = settings)
+
+    def rejects(label: str, call) -> None:
+        try:
+            call()
+        except ValueError:
+            return
+        failures.append(f"{label} accepted a name over the limit")
+
+    Task.__post_init__, Project.__post_init__ = counting(task_init), counting(project_init)
+    try:
+        projects.create_project("abcde")
+        task = tasks.add_task("abcde", name = "abcde")
+        rename_task.edit_task_name(task.id, name = "edcba")
+        rename_project.edit_project_name("abcde", name = "fghij")
+        rejects("create_project", lambda: projects.create_project("abcdef"))
+        rejects("add_task", lambda: tasks.add_task("fghij", name = "abcdef"))
+        rejects("edit_task_name", lambda: rename_task.edit_task_name(task.id, name = "abcdef"))
+        rejects("edit_project_name", lambda: rename_project.edit_project_name("fghij", name = "abcdef"))
+        result = tasks.add_tasks_bulk([
+            {"project": "missing", "name": "a"},
+            {"project": "fghij", "name": "abcdef"},
+            {"project": "fghij", "name": "ok"},
+            {"project": "fghij", "name": "ok", "status": "bad"},
+        ])
+        if result.added != 1 or [e.row for e in result.errors] != [1, 2, 4]:
+            failures.append(f"add_tasks_bulk added {result.added} with errors {result.errors}")
+        imported = projects.import_projects([{"name": "abcdef"}, {"name": "vwxyz"}, {"name": "123"}])
+        if imported.added != 1 or [e.row for e in imported.errors] != [1, 3]:
+            failures.append(f"import_projects added {imported.added} with errors {imported.errors}")
+    finally:
+        Task.__post_init__, Project.__post_init__ = task_init, project_init
+    if constructed[0]:
+        failures.append(f"services ran __post_init__ validation {constructed[0]} times")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type = int, default = 200_000)
+    parser.add_argument("--batch-size", type = int, default = 1000)
+    args = parser.parse_args()
+    rows = list(records(args.rows, 100))
+
+    start = time.perf_counter()
+    failed = per_row(rows)
+    row_time = time.perf_counter() - start
+    start = time.perf_counter()
+    batch_failed = per_batch(rows, args.batch_size)
+    batch_time = time.perf_counter() - start
+    print(f"{args.rows} records, {failed} invalid")
+    print(f"  Task per row:          {row_time:.3f}s ({args.rows / row_time:,.0f} rows/s)")
+    print(f"  task_records per batch: {batch_time:.3f}s ({args.rows / batch_time:,.0f} rows/s)")
+    elapsed = bulk_import(rows, args.batch_size, 100)
+    print(f"  add_tasks_bulk:         {elapsed:.3f}s ({args.rows / elapsed:,.0f} rows/s)")
+
+    failures = check_limits()
+    if batch_failed != failed:
+        failures.append(f"task_records rejected {batch_failed} rows, Task rejected {failed}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("limits of the Settings instance enforced; no object validated twice")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""Multi-threaded stress run checking repository and service invariants.
+
+Run with ``python -m benchmarks.stress_threads [--threads N] [--ops N] [--backend memory|compact|sqlite] [--unsafe]``.
+Worker threads create, rename and delete projects drawn from a small name
+pool and add and delete tasks through the services, racing for the same
+names and the last free slots. A monitor samples counts while they run.
+Afterwards it checks that ids are unique, names are unique, and the project
+and per-project task limits were never exceeded. ``--unsafe`` runs the
+plain in-memory repositories for comparison. Exits with status 1 on any
+violation.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from dataclasses import replace
+from typing import List
+
+from todolist.config.settings import Settings
+from todolist.core.repositories.project_repository import ProjectRepository
+from todolist.core.repositories.task_repository import TaskRepository
+from todolist.core.services.project_service import ProjectService, UpdateProject
+from todolist.core.services.task_service import TaskService
+from todolist.data.factory import create_repositories
+from todolist.data.repositories.in_memory_project_repository import InMemoryProjectRepository
+from todolist.data.repositories.in_memory_task_repository import InMemoryTaskRepository
+
+NAMES = [f"project {i}" for i in range(12)]
+
+
+def run(settings: Settings, project_repo: ProjectRepository, task_repo: TaskRepository, threads: int, ops: int) -> List[str]:
+    """Race ``threads`` workers of ``ops`` operations each; return the invariant violations seen."""
+    projects = ProjectService(project_repo, task_repo, settings = settings)
+    tasks = TaskService(task_repo, project_repo, settings = settings)
+    update = UpdateProject(project_repo)
+
+    violations: List[str] = []
+    issued_task_ids: List[int] = []
+    issued_project_ids: List[int] = []
+    done = threading.Event()
+    barrier = threading.Barrier(threads)
+
+    def worker(seed: int) -> None:
+        rnd = random.Random(seed)
+        mine: List[int] = []
+        barrier.wait()
+        for _ in range(ops):
+            op = rnd.random()
+            try:
+                if op < 0.04:
+                    issued_project_ids.append(projects.create_project(rnd.choice(NAMES)).id)
+                elif op < 0.06:
+                    update.edit_project_name(rnd.choice(NAMES), name = rnd.choice(NAMES))
+                elif op < 0.065:
+                    projects.delete_project(rnd.choice(NAMES))
+                elif op < 0.7:
+                    task = tasks.add_task(rnd.choice(NAMES), name = f"task {seed}")
+                    issued_task_ids.append(task.id)
+                    mine.append(task.id)
+                elif mine:
+                    tasks.delete_task(mine.pop(rnd.randrange(len(mine))))
+            except ValueError:
+                pass
+            except Exception as exc:
+                violations.append(f"unexpected {type(exc).__name__}: {exc}")
+
+    def monitor() -> None:
+        while not done.is_set():
+            try:
+                listed = list(project_repo.list_all_projects())
+                if len(listed) > settings.MAX_PROJECTS:
+                    violations.append(f"{len(listed)} projects exceed the limit")
+                for project in listed:
+                    if task_repo.count_by_project(project.id) > settings.MAX_TASKS:
+                        violations.append(f"project #{project.id} exceeds the task limit")
+            except Exception as exc:
+                violations.append(f"monitor {type(exc).__name__}: {exc}")
+            time.sleep(0.001)
+
+    workers = [threading.Thread(target = worker, args = (seed,)) for seed in range(threads)]
+    watcher = threading.Thread(target = monitor)
+    start = time.perf_counter()
+    watcher.start()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    done.set()
+    watcher.join()
+    elapsed = time.perf_counter() - start
+
+    listed_projects = list(project_repo.list_all_projects())
+    names = Counter(p.name.lower() for p in listed_projects)
+    violations += [f"name {name!r} used {n} times" for name, n in names.items() if n > 1]
+    if len(listed_projects) > settings.MAX_PROJECTS:
+        violations.append(f"{len(listed_projects)} projects exceed the limit")
+    task_ids: List[int] = []
+    for project in listed_projects:
+        listed = [t.id for t in task_repo.list_by_project(project.id)]
+        task_ids += listed
+        if len(listed) > settings.MAX_TASKS:
+            violations.append(f"project #{project.id} holds {len(listed)} tasks")
+        if task_repo.count_by_project(project.id) != len(listed):
+            violations.append(f"project #{project.id} counter disagrees with its listing")
+    violations += [f"task id {i} listed {n} times" for i, n in Counter(task_ids).items() if n > 1]
+    violations += [f"task id {i} issued {n} times" for i, n in Counter(issued_task_ids).items() if n > 1]
+    violations += [f"project id {i} issued {n} times" for i, n in Counter(issued_project_ids).items() if n > 1]
+
+    print(f"{threads * ops} operations on {threads} threads in {elapsed:.2f}s; "
+          f"{len(listed_projects)} projects, {len(task_ids)} tasks")
+    return violations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--threads", type = int, default = 16)
+    parser.add_argument("--ops", type = int, default = 5000)
+    parser.add_argument("--backend", choices = ("memory", "compact", "sqlite"), default = "memory")
+    parser.add_argument("--unsafe", action = "store_true", help = "use the plain in-memory repositories")
+    args = parser.parse_args()
+    # switch threads as often as possible to provoke races
+    sys.setswitchinterval(1e-6)
+
+    tmp = tempfile.TemporaryDirectory()
+    settings = replace(
+        Settings(),
+        MAX_PROJECTS = 8,
+        MAX_TASKS = 40,
+        STORAGE_BACKEND = "sqlite" if args.backend == "sqlite" else "memory",
+        COMPACT_TASKS = args.backend == "compact",
+        DATA_DIR = os.path.join(tmp.name, "data"),
+    )
+    if args.unsafe:
+        project_repo, task_repo = InMemoryProjectRepository(), InMemoryTaskRepository(compact = settings.COMPACT_TASKS)
+    else:
+        project_repo, task_repo = create_repositories(settings, thread_safe = True)
+    violations = run(settings, project_repo, task_repo, args.threads, args.ops)
+    for violation in sorted(set(violations))[:20]:
+        print(f"VIOLATION: {violation}")
+    task_repo.close()
+    project_repo.close()
+    tmp.cleanup()
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
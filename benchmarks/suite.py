@@ -0,0 +1,299 @@
+"""Service benchmarks at increasing store sizes, checked against a baseline.
+
+Run with ``python -m benchmarks.suite [--sizes 1000,100000,1000000] [--backends memory,sqlite]
+[--ops N] [--output FILE] [--baseline FILE] [--save-baseline FILE] [--tolerance F]``.
+
+For each backend and size the store is seeded with that many tasks, in
+projects of ``--per-project`` tasks, and wired by ``todolist.main.wire``
+as scripts, the server and the menu run it: with search, deadline
+tracking, versions, deferred project deletion and units of work. Every scenario then runs ``--ops`` service calls on random
+projects and tasks, timing each call on its own; set-up work such as
+filling the project a cascade delete removes is not timed. The report
+gives the median and 95th percentile per call, and one scaling line per
+scenario across sizes. ``--output`` writes the results as JSON.
+
+``--save-baseline`` stores the results as a baseline; ``--baseline`` compares
+against one and exits with status 1 when a scenario's median is more than
+``--tolerance`` (a fraction, default 0.5) slower than its baseline. Only
+matching backend, size and scenario entries are compared. Baselines are
+only meaningful on the machine that recorded them.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field, replace
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from todolist.config.settings import Settings
+from todolist.core.domain.project import Project
+from todolist.core.domain.status import TaskStatus
+from todolist.core.domain.task import Task
+from todolist.core.repositories.unit_of_work import UnitOfWork
+from todolist.core.services.project_service import ProjectService
+from todolist.core.services.task_service import TaskService, UpdateTask
+from todolist.main import Services, wire
+
+BACKENDS = ("memory", "compact", "journal", "sqlite", "snapshot")
+STATUSES = list(TaskStatus)
+TODAY = date(2024, 1, 1)
+
+
+@dataclass
+class Store:
+    """A seeded store and the ids scenarios draw from."""
+
+    services: Services
+    uow: UnitOfWork
+    projects: ProjectService
+    tasks: TaskService
+    update: UpdateTask
+    rng: random.Random
+    per_project: int
+    project_ids: List[int] = field(default_factory = list)
+    task_ids: List[int] = field(default_factory = list)
+
+    def project_id(self) -> int:
+        return self.rng.choice(self.project_ids)
+
+    def task_id(self) -> int:
+        return self.rng.choice(self.task_ids)
+
+    def take_task_id(self) -> int:
+        """Remove and return a random live task id."""
+        i: int = self.rng.randrange(len(self.task_ids))
+        self.task_ids[i], self.task_ids[-1] = self.task_ids[-1], self.task_ids[i]
+        return self.task_ids.pop()
+
+    def fill_project(self, name: str) -> int:
+        project = self.uow.projects.add(Project(id = self.uow.projects.next_available_id(), name = name))
+        with self.uow:
+            for i in range(self.per_project):
+                self.uow.tasks.add(_task(self.uow.tasks.next_available_id(), project.id, i))
+        return project.id
+
+    def close(self) -> None:
+        self.services.close()
+
+
+def _task(task_id: int, project_id: int, i: int) -> Task:
+    return Task(
+        id = task_id,
+        project_id = project_id,
+        name = f"task {i}",
+        description = "seeded",
+        status = STATUSES[i % 3],
+        deadline = TODAY + timedelta(days = i % 90) if i % 2 else None,
+    )
+
+
+def seed(settings: Settings, size: int, per_project: int) -> Store:
+    services = wire(settings)
+    tasks = services.tasks
+    uow = tasks.uow
+    store = Store(
+        services = services,
+        uow = uow,
+        projects = services.projects,
+        tasks = tasks,
+        # as the CLI operations build it
+        update = UpdateTask(tasks.task_repo, settings = tasks.settings, search = tasks.search, deadlines = tasks.deadlines),
+        rng = random.Random(size),
+        per_project = per_project,
+    )
+    added: int = 0
+    while added < size:
+        project = uow.projects.add(Project(id = uow.projects.next_available_id(), name = f"project {len(store.project_ids)}"))
+        store.project_ids.append(project.id)
+        with uow:
+            for i in range(min(per_project, size - added)):
+                task = uow.tasks.add(_task(uow.tasks.next_available_id(), project.id, i))
+                store.task_ids.append(task.id)
+        added += per_project
+    return store
+
+
+# a scenario returns the call to time, after doing any untimed set-up
+Scenario = Callable[[Store, int], Callable[[], object]]
+
+
+def _create_project(store: Store, i: int) -> Callable[[], object]:
+    return lambda: store.projects.create_project(f"new project {i}")
+
+
+def _add_task(store: Store, i: int) -> Callable[[], object]:
+    project_id: int = store.project_id()
+    return lambda: store.tasks.add_task(project_id, name = f"added {i}")
+
+
+def _list_tasks(store: Store, i: int) -> Callable[[], object]:
+    project_id: int = store.project_id()
+    return lambda: store.tasks.list_tasks_by_project(project_id)
+
+
+def _edit_name(store: Store, i: int) -> Callable[[], object]:
+    task_id: int = store.task_id()
+    return lambda: store.update.edit_task_name(task_id, name = f"renamed {i}")
+
+
+def _edit_description(store: Store, i: int) -> Callable[[], object]:
+    task_id: int = store.task_id()
+    return lambda: store.update.edit_task_description(task_id, description = f"edited {i}")
+
+
+def _edit_deadline(store: Store, i: int) -> Callable[[], object]:
+    task_id: int = store.task_id()
+    return lambda: store.update.edit_task_deadline(task_id, deadline = TODAY + timedelta(days = i % 365))
+
+
+def _change_status(store: Store, i: int) -> Callable[[], object]:
+    task_id: int = store.task_id()
+    return lambda: store.update.change_status(task_id, STATUSES[i % 3])
+
+
+def _delete_task(store: Store, i: int) -> Callable[[], object]:
+    task_id: int = store.take_task_id()
+    return lambda: store.tasks.delete_task(task_id)
+
+
+def _delete_project(store: Store, i: int) -> Callable[[], object]:
+    project_id: int = store.fill_project(f"doomed {i}")
+    return lambda: store.projects.delete_project(project_id)
+
+
+SCENARIOS: Dict[str, Tuple[Scenario, int]] = {
+    # name: (scenario, share of --ops it runs, as a divisor)
+    "create_project": (_create_project, 1),
+    "add_task": (_add_task, 1),
+    "list_tasks_by_project": (_list_tasks, 1),
+    "edit_task_name": (_edit_name, 1),
+    "edit_task_description": (_edit_description, 1),
+    "edit_task_deadline": (_edit_deadline, 1),
+    "change_status": (_change_status, 1),
+    "delete_task": (_delete_task, 1),
+    # each call removes a whole project, so fewer of them
+    "delete_project": (_delete_project, 10),
+}
+
+
+def measure(store: Store, scenario: Scenario, ops: int) -> Dict[str, float]:
+    timings: List[float] = []
+    clock = time.perf_counter
+    gc.collect()
+    for i in range(ops):
+        call = scenario(store, i)
+        start = clock()
+        call()
+        timings.append(clock() - start)
+    timings.sort()
+    return {
+        "ops": ops,
+        "median_us": round(statistics.median(timings) * 1e6, 2),
+        "p95_us": round(timings[int(len(timings) * 0.95)] * 1e6, 2),
+        "mean_us": round(statistics.fmean(timings) * 1e6, 2),
+    }
+
+
+def run(backends: List[str], sizes: List[int], ops: int, per_project: int) -> List[dict]:
+    results: List[dict] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in backends:
+            for size in sizes:
+                settings = replace(
+                    Settings(),
+                    MAX_PROJECTS = 1 << 30,
+                    MAX_TASKS = 1 << 30,
+                    STORAGE_BACKEND = "memory" if backend == "compact" else backend,
+                    COMPACT_TASKS = backend == "compact",
+                    DATA_DIR = os.path.join(tmp, f"{backend}-{size}"),
+                )
+                start = time.perf_counter()
+                store = seed(settings, size, per_project)
+                print(f"{backend}, {size:,} tasks (seeded in {time.perf_counter() - start:.1f}s)", flush = True)
+                for name, (scenario, share) in SCENARIOS.items():
+                    result = measure(store, scenario, max(1, ops // share))
+                    print(f"  {name:<24}{result['median_us']:>10.1f} us  p95 {result['p95_us']:>10.1f} us", flush = True)
+                    results.append({"backend": backend, "size": size, "scenario": name, **result})
+                store.close()
+                del store
+                gc.collect()
+    return results
+
+
+def print_scaling(results: List[dict], sizes: List[int]) -> None:
+    """One line per backend and scenario: median per call at each size."""
+    print("\nscaling (median us per call)")
+    print(f"  {'':<34}" + "".join(f"{size:>12,}" for size in sizes))
+    table: Dict[Tuple[str, str], Dict[int, float]] = {}
+    for r in results:
+        table.setdefault((r["backend"], r["scenario"]), {})[r["size"]] = r["median_us"]
+    for (backend, scenario), by_size in table.items():
+        cells = "".join(f"{by_size[s]:>12.1f}" if s in by_size else f"{'-':>12}" for s in sizes)
+        print(f"  {backend + ' ' + scenario:<34}{cells}")
+
+
+def regressions(results: List[dict], baseline: dict, tolerance: float) -> List[str]:
+    expected = {(r["backend"], r["size"], r["scenario"]): r["median_us"] for r in baseline["results"]}
+    failures: List[str] = []
+    for r in results:
+        base: Optional[float] = expected.get((r["backend"], r["size"], r["scenario"]))
+        if base is not None and r["median_us"] > base * (1 + tolerance):
+            failures.append(
+                f"{r['backend']} {r['size']:,} {r['scenario']}: {r['median_us']:.1f} us against {base:.1f} us baseline"
+            )
+    return failures
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v.replace("_", "")) for v in value.split(",") if v]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type = _int_list, default = [1_000, 100_000, 1_000_000])
+    parser.add_argument("--backends", type = lambda v: v.split(","), default = ["memory", "sqlite"])
+    parser.add_argument("--ops", type = int, default = 1000, help = "calls per scenario")
+    parser.add_argument("--per-project", type = int, default = 100, help = "tasks per seeded project")
+    parser.add_argument("--output", help = "write results as JSON")
+    parser.add_argument("--baseline", help = "fail on regressions against this JSON file")
+    parser.add_argument("--save-baseline", help = "write results as a new baseline")
+    parser.add_argument("--tolerance", type = float, default = 0.5)
+    args = parser.parse_args()
+    unknown = [b for b in args.backends if b not in BACKENDS]
+    if unknown:
+        parser.error(f"unknown backends: {', '.join(unknown)} (choose from {', '.join(BACKENDS)})")
+
+    results = run(args.backends, args.sizes, max(1, args.ops), max(1, args.per_project))
+    print_scaling(results, args.sizes)
+    document = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "ops": args.ops,
+        "per_project": args.per_project,
+        "results": results,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding = "utf-8") as f:
+                json.dump(document, f, indent = 1)
+                f.write("\n")
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding = "utf-8") as f:
+        failures = regressions(results, json.load(f), args.tolerance)
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+from todolist.config.settings import Settings
+from todolist.core.services.async_project_service import AsyncProjectService, AsyncUpdateProject
+from todolist.core.services.async_task_service import AsyncTaskService, AsyncUpdateTask
+from todolist.core.services.project_service import ProjectService, UpdateProject
+from todolist.core.services.task_service import TaskService, UpdateTask
+from todolist.data.factory import create_repositories
+
+
+def test_async_services_apply_the_sync_rules_off_the_loop():
+    settings = replace(Settings(), STORAGE_BACKEND = "memory", MAX_TASKS = 3)
+    project_repo, task_repo = create_repositories(settings)
+    projects = AsyncProjectService(ProjectService(project_repo, task_repo, settings = settings))
+    rename = AsyncUpdateProject(UpdateProject(project_repo))
+    tasks = AsyncTaskService(TaskService(task_repo, project_repo, settings = settings))
+    update = AsyncUpdateTask(UpdateTask(task_repo))
+
+    async def scenario():
+        home = await projects.create_project("Home")
+        await projects.create_project("Work")
+        with pytest.raises(ValueError, match = "unique"):
+            await projects.create_project("Home")
+        with pytest.raises(ValueError, match = "unique"):
+            await rename.edit_project_name("Work", name = "Home")
+        added = await asyncio.gather(*(tasks.add_task("Home", name = f"t{i}") for i in range(3)))
+        with pytest.raises(ValueError, match = "maximum"):
+            await tasks.add_task(home.id, name = "one too many")
+        await update.edit_task_name(added[0].id, name = "renamed")
+        streamed = [t.name async for t in tasks.iter_tasks_by_project("Home", page_size = 2)]
+        listed = [p.name async for p in projects.iter_projects(page_size = 1)]
+        assert await projects.delete_project("Home")
+        return streamed, listed, await tasks.list_tasks_by_project("Work")
+
+    streamed, listed, remaining = asyncio.run(scenario())
+    assert sorted(streamed) == ["renamed", "t1", "t2"]
+    assert listed == ["Home", "Work"]
+    assert remaining == [] and task_repo.count_by_project(1) == 0
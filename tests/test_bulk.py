@@ -0,0 +1,50 @@
+from dataclasses import replace
+
+import pytest
+
+from todolist.config.settings import Settings
+from todolist.core.services.project_service import ProjectService, UpdateProject
+from todolist.core.services.task_service import TaskService, UpdateTask
+from todolist.data.factory import create_repositories
+
+
+def _services():
+    settings = replace(Settings(), STORAGE_BACKEND = "memory")
+    project_repo, task_repo = create_repositories(settings)
+    return ProjectService(project_repo, task_repo, settings = settings), TaskService(task_repo, project_repo, settings = settings)
+
+
+def test_malformed_task_rows_are_rejected_without_aborting_the_import():
+    projects, tasks = _services()
+    projects.create_project("Home")
+    records = [
+        {"project": "Home", "name": "ok"},
+        ["x"],
+        {"project": "Home", "name": "number status", "status": 2},
+        {"project": "Home", "name": "list status", "status": ["x"]},
+        {"project": "Home", "name": "number deadline", "deadline": 20240101},
+        "text",
+        {"project": "Home", "name": "also ok", "status": "done", "deadline": "2024-01-01"},
+    ]
+    result = tasks.add_tasks_bulk(records)
+    assert result.added == 2
+    assert [error.row for error in result.errors] == [2, 3, 4, 5, 6]
+
+
+def test_malformed_project_rows_are_rejected_without_aborting_the_import():
+    projects, _ = _services()
+    result = projects.import_projects([{"name": "Home"}, ["x"], 5, {"name": "Work"}])
+    assert result.added == 2
+    assert [error.row for error in result.errors] == [2, 3]
+
+
+def test_updates_check_the_limits_of_their_settings():
+    settings = replace(Settings(), STORAGE_BACKEND = "memory", MAX_NAME_LEN = 50)
+    project_repo, task_repo = create_repositories(settings)
+    project = ProjectService(project_repo, task_repo, settings = settings).create_project("Home")
+    task = TaskService(task_repo, project_repo, settings = settings).add_task(project.id, name = "t")
+    long_name = "x" * 40
+    assert UpdateTask(task_repo, settings = settings).edit_task_name(task.id, name = long_name).name == long_name
+    assert UpdateProject(project_repo, settings = settings).edit_project_name(project.id, name = long_name).name == long_name
+    with pytest.raises(ValueError):
+        UpdateTask(task_repo).edit_task_name(task.id, name = "y" * 40)
@@ -0,0 +1,140 @@
+import threading
+from contextlib import contextmanager
+
+from todolist.core.domain.task import Task
+from todolist.core.repositories.change_feed import ChangeFeed, MaterializedView
+from todolist.data.repositories.feed_repository import FeedTaskRepository
+from todolist.data.repositories.in_memory_task_repository import InMemoryTaskRepository
+
+
+class _MeetingTaskRepository(InMemoryTaskRepository):
+    """Adds wait until two of them run at once."""
+
+    def __init__(self):
+        super().__init__()
+        self.barrier = threading.Barrier(2, timeout = 5)
+
+    def add(self, task):
+        self.barrier.wait()
+        return super().add(task)
+
+
+class _LockedTaskRepository(InMemoryTaskRepository):
+    """Writes and batches hold one connection lock, as the sqlite backend does."""
+
+    def __init__(self):
+        super().__init__()
+        self.connection = threading.RLock()
+        self.waiting = threading.Event()
+
+    def update(self, task):
+        self.waiting.set()
+        with self.connection:
+            return super().update(task)
+
+    def remove_by_project(self, project_id):
+        with self.connection:
+            return super().remove_by_project(project_id)
+
+    @contextmanager
+    def batch(self):
+        with self.connection:
+            yield
+
+
+class _TaskIds(MaterializedView):
+
+    def __init__(self, feed, task_repo):
+        self.task_repo = task_repo
+        self.ids = []
+        super().__init__(feed)
+
+    def load(self):
+        self.ids = [task.id for task in self.task_repo.list_by_project(1)]
+
+    def apply(self, change):
+        self.ids.append(change.id)
+
+
+def _task(task_id, project_id = 1):
+    return Task(id = task_id, project_id = project_id, name = f"t{task_id}")
+
+
+def test_backend_writes_run_outside_the_feed_lock():
+    feed = ChangeFeed()
+    tasks = FeedTaskRepository(_MeetingTaskRepository(), feed)
+    seqs = []
+    feed.subscribe(lambda change: seqs.append(change.seq))
+    errors = []
+
+    def add(task_id):
+        try:
+            tasks.add(_task(task_id))
+        except threading.BrokenBarrierError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target = add, args = (i,)) for i in (1, 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert sorted(seqs) == [1, 2]
+
+
+def test_an_open_batch_does_not_hold_other_writers_back():
+    feed = ChangeFeed()
+    tasks = FeedTaskRepository(InMemoryTaskRepository(), feed)
+    published = []
+    feed.subscribe(lambda change: published.append(change.id))
+    done = threading.Event()
+
+    with tasks.batch():
+        tasks.add(_task(1))
+        thread = threading.Thread(target = lambda: (tasks.add(_task(2)), done.set()))
+        thread.start()
+        assert done.wait(5)
+        assert published == [2]
+    thread.join()
+    assert published == [2, 1]
+
+
+def test_a_view_loads_between_writes():
+    feed = ChangeFeed()
+    tasks = FeedTaskRepository(InMemoryTaskRepository(), feed)
+    view = _TaskIds(feed, tasks)
+    reloaded = threading.Event()
+
+    with tasks.batch():
+        tasks.add(_task(1))
+        thread = threading.Thread(target = lambda: (view.reload(), reloaded.set()))
+        thread.start()
+        # the reload waits for the batch, so it neither misses nor repeats task 1
+        assert not reloaded.wait(0.2)
+    thread.join()
+    assert view.ids == [1]
+
+
+def test_a_batch_holding_the_backend_does_not_wait_for_entity_stripes():
+    feed = ChangeFeed()
+    backend = _LockedTaskRepository()
+    tasks = FeedTaskRepository(backend, feed)
+    tasks.add(_task(1))
+    tasks.add(_task(2))
+    tasks.add(_task(3, project_id = 2))
+    removed = []
+
+    def batch():
+        with tasks.batch():
+            # the updater holds task 3's stripe and waits for the connection the batch holds
+            updater.start()
+            backend.waiting.wait(5)
+            removed.append(tasks.remove_by_project(1))
+
+    updater = threading.Thread(target = lambda: tasks.update(_task(3, project_id = 2)), daemon = True)
+    batcher = threading.Thread(target = batch, daemon = True)
+    batcher.start()
+    batcher.join(5)
+    updater.join(5)
+    assert not batcher.is_alive() and not updater.is_alive()
+    assert removed == [2]
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from todolist.main import main
+
+
+@pytest.fixture(autouse = True)
+def _memory_settings(monkeypatch):
+    for name, value in (
+        ("MAX_NUMBER_OF_PROJECT", "5"), ("MAX_NUMBER_OF_TASK", "10"), ("MAX_NAME_LENGTH", "30"),
+        ("MAX_DESCRIPTION_LENGTH", "150"), ("STORAGE_BACKEND", "memory"),
+    ):
+        monkeypatch.setenv(name, value)
+
+
+def test_export_to_an_unknown_format_is_reported(tmp_path, capsys):
+    assert main(["export", str(tmp_path / "out.txt")]) == 1
+    assert capsys.readouterr().err.startswith("Error: Cannot infer format")
+
+
+def test_import_of_a_missing_file_is_reported(tmp_path, capsys):
+    assert main(["import", str(tmp_path / "missing.csv")]) == 1
+    assert capsys.readouterr().err.startswith("Error: [Errno 2]")
+
+
+def test_a_malformed_jsonl_line_fails_only_its_row(tmp_path, capsys):
+    path = tmp_path / "projects.jsonl"
+    path.write_text('{"name": "Home"}\n{"name": \n{"name": "Work"}\n', encoding = "utf-8")
+    assert main(["import", str(path), "--kind", "projects"]) == 1
+    out, err = capsys.readouterr()
+    assert err.startswith("row 2: Row is not valid JSON:")
+    assert "Imported 2 projects; 1 rows failed." in out
+
+
+def test_help_on_a_script_line_fails_only_that_line(tmp_path, capsys):
+    path = tmp_path / "script.txt"
+    path.write_text("project create --name Home\nproject list -h\nproject edit --help\nproject create --name Work\n", encoding = "utf-8")
+    assert main(["run", str(path)]) == 1
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["line"] for line in lines] == [1, 2, 3, 4]
+    assert ["error" in line for line in lines] == [False, True, True, False]
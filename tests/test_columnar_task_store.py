@@ -0,0 +1,33 @@
+from datetime import date
+
+from todolist.core.domain.status import TaskStatus
+from todolist.core.domain.task import Task
+from todolist.data.repositories.columnar_task_store import ColumnarTaskStore
+
+
+def _task(task_id, project_id = 1, deadline = None):
+    return Task(id = task_id, project_id = project_id, name = f"task {task_id}", status = TaskStatus.DOING, deadline = deadline)
+
+
+def test_sparse_ids_take_one_row_each():
+    store = ColumnarTaskStore()
+    ids = [3, 10 ** 12, 7, 2 ** 40]
+    for task_id in ids:
+        store[task_id] = _task(task_id, deadline = date(2024, 1, task_id % 28 + 1))
+    assert len(store._ids) == len(ids)
+    assert sorted(store.keys()) == sorted(ids)
+    assert store[10 ** 12].name == f"task {10 ** 12}"
+    assert store.state(7) == (1, TaskStatus.DOING, date(2024, 1, 8).toordinal())
+
+
+def test_pop_moves_the_last_row_into_the_hole():
+    store = ColumnarTaskStore()
+    for task_id in (5, 500, 50_000):
+        store[task_id] = _task(task_id, project_id = task_id)
+    assert store.pop(5).project_id == 5
+    assert store.pop(5, None) is None
+    assert len(store) == 2 and 5 not in store
+    assert [store[i].project_id for i in (500, 50_000)] == [500, 50_000]
+    store[50_000] = _task(50_000, project_id = 9)
+    assert store.state(50_000)[0] == 9 and store.state(500)[0] == 500
+    assert sorted(t.id for t in store.values()) == [500, 50_000]
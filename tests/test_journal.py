@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+import time
+
+from todolist.core.domain.task import Task
+from todolist.data.journal import Journal
+from todolist.data.repositories.journal_task_repository import JournalTaskRepository
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_KILLED_WRITER = """
+import os, sys
+from todolist.data.journal import Journal
+
+journal = Journal(sys.argv[1], "tasks")
+for i in range(10):
+    journal.append(["a", i])
+os._exit(0)
+"""
+
+
+def test_appended_records_survive_a_killed_process(tmp_path):
+    subprocess.run([sys.executable, "-c", _KILLED_WRITER, str(tmp_path)], check = True, cwd = ROOT)
+    assert list(Journal(str(tmp_path), "tasks").replay()) == [["a", i] for i in range(10)]
+
+
+def test_idle_group_is_synced_by_the_timer(tmp_path):
+    journal = Journal(str(tmp_path), "tasks", group_interval = 0.01)
+    journal.append(["a", 1])
+    deadline = time.monotonic() + 5
+    while journal._pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert journal._pending == 0
+    journal.close()
+
+
+def test_replay_follows_tasks_moved_before_their_project_was_removed(tmp_path):
+    repo = JournalTaskRepository(Journal(str(tmp_path), "tasks"))
+    for task_id in range(1, 5):
+        repo.add(Task(id = task_id, project_id = 1, name = f"t{task_id}"))
+    repo.update(Task(id = 2, project_id = 2, name = "moved"))
+    repo.remove(3)
+    repo.remove_by_project(1)
+    repo.close()
+
+    repo = JournalTaskRepository(Journal(str(tmp_path), "tasks"))
+    assert [task.id for task in repo.list_by_project(2)] == [2]
+    assert repo.get_by_id(1) is None and repo.get_by_id(4) is None
+    repo.close()
+
+
+def test_writes_never_compact_the_journal(tmp_path):
+    repo = JournalTaskRepository(Journal(str(tmp_path), "tasks", compact_after = 10))
+    for task_id in range(1, 51):
+        repo.add(Task(id = task_id, project_id = 1, name = f"t{task_id}"))
+    assert not os.path.exists(tmp_path / "tasks.snapshot")
+    repo.close()
+    # compacted on close instead
+    assert os.path.exists(tmp_path / "tasks.snapshot")
+    repo = JournalTaskRepository(Journal(str(tmp_path), "tasks"))
+    assert repo.count_by_project(1) == 50
+    repo.close()
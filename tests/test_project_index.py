@@ -0,0 +1,94 @@
+import os
+from dataclasses import replace
+from datetime import date
+
+import pytest
+
+from benchmarks.bench_project_index import run
+from todolist.config.settings import Settings
+from todolist.core.domain.project import Project
+from todolist.core.domain.status import TaskStatus
+from todolist.core.domain.task import Task
+from todolist.core.repositories.task_query import TaskQuery
+from todolist.data.factory import create_repositories
+
+BACKENDS = [
+    ("memory", False, False),
+    ("memory", True, False),
+    ("memory", False, True),
+    ("journal", False, False),
+    ("snapshot", False, False),
+    ("sqlite", False, False),
+]
+
+
+@pytest.fixture(params = BACKENDS, ids = lambda p: f"{p[0]}{'-compact' if p[1] else ''}{'-threads' if p[2] else ''}")
+def repos(request, tmp_path):
+    backend, compact, thread_safe = request.param
+    settings = replace(Settings(), STORAGE_BACKEND = backend, COMPACT_TASKS = compact, DATA_DIR = os.path.join(tmp_path, "data"))
+    project_repo, task_repo = create_repositories(settings, thread_safe = thread_safe)
+    for name in ("a", "b"):
+        project_repo.add(Project(id = project_repo.next_available_id(), name = name))
+    yield project_repo, task_repo
+    task_repo.close()
+    project_repo.close()
+
+
+def test_update_moves_a_task_between_projects(repos):
+    _, tasks = repos
+    for i in range(1, 6):
+        tasks.add(Task(id = tasks.next_available_id(), project_id = 1, name = f"t{i}", status = TaskStatus.DOING))
+    moved = replace(tasks.get_by_id(3), project_id = 2, deadline = date(2024, 1, 1))
+    tasks.update(moved)
+
+    assert [t.id for t in tasks.list_by_project(1)] == [1, 2, 4, 5]
+    assert [t.id for t in tasks.list_by_project(2)] == [3]
+    assert [t.id for t in tasks.page_by_project(1, 1, 2)] == [2, 4]
+    assert [t.id for t in tasks.page_by_project(2)] == [3]
+    assert (tasks.count_by_project(1), tasks.count_by_project(2)) == (4, 1)
+    assert tasks.stats_by_project(1).by_status[TaskStatus.DOING] == 4
+    assert tasks.stats_by_project(2).by_status[TaskStatus.DOING] == 1
+    assert [t.id for t in tasks.find(TaskQuery(project_id = 2))] == [3]
+    assert [t.id for t in tasks.find(TaskQuery(project_id = 1, due_before = date(2025, 1, 1)))] == []
+    assert tasks.get_by_id(3).project_id == 2
+
+
+def test_moving_back_and_removing_leaves_no_trace(repos):
+    _, tasks = repos
+    task = tasks.add(Task(id = tasks.next_available_id(), project_id = 1, name = "t"))
+    tasks.update(replace(task, project_id = 2))
+    tasks.update(replace(task, project_id = 1))
+    assert [t.id for t in tasks.list_by_project(1)] == [task.id]
+    assert list(tasks.list_by_project(2)) == [] and tasks.count_by_project(2) == 0
+    assert tasks.remove(task.id)
+    assert list(tasks.list_by_project(1)) == [] and tasks.page_by_project(1) == []
+    assert tasks.count_by_project(1) == 0
+
+
+@pytest.mark.parametrize("compact", [False, True], ids = ["objects", "compact"])
+def test_per_project_operations_stay_flat_as_the_project_grows(compact):
+    # an O(n) add, move or remove costs 8x more per operation at the larger size
+    small, large = 5_000, 40_000
+    best_small = run(small, compact)
+    best_large = run(large, compact)
+    for _ in range(2):
+        best_small = {name: min(us, best_small[name]) for name, us in run(small, compact).items()}
+        best_large = {name: min(us, best_large[name]) for name, us in run(large, compact).items()}
+    for name, us in best_large.items():
+        assert us / best_small[name] < 3.0, f"{name}: {best_small[name]:.2f}us/op at {small}, {us:.2f}us/op at {large}"
+
+
+def test_pages_keep_their_sorted_ids_while_tasks_are_appended():
+    from todolist.data.repositories.in_memory_task_repository import InMemoryTaskRepository
+
+    repo = InMemoryTaskRepository()
+    for i in (1, 2, 3):
+        repo.add(Task(id = i, project_id = 1, name = f"t{i}"))
+    assert [t.id for t in repo.page_by_project(1)] == [1, 2, 3]
+    cached = repo._sorted_ids[1]
+    repo.add(Task(id = 10, project_id = 1, name = "t10"))
+    assert repo._sorted_ids[1] is cached
+    assert [t.id for t in repo.page_by_project(1, 3)] == [10]
+    # an id below the largest one cannot be appended: the next page sorts again
+    repo.add(Task(id = 5, project_id = 1, name = "t5"))
+    assert [t.id for t in repo.page_by_project(1, 3)] == [5, 10]
@@ -0,0 +1,59 @@
+import json
+import os
+import subprocess
+import sys
+from dataclasses import replace
+
+import pytest
+
+from todolist.config.settings import Settings
+from todolist.data.factory import create_repositories
+from todolist.main import wire
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# deletes a project and is killed before any of its tasks is freed
+_KILLED_DELETER = """
+import json, os, sys
+from dataclasses import replace
+from todolist.config.settings import Settings
+from todolist.main import wire
+
+settings = replace(Settings(), MAX_TASKS = 100, STORAGE_BACKEND = sys.argv[1], DATA_DIR = sys.argv[2])
+services = wire(settings)
+# the batch commits the sqlite writes, removal included, before the kill
+with services.project_repo.batch():
+    doomed = services.projects.create_project("Doomed")
+    kept = services.projects.create_project("Kept")
+    doomed_ids = [services.tasks.add_task(doomed.id, name = f"d{i}").id for i in range(50)]
+    kept_ids = [services.tasks.add_task(kept.id, name = f"k{i}").id for i in range(3)]
+    services.projects.delete_project(doomed.id)
+print(json.dumps([doomed.id, doomed_ids, kept_ids]))
+sys.stdout.flush()
+os._exit(0)
+"""
+
+
+@pytest.mark.parametrize("backend", ["journal", "sqlite", "snapshot"])
+def test_tasks_of_a_deleted_project_are_reclaimed_after_a_kill(backend, tmp_path):
+    data_dir = os.path.join(tmp_path, "data")
+    result = subprocess.run(
+        [sys.executable, "-c", _KILLED_DELETER, backend, data_dir], check = True, cwd = ROOT, capture_output = True, text = True,
+    )
+    doomed, doomed_ids, kept_ids = json.loads(result.stdout)
+    settings = replace(Settings(), MAX_TASKS = 100, STORAGE_BACKEND = backend, DATA_DIR = data_dir)
+
+    services = wire(settings)
+    # hidden at once, before a single chunk is freed
+    assert [progress.project_id for progress in services.task_repo.progress()] == [doomed]
+    assert all(services.task_repo.get_by_id(task_id) is None for task_id in doomed_ids)
+    assert services.task_repo.count_by_project(doomed) == 0
+    services.close()
+
+    project_repo, task_repo = create_repositories(settings)
+    try:
+        assert list(task_repo.project_ids()) != [] and doomed not in set(task_repo.project_ids())
+        assert all(task_repo.get_by_id(task_id) is None for task_id in doomed_ids)
+        assert sorted(task.id for task in task_repo.list_by_project(2)) == kept_ids
+    finally:
+        task_repo.close()
+        project_repo.close()
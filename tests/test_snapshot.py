@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+from dataclasses import replace
+
+from todolist.config.settings import Settings
+from todolist.core.domain.project import Project
+from todolist.core.domain.task import Task
+from todolist.data.factory import create_repositories
+from todolist.data.repositories.snapshot_project_repository import SnapshotProjectRepository
+from todolist.data.repositories.snapshot_task_repository import SnapshotTaskRepository
+from todolist.data.snapshot import SnapshotStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_KILLED_WRITER = """
+import os, sys
+from dataclasses import replace
+from todolist.config.settings import Settings
+from todolist.core.domain.project import Project
+from todolist.core.domain.task import Task
+from todolist.data.factory import create_repositories
+
+project_repo, task_repo = create_repositories(replace(Settings(), STORAGE_BACKEND = "snapshot", DATA_DIR = sys.argv[1]))
+if sys.argv[2] == "save":
+    project = project_repo.add(Project(id = project_repo.next_available_id(), name = "saved"))
+    for i in range(3):
+        task_repo.add(Task(id = task_repo.next_available_id(), project_id = project.id, name = f"saved {i}"))
+    task_repo.close()
+    project_repo.close()
+else:
+    project = project_repo.add(Project(id = project_repo.next_available_id(), name = "killed"))
+    with task_repo.batch():
+        task_repo.add(Task(id = task_repo.next_available_id(), project_id = project.id, name = "killed"))
+    task_repo.remove(1)
+    os._exit(0)
+"""
+
+
+def test_changes_since_the_last_save_survive_a_killed_process(tmp_path):
+    for step in ("save", "kill"):
+        subprocess.run([sys.executable, "-c", _KILLED_WRITER, str(tmp_path), step], check = True, cwd = ROOT)
+    project_repo, task_repo = create_repositories(replace(Settings(), STORAGE_BACKEND = "snapshot", DATA_DIR = str(tmp_path)))
+    try:
+        assert sorted(p.name for p in project_repo.list_all_projects()) == ["killed", "saved"]
+        assert task_repo.get_by_id(1) is None
+        assert [t.name for t in task_repo.list_by_project(2)] == ["killed"]
+        assert task_repo.count_by_project(1) == 2
+    finally:
+        task_repo.close()
+        project_repo.close()
+
+
+def _open(path, **options):
+    store = SnapshotStore(str(path), **options)
+    return store, SnapshotProjectRepository(store), SnapshotTaskRepository(store)
+
+
+def test_closing_after_a_write_leaves_the_snapshot_untouched(tmp_path):
+    path = tmp_path / "todolist.snap"
+    store, project_repo, task_repo = _open(path)
+    project = project_repo.add(Project(id = project_repo.next_available_id(), name = "saved"))
+    task_repo.add(Task(id = task_repo.next_available_id(), project_id = project.id, name = "saved"))
+    store.save()
+    store.close()
+    saved = path.read_bytes(), os.stat(path).st_mtime_ns
+
+    store, project_repo, task_repo = _open(path)
+    task_repo.add(Task(id = task_repo.next_available_id(), project_id = project.id, name = "journaled"))
+    store.close()
+    assert (path.read_bytes(), os.stat(path).st_mtime_ns) == saved
+
+    store, _, task_repo = _open(path)
+    assert [t.name for t in task_repo.list_by_project(project.id)] == ["saved", "journaled"]
+    store.close()
+
+
+def test_journals_past_the_threshold_are_folded_on_close(tmp_path):
+    path = tmp_path / "todolist.snap"
+    store, project_repo, task_repo = _open(path, fold_after = 10)
+    project = project_repo.add(Project(id = project_repo.next_available_id(), name = "p"))
+    for i in range(10):
+        task_repo.add(Task(id = task_repo.next_available_id(), project_id = project.id, name = f"t{i}"))
+    store.close()
+
+    store, _, task_repo = _open(path, fold_after = 10)
+    assert store.snapshot is not None and store.snapshot.task_count == 10
+    assert store.task_log.records_since_snapshot == 0
+    store.close()
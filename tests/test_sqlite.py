@@ -0,0 +1,40 @@
+import sqlite3
+import threading
+import time
+
+from todolist.data.sqlite import SqliteDatabase
+
+_INSERT = "INSERT INTO projects (id, name, name_lower) VALUES (?, ?, ?)"
+
+
+def _committed(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_a_lone_write_is_committed_within_the_interval(tmp_path):
+    path = str(tmp_path / "todolist.db")
+    db = SqliteDatabase(path, commit_interval = 0.02)
+    db.write(_INSERT, (1, "p1", "p1"))
+    deadline = time.monotonic() + 5
+    while _committed(path) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _committed(path) == 1
+    db.close()
+
+
+def test_reads_see_uncommitted_writes_from_any_thread(tmp_path):
+    db = SqliteDatabase(str(tmp_path / "todolist.db"), commit_interval = 60)
+    db.write(_INSERT, (1, "p1", "p1"))
+    seen = []
+    thread = threading.Thread(target = lambda: seen.append(db.query_one("SELECT name FROM projects WHERE id = ?", (1,))))
+    thread.start()
+    thread.join()
+    assert seen == [("p1",)]
+    db.commit()
+    # committed: the read runs on the thread's own connection
+    assert db.query("SELECT name FROM projects") == [("p1",)]
+    db.close()
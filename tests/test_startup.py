@@ -0,0 +1,15 @@
+import os
+
+import pytest
+
+from benchmarks.bench_startup import deferral_failures, timing_failures
+
+
+def test_optional_modules_are_deferred():
+    assert deferral_failures() == []
+
+
+@pytest.mark.skipif(not os.environ.get("TODOLIST_TIMING"), reason = "timing budgets run when TODOLIST_TIMING is set")
+def test_startup_stays_within_budget():
+    # the budgets of benchmarks/bench_startup.py, in multiples of a bare interpreter's imports
+    assert timing_failures(runs = 5, budget = 5.0, command_budget = 15.0) == []
@@ -0,0 +1,44 @@
+import random
+from dataclasses import replace
+from datetime import date, timedelta
+
+from todolist.core.domain.status import TaskStatus
+from todolist.core.domain.task import Task
+from todolist.core.repositories.task_query import TaskQuery
+from todolist.core.repositories.task_repository import TaskRepository
+from todolist.data.repositories.in_memory_task_repository import InMemoryTaskRepository
+
+START = date(2024, 1, 1)
+
+
+def _scan(repo, query):
+    # the scan-based default, run over the same tasks
+    return TaskRepository.find(repo, query)
+
+
+class _Scanned(InMemoryTaskRepository):
+    def iter_all_tasks(self):
+        for project_id in range(4):
+            yield from self.list_by_project(project_id)
+
+
+def test_deadline_buckets_answer_like_a_scan_after_moves_and_removes():
+    rng = random.Random(7)
+    repo = _Scanned()
+    for _ in range(2000):
+        deadline = rng.choice([None, START + timedelta(days = rng.randrange(30))])
+        repo.add(Task(id = repo.next_available_id(), project_id = rng.randrange(4), name = "t",
+                      status = rng.choice(list(TaskStatus)), deadline = deadline))
+    ids = list(range(1, repo.next_available_id()))
+    for task_id in rng.sample(ids, 500):
+        task = repo.get_by_id(task_id)
+        repo.update(replace(task, project_id = rng.randrange(4), deadline = START + timedelta(days = rng.randrange(30))))
+    for task_id in rng.sample(ids, 300):
+        repo.remove(task_id)
+    for query in (
+        TaskQuery(due_before = START + timedelta(days = 10)),
+        TaskQuery(due_after = START + timedelta(days = 25), order_by = "deadline"),
+        TaskQuery(due_after = START + timedelta(days = 5), due_before = START + timedelta(days = 6), limit = 7),
+        TaskQuery(project_id = 2, statuses = frozenset([TaskStatus.DONE]), order_by = "deadline", limit = 20),
+    ):
+        assert [t.id for t in repo.find(query)] == [t.id for t in _scan(repo, query)]
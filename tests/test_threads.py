@@ -0,0 +1,77 @@
+import os
+import sys
+import threading
+from dataclasses import replace
+
+import pytest
+
+from benchmarks.stress_threads import run
+from todolist.config.settings import Settings
+from todolist.core.domain.task import Task
+from todolist.core.repositories.task_query import TaskQuery
+from todolist.data.factory import create_repositories
+from todolist.data.repositories.thread_safe_task_repository import ThreadSafeTaskRepository
+
+
+@pytest.fixture
+def fast_switching():
+    interval = sys.getswitchinterval()
+    # switch threads as often as possible to provoke races
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+@pytest.mark.parametrize("backend", ["memory", "compact", "sqlite"])
+def test_concurrent_services_keep_ids_names_and_limits(backend, tmp_path, fast_switching):
+    settings = replace(
+        Settings(),
+        MAX_PROJECTS = 8,
+        MAX_TASKS = 40,
+        STORAGE_BACKEND = "sqlite" if backend == "sqlite" else "memory",
+        COMPACT_TASKS = backend == "compact",
+        DATA_DIR = os.path.join(tmp_path, "data"),
+    )
+    project_repo, task_repo = create_repositories(settings, thread_safe = True)
+    try:
+        assert run(settings, project_repo, task_repo, threads = 8, ops = 1500) == []
+    finally:
+        task_repo.close()
+        project_repo.close()
+
+
+def test_tasks_moving_between_stripes_stay_visible(fast_switching):
+    repo = ThreadSafeTaskRepository(stripes = 4)
+    # projects 1 and 2 live on different stripes
+    ids = [repo.add(Task(id = repo.next_available_id(), project_id = 1, name = f"t{i}")).id for i in range(50)]
+    failures = []
+    done = threading.Event()
+
+    def mover():
+        for round in range(40):
+            for task_id in ids:
+                repo.update(replace(repo.get_by_id(task_id), project_id = 1 + (round + 1) % 2))
+
+    def reader():
+        while not done.is_set():
+            for task_id in ids:
+                if repo.get_by_id(task_id) is None:
+                    failures.append(f"task {task_id} vanished while moving")
+            # the two counts are taken at different moments, so only each one is bounded
+            for project_id in (1, 2):
+                count = repo.count_by_project(project_id)
+                if count > len(ids):
+                    failures.append(f"{count} tasks counted in project {project_id}")
+
+    readers = [threading.Thread(target = reader) for _ in range(3)]
+    for thread in readers:
+        thread.start()
+    mover()
+    done.set()
+    for thread in readers:
+        thread.join()
+    assert failures == []
+    assert repo.count_by_project(1) + repo.count_by_project(2) == len(ids)
+    assert sorted(t.id for t in repo.find(TaskQuery())) == ids
+    assert repo.remove_by_project(1) + repo.remove_by_project(2) == len(ids)
+    assert all(repo.get_by_id(task_id) is None for task_id in ids)
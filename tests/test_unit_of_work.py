@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from todolist.core.domain.project import Project
+from todolist.core.domain.task import Task
+from todolist.core.repositories.unit_of_work import UnitOfWork
+from todolist.data.repositories.in_memory_project_repository import InMemoryProjectRepository
+from todolist.data.repositories.in_memory_task_repository import InMemoryTaskRepository
+
+
+class _MeetingTaskRepository(InMemoryTaskRepository):
+    """Adds wait until two of them run at once."""
+
+    def __init__(self):
+        super().__init__()
+        self.barrier = threading.Barrier(2, timeout = 5)
+
+    def add(self, task):
+        self.barrier.wait()
+        return super().add(task)
+
+
+def _task(task_id, project_id = 1):
+    return Task(id = task_id, project_id = project_id, name = f"t{task_id}")
+
+
+def test_writes_outside_units_run_concurrently():
+    uow = UnitOfWork(InMemoryProjectRepository(), _MeetingTaskRepository())
+    errors = []
+
+    def add(task_id):
+        try:
+            uow.tasks.add(_task(task_id))
+        except threading.BrokenBarrierError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target = add, args = (i,)) for i in (1, 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert uow.tasks.count_by_project(1) == 2
+
+
+def test_other_threads_writes_wait_for_a_unit_and_survive_its_rollback():
+    uow = UnitOfWork(InMemoryProjectRepository(), InMemoryTaskRepository())
+    uow.projects.add(Project(id = 1, name = "Home"))
+    written = threading.Event()
+    seen_inside = []
+
+    def writer():
+        uow.tasks.add(_task(2))
+        written.set()
+
+    with pytest.raises(RuntimeError):
+        with uow:
+            uow.tasks.add(_task(1))
+            thread = threading.Thread(target = writer)
+            thread.start()
+            seen_inside.append(written.wait(0.2))
+            # reads are not gated: this thread's uncommitted write is visible to all
+            assert uow.tasks.get_by_id(1) is not None
+            raise RuntimeError("roll back")
+    thread.join()
+    assert seen_inside == [False]
+    assert uow.tasks.get_by_id(1) is None
+    assert uow.tasks.get_by_id(2) is not None
@@ -0,0 +1,70 @@
+import pytest
+
+from todolist.core.domain.task import Task
+from todolist.core.repositories.change_feed import TASK, ChangeFeed
+from todolist.core.services.version_service import VersionTracker
+from todolist.data.journal import Journal
+from todolist.data.repositories.feed_repository import FeedProjectRepository, FeedTaskRepository
+from todolist.data.repositories.in_memory_project_repository import InMemoryProjectRepository
+from todolist.data.repositories.in_memory_task_repository import InMemoryTaskRepository
+
+
+def _open(directory, **options):
+    feed = ChangeFeed()
+    project_repo = FeedProjectRepository(InMemoryProjectRepository(), feed)
+    task_repo = FeedTaskRepository(InMemoryTaskRepository(), feed)
+    tracker = VersionTracker(feed, project_repo, task_repo, log = Journal(str(directory), "versions", **options))
+    return tracker, task_repo
+
+
+def _write(task_repo, ids):
+    for task_id in ids:
+        task_repo.add(Task(id = task_id, project_id = 1, name = f"t{task_id}"))
+
+
+def test_versions_survive_a_clean_restart(tmp_path):
+    tracker, task_repo = _open(tmp_path)
+    _write(task_repo, range(1, 4))
+    tracker.close()
+
+    tracker, task_repo = _open(tmp_path)
+    assert tracker.version == 3 and tracker.floor == 0
+    _write(task_repo, [4])
+    assert [change.id for change in tracker.changes_since(3)] == [4]
+    tracker.close()
+
+
+def test_versions_from_before_an_unclean_shutdown_are_rejected(tmp_path):
+    tracker, task_repo = _open(tmp_path)
+    _write(task_repo, range(1, 4))
+    # killed: the log is never closed
+    tracker._log.sync()
+
+    tracker, task_repo = _open(tmp_path)
+    assert tracker.floor == 3
+    with pytest.raises(ValueError):
+        tracker.changes_since(2)
+    _write(task_repo, [4])
+    tracker.close()
+
+    # the floor outlives later clean restarts, and newer versions work
+    tracker, _ = _open(tmp_path)
+    with pytest.raises(ValueError):
+        tracker.changes_since(3)
+    assert [change.id for change in tracker.changes_since(4)] == []
+    tracker.close()
+
+
+def test_compaction_keeps_every_stamp(tmp_path):
+    tracker, task_repo = _open(tmp_path, compact_after = 10)
+    _write(task_repo, range(1, 101))
+    for task_id in range(1, 101, 2):
+        task_repo.remove(task_id)
+    expected = {task_id: tracker.version_of(TASK, task_id) for task_id in range(1, 101)}
+    tracker.close()
+
+    tracker, _ = _open(tmp_path)
+    assert tracker.version == 150 and tracker.floor == 0
+    assert {task_id: tracker.version_of(TASK, task_id) for task_id in range(1, 101)} == expected
+    assert tracker._log.records_since_snapshot < 150
+    tracker.close()
@@ -0,0 +1,194 @@
+"""Command-line entry points besides the interactive menu."""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from typing import TYPE_CHECKING, List, Optional
+
+from todolist.cli.script import add_operation_commands
+
+if TYPE_CHECKING:
+    from todolist.cli.script import Operations
+    from todolist.core.domain.task import Task
+    from todolist.core.services.project_service import ProjectService
+    from todolist.core.services.task_service import TaskService
+
+# handlers import their modules when run, keeping argument parsing cheap
+FORMATS = ("csv", "jsonl")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog = "todolist", description = "ToDoList CLI. Runs the interactive menu when no command is given.")
+    parser.add_argument("--metrics", metavar = "PATH", help = "record call metrics and write them in Prometheus format to PATH (- for stdout) on exit")
+    parser.add_argument("--metrics-interval", type = float, default = 10.0, metavar = "SECONDS", help = "with serve, also rewrite the metrics file this often")
+    parser.add_argument("--profile", metavar = "PATH", help = "profile the session with cProfile and write the stats to PATH")
+    commands = parser.add_subparsers(dest = "command")
+
+    import_cmd = commands.add_parser("import", help = "import tasks or projects from a CSV/JSONL file")
+    import_cmd.add_argument("path")
+    import_cmd.add_argument("--kind", choices = ("tasks", "projects"), default = "tasks")
+    import_cmd.add_argument("--format", choices = FORMATS)
+    import_cmd.add_argument("--batch-size", type = int, default = 1000)
+
+    export_cmd = commands.add_parser("export", help = "export tasks or projects to a CSV/JSONL file")
+    export_cmd.add_argument("path")
+    export_cmd.add_argument("--kind", choices = ("tasks", "projects"), default = "tasks")
+    export_cmd.add_argument("--format", choices = FORMATS)
+    export_cmd.add_argument("--since", type = int, metavar = "VERSION", help = "only what changed after this store version, with ids, versions and deletions")
+
+    add_operation_commands(commands)
+
+    run_cmd = commands.add_parser("run", help = "run commands read one per line from a file or stdin")
+    run_cmd.add_argument("path", nargs = "?", default = "-", help = "script file, or - for stdin (default)")
+    run_cmd.add_argument("--stop-on-error", action = "store_true", help = "stop at the first failed command")
+
+    serve_cmd = commands.add_parser("serve", help = "serve the operations as JSON-RPC over a Unix socket")
+    serve_cmd.add_argument("--socket", help = "socket path (default: DATA_DIR/todolist.sock)")
+    serve_cmd.add_argument("--workers", type = int, default = 4, help = "worker threads handling requests")
+    serve_cmd.add_argument("--watch-deadlines", type = float, metavar = "SECONDS", help = "report tasks on stderr as their deadlines pass, checking this often")
+    return parser
+
+
+def run_import(args: argparse.Namespace, project_service: ProjectService, task_service: TaskService) -> int:
+    from todolist.cli.transfer import detect_format, read_records
+    from todolist.core.services.bulk import BulkResult
+
+    result: BulkResult
+    try:
+        records = read_records(args.path, detect_format(args.path, args.format))
+        if args.kind == "projects":
+            result = project_service.import_projects(records, batch_size = args.batch_size)
+        else:
+            result = task_service.add_tasks_bulk(records, batch_size = args.batch_size)
+    except (ValueError, OSError) as exc:
+        print(f"Error: {exc}", file = sys.stderr)
+        return 1
+    for error in result.errors:
+        print(f"row {error.row}: {error.message}", file = sys.stderr)
+    print(f"Imported {result.added} {args.kind}; {result.failed} rows failed.")
+    return 1 if result.failed else 0
+
+
+def run_export(args: argparse.Namespace, project_service: ProjectService, task_service: TaskService) -> int:
+    from todolist.cli.transfer import PROJECT_FIELDS, TASK_FIELDS, detect_format, write_records
+
+    try:
+        fmt: str = detect_format(args.path, args.format)
+        if args.since is not None:
+            return _export_changes(args, fmt, project_service, task_service)
+        if args.kind == "projects":
+            count = write_records(args.path, fmt, project_service.iter_project_records(), PROJECT_FIELDS)
+        else:
+            count = write_records(args.path, fmt, task_service.iter_task_records(), TASK_FIELDS)
+    except (ValueError, OSError) as exc:
+        print(f"Error: {exc}", file = sys.stderr)
+        return 1
+    print(f"Exported {count} {args.kind}.")
+    return 0
+
+
+def _export_changes(args: argparse.Namespace, fmt: str, project_service: ProjectService, task_service: TaskService) -> int:
+    from todolist.cli.transfer import PROJECT_CHANGE_FIELDS, TASK_CHANGE_FIELDS, write_records
+
+    version: int = task_service.versions.version if task_service.versions is not None else 0
+    if args.kind == "projects":
+        records, fields = project_service.project_change_records(args.since), PROJECT_CHANGE_FIELDS
+    else:
+        records, fields = task_service.task_change_records(args.since), TASK_CHANGE_FIELDS
+    count = write_records(args.path, fmt, records, fields)
+    print(f"Exported {count} {args.kind} changed since version {args.since}; the store is at version {version}.")
+    return 0
+
+
+def operations_of(project_service: ProjectService, task_service: TaskService) -> Operations:
+    from todolist.core.services.operations import build_operations
+    from todolist.core.services.project_service import UpdateProject
+    from todolist.core.services.task_service import UpdateTask
+    from todolist.instrumentation.hooks import instrument
+
+    return build_operations(
+        project_service,
+        task_service,
+        instrument(UpdateProject(project_service.project_repo, settings = project_service.settings, search = project_service.search)),
+        instrument(UpdateTask(task_service.task_repo, settings = task_service.settings, search = task_service.search, deadlines = task_service.deadlines)),
+    )
+
+
+def run_single(args: argparse.Namespace, project_service: ProjectService, task_service: TaskService) -> int:
+    import json
+    from todolist.cli.script import run_operation
+
+    try:
+        result = run_operation(args, operations_of(project_service, task_service))
+    except ValueError as exc:
+        print(f"Error: {exc}", file = sys.stderr)
+        return 1
+    print(json.dumps(result))
+    return 0
+
+
+def run_run(args: argparse.Namespace, project_service: ProjectService, task_service: TaskService) -> int:
+    from todolist.cli.script import run_script
+
+    operations = operations_of(project_service, task_service)
+    if args.path == "-":
+        failed = run_script(sys.stdin, operations, stop_on_error = args.stop_on_error)
+    else:
+        with open(args.path, encoding = "utf-8") as lines:
+            failed = run_script(lines, operations, stop_on_error = args.stop_on_error)
+    return 1 if failed else 0
+
+
+def run_serve(args: argparse.Namespace, project_service: ProjectService, task_service: TaskService) -> int:
+    from todolist.server.rpc import Dispatcher
+    from todolist.server.server import serve
+
+    path: str = args.socket or os.path.join(project_service.settings.DATA_DIR, "todolist.sock")
+    methods = operations_of(project_service, task_service)
+    writer = None
+    if args.metrics and args.metrics != "-":
+        from todolist.instrumentation.hooks import active
+        from todolist.instrumentation.metrics import MetricsWriter
+
+        writer = MetricsWriter(active(), args.metrics, args.metrics_interval).start()
+    watcher = None
+    if args.watch_deadlines and task_service.deadlines is not None:
+        from todolist.core.services.deadline_service import DeadlineWatcher
+
+        task_service.deadlines.on_overdue(_report_overdue)
+        watcher = DeadlineWatcher(task_service.deadlines, args.watch_deadlines).start()
+    print(f"Serving on {path} with {args.workers} workers; Ctrl+C to stop.", file = sys.stderr)
+    try:
+        serve(Dispatcher(methods), path, workers = args.workers)
+    except ValueError as exc:
+        print(f"Error: {exc}", file = sys.stderr)
+        return 2
+    finally:
+        if writer is not None:
+            writer.stop()
+        if watcher is not None:
+            watcher.stop()
+    return 0
+
+
+def _report_overdue(tasks: List[Task]) -> None:
+    for task in tasks:
+        print(f"Overdue: task {task.id} {task.name!r} (due {task.deadline.isoformat()})", file = sys.stderr)
+
+
+def run_command(args: argparse.Namespace, project_service: ProjectService, task_service: TaskService) -> int:
+    handlers = {
+        "import": run_import,
+        "export": run_export,
+        "project": run_single,
+        "task": run_single,
+        "search": run_single,
+        "run": run_run,
+        "serve": run_serve,
+    }
+    return handlers[args.command](args, project_service, task_service)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    return build_parser().parse_args(argv)
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
+import sys
 from datetime import datetime
-from typing import Union
+from itertools import islice
+from typing import Iterable, Union
 
 from todolist.core.domain.status import TaskStatus
 from todolist.core.services.project_service import ProjectService, UpdateProject
 from todolist.core.services.task_service import TaskService, UpdateTask
 
+# lines per screen when paging to a terminal, and per write otherwise
+PAGE_LINES = 40
+WRITE_LINES = 1000
+
 def run_menu(project_service: ProjectService, task_service: TaskService) -> None:
+    from todolist.instrumentation.hooks import instrument
+
     # Create update objects
-    project_update = UpdateProject(project_service.project_repo)
-    task_update = UpdateTask(task_service.task_repo)
+    project_update = instrument(UpdateProject(project_service.project_repo, settings=project_service.settings, search=project_service.search))
+    task_update = instrument(UpdateTask(task_service.task_repo, settings=task_service.settings, search=task_service.search, deadlines=task_service.deadlines))
     
     actions = {
         "1": ("Create project", lambda: _create_project(project_service)),
@@ -21,6 +29,8 @@ def run_menu(project_service: ProjectService, task_service: TaskService) -> None
         "6": ("Edit task", lambda: _run_edit_task_menu(project_service, task_service, task_update)),
         "7": ("Delete task", lambda: _delete_task(task_service)),
         "8": ("List tasks by project", lambda: _list_tasks(task_service)),
+        "9": ("Project summary", lambda: _project_summary(project_service)),
+        "10": ("Search", lambda: _search(task_service)),
         "0": ("Exit", None),
     }
 
@@ -99,14 +109,32 @@ def _delete_project(project_service: ProjectService) -> None:
     print("Deleted." if ok else "Project not found.")
 
 
+def _print_paged(header: str, lines: Iterable[str]) -> bool:
+    """Write ``lines`` in buffered chunks, pausing after each screen on a terminal.
+
+    Lines are pulled lazily, so output starts before the source is exhausted.
+    Returns False if there was nothing to print.
+    """
+    interactive: bool = sys.stdin.isatty() and sys.stdout.isatty()
+    size: int = PAGE_LINES if interactive else WRITE_LINES
+    lines = iter(lines)
+    chunk = list(islice(lines, size))
+    if not chunk:
+        return False
+    sys.stdout.write(header + "\n")
+    while chunk:
+        sys.stdout.write("\n".join(chunk) + "\n")
+        sys.stdout.flush()
+        chunk = list(islice(lines, size))
+        if chunk and interactive and input("-- more (Enter to continue, q to stop) -- ").strip().lower() == "q":
+            break
+    return True
+
+
 def _list_projects(project_service: ProjectService) -> None:
-    projects = list(project_service.list_projects())
-    if not projects:
+    lines = (f"- #{p.id} {p.name}: {p.description}" for p in project_service.iter_projects())
+    if not _print_paged("Projects:", lines):
         print("No projects found.")
-        return
-    print("Projects:")
-    for p in projects:
-        print(f"- #{p.id} {p.name}: {p.description}")  
   
         
 def _run_edit_task_menu(project_service: ProjectService, task_service: TaskService, task_update: UpdateTask) -> None:
@@ -197,16 +225,35 @@ def _delete_task(task_service: TaskService) -> None:
 def _list_tasks(task_service: TaskService) -> None:
     pid: Union[str, int] = input("Project id or name: ")
     try:
-        tasks = list(task_service.list_tasks_by_project(pid))
+        tasks = task_service.iter_tasks_by_project(pid)
     except Exception as exc:
         print(f"Error: {exc}")
         return
-    if not tasks:
+    lines = (
+        f"- #{t.id} {t.name}: {t.description} [{t.status.value}] due {t.deadline.isoformat() if t.deadline else '-'}"
+        for t in tasks
+    )
+    if not _print_paged("Tasks:", lines):
         print("No tasks found.")
-        return
-    print("Tasks:")
-    for t in tasks:
-        deadline = t.deadline.isoformat() if t.deadline else "-"
-        print(f"- #{t.id} {t.name}: {t.description} [{t.status.value}] due {deadline}")
 
 
+def _project_summary(project_service: ProjectService) -> None:
+    stats = project_service.stats()
+    names = {p.id: p.name for p in project_service.list_projects()}
+    print(f"Projects: {stats.project_count}")
+    for p in stats.projects:
+        statuses = ", ".join(f"{status.value} {count}" for status, count in p.by_status.items())
+        print(f"- #{p.project_id} {names.get(p.project_id, '?')}: {p.task_count} tasks ({statuses}), {p.overdue} overdue")
+
+
+def _search(task_service: TaskService) -> None:
+    if task_service.search is None:
+        print("Search is not available.")
+        return
+    query = input("Search: ").strip()
+    results = task_service.search.search(query)
+    if not results:
+        print("No matches found.")
+        return
+    for r in results:
+        print(f"- {r.kind} #{r.id} {r.item.name}: {r.item.description}")
@@ -0,0 +1,169 @@
+"""Operation subcommands and the script runner.
+
+Every ``todolist project ...``, ``todolist task ...`` and ``todolist search``
+command maps onto one operation of ``todolist.core.services.operations`` and
+prints its result as JSON. ``todolist run`` reads such commands, one per line,
+from a file or stdin and runs them all in one process, writing one JSON line
+per command.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import shlex
+import sys
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Optional, TextIO, Tuple
+
+Operations = Mapping[str, Callable[..., Any]]
+
+
+class ScriptParser(argparse.ArgumentParser):
+    """Parser raising ``ValueError`` instead of exiting, so a bad line fails alone.
+
+    It has no ``-h``/``--help`` either: printing help exits, which would end
+    the whole script, so on a script line they are unrecognized arguments.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        kwargs["add_help"] = False
+        super().__init__(*args, **kwargs)
+
+    def error(self, message: str) -> None:
+        raise ValueError(message)
+
+
+def _operation(commands: Any, name: str, operation: str, help: str) -> argparse.ArgumentParser:
+    parser = commands.add_parser(name, help = help)
+    parser.set_defaults(operation = operation)
+    return parser
+
+
+def _add_page_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--after-id", type = int, help = "start after this id")
+    parser.add_argument("--limit", type = int)
+
+
+def add_operation_commands(commands: Any) -> None:
+    """Register the project, task and search subcommands on ``commands``."""
+    project_cmd = commands.add_parser("project", help = "create, edit, list or delete projects")
+    actions = project_cmd.add_subparsers(dest = "action", required = True)
+
+    cmd = _operation(actions, "create", "project.create", "create a project")
+    cmd.add_argument("--name", required = True)
+    cmd.add_argument("--description")
+    cmd = _operation(actions, "delete", "project.delete", "delete a project and its tasks")
+    cmd.add_argument("--project", required = True, help = "project id or name")
+    cmd = _operation(actions, "list", "project.list", "list projects by id")
+    _add_page_arguments(cmd)
+    cmd = _operation(actions, "rename", "project.rename", "rename a project")
+    cmd.add_argument("--project", required = True, help = "project id or name")
+    cmd.add_argument("--name", required = True)
+    cmd = _operation(actions, "describe", "project.describe", "change a project's description")
+    cmd.add_argument("--project", required = True, help = "project id or name")
+    cmd.add_argument("--description", required = True)
+    cmd = _operation(actions, "stats", "project.stats", "task counters of every project")
+    cmd.add_argument("--today", help = "YYYY-MM-DD used for overdue counts")
+
+    task_cmd = commands.add_parser("task", help = "add, edit, find or delete tasks")
+    actions = task_cmd.add_subparsers(dest = "action", required = True)
+
+    cmd = _operation(actions, "add", "task.add", "add a task to a project")
+    cmd.add_argument("--project", required = True, help = "project id or name")
+    cmd.add_argument("--name", required = True)
+    cmd.add_argument("--description")
+    cmd.add_argument("--status", help = "todo, doing or done")
+    cmd.add_argument("--deadline", help = "YYYY-MM-DD")
+    cmd = _operation(actions, "delete", "task.delete", "delete a task")
+    cmd.add_argument("--id", dest = "task_id", type = int, required = True)
+    cmd = _operation(actions, "list", "task.list", "list a project's tasks by id")
+    cmd.add_argument("--project", required = True, help = "project id or name")
+    _add_page_arguments(cmd)
+    cmd = _operation(actions, "find", "task.find", "find tasks across projects")
+    cmd.add_argument("--project", help = "project id or name")
+    cmd.add_argument("--status", action = "append", help = "repeat for several statuses")
+    cmd.add_argument("--due-before", help = "YYYY-MM-DD, exclusive")
+    cmd.add_argument("--due-after", help = "YYYY-MM-DD, inclusive")
+    # checked by TaskQuery; importing its ORDER_BY here would slow every start
+    cmd.add_argument("--order-by", help = "id, -id, deadline or -deadline; write as --order-by=-deadline")
+    cmd.add_argument("--limit", type = int)
+    cmd = _operation(actions, "stats", "task.stats", "task counters of one project")
+    cmd.add_argument("--project", required = True, help = "project id or name")
+    cmd.add_argument("--today", help = "YYYY-MM-DD used for overdue counts")
+    cmd = _operation(actions, "rename", "task.rename", "rename a task")
+    cmd.add_argument("--id", dest = "task_id", type = int, required = True)
+    cmd.add_argument("--name", required = True)
+    cmd = _operation(actions, "describe", "task.describe", "change a task's description")
+    cmd.add_argument("--id", dest = "task_id", type = int, required = True)
+    cmd.add_argument("--description", required = True)
+    cmd = _operation(actions, "deadline", "task.set_deadline", "set or clear a task's deadline")
+    cmd.add_argument("--id", dest = "task_id", type = int, required = True)
+    cmd.add_argument("--deadline", required = True, help = "YYYY-MM-DD, or an empty string to clear")
+    cmd = _operation(actions, "status", "task.set_status", "change a task's status")
+    cmd.add_argument("--id", dest = "task_id", type = int, required = True)
+    cmd.add_argument("--status", required = True, help = "todo, doing or done")
+    cmd = _operation(actions, "due", "task.due", "open tasks due soonest")
+    cmd.add_argument("--limit", type = int, help = "how many (default 10)")
+    cmd.add_argument("--today", help = "YYYY-MM-DD to count from")
+    cmd = _operation(actions, "overdue", "task.overdue", "open tasks past their deadline")
+    cmd.add_argument("--today", help = "YYYY-MM-DD to count from")
+
+    cmd = _operation(commands, "search", "search", "full-text search over projects and tasks")
+    cmd.add_argument("query")
+    cmd.add_argument("--limit", type = int)
+
+
+@lru_cache(maxsize = None)
+def _parameter_names(fn: Callable[..., Any]) -> Tuple[str, ...]:
+    import inspect
+
+    return tuple(inspect.signature(fn).parameters)
+
+
+def run_operation(args: argparse.Namespace, operations: Operations) -> Any:
+    """Call the operation selected by ``args`` with the options that were given."""
+    fn = operations[args.operation]
+    params: Dict[str, Any] = {}
+    for name in _parameter_names(fn):
+        value = getattr(args, name, None)
+        if value is not None:
+            params[name] = value
+    return fn(**params)
+
+
+def split_command(line: str) -> List[str]:
+    # shlex is slow; lines without quotes or escapes split the same on whitespace
+    if "'" in line or '"' in line or "\\" in line:
+        return shlex.split(line)
+    return line.split()
+
+
+def build_script_parser() -> ScriptParser:
+    parser = ScriptParser(prog = "todolist run")
+    add_operation_commands(parser.add_subparsers(dest = "command", required = True, parser_class = ScriptParser))
+    return parser
+
+
+def run_script(lines: TextIO, operations: Operations, *, out: Optional[TextIO] = None, stop_on_error: bool = False) -> int:
+    """Run one command per line and write one JSON result line per command.
+
+    Blank lines and lines starting with ``#`` are skipped. A failed command
+    is reported as ``{"line": n, "error": message}`` and the script goes on
+    unless ``stop_on_error``. Returns the number of failed commands.
+    """
+    out = out or sys.stdout
+    parser = build_script_parser()
+    failed: int = 0
+    for number, line in enumerate(lines, start = 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            outcome = {"line": number, "result": run_operation(parser.parse_args(split_command(line)), operations)}
+        except ValueError as exc:
+            failed += 1
+            outcome = {"line": number, "error": str(exc)}
+        out.write(json.dumps(outcome) + "\n")
+        if failed and stop_on_error:
+            break
+    return failed
@@ -0,0 +1,61 @@
+"""Streaming CSV / JSONL readers and writers used by import and export."""
+from __future__ import annotations
+
+import csv
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence
+
+FORMATS = ("csv", "jsonl")  # repeated in cli.commands, which must not import this module
+
+TASK_FIELDS = ("project", "name", "description", "status", "deadline")
+PROJECT_FIELDS = ("name", "description")
+# export --since: changed entities with their ids and versions, and tombstones
+TASK_CHANGE_FIELDS = ("id", "version", "deleted", "project", "name", "description", "status", "deadline")
+PROJECT_CHANGE_FIELDS = ("id", "version", "deleted", "name", "description")
+
+
+def detect_format(path: str, explicit: Optional[str] = None) -> str:
+    if explicit:
+        return explicit
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension in ("jsonl", "ndjson", "json"):
+        return "jsonl"
+    if extension == "csv":
+        return "csv"
+    raise ValueError(f"Cannot infer format of {path!r}; pass --format {'|'.join(FORMATS)}.")
+
+
+def read_records(path: str, fmt: str) -> Iterator[Any]:
+    """Yield one dict per input row without loading the whole file.
+
+    A JSONL line that does not parse is yielded as its ``ValueError``, which
+    the import reports as a failed row.
+    """
+    with open(path, newline = "", encoding = "utf-8") as fh:
+        if fmt == "csv":
+            yield from csv.DictReader(fh)
+        else:
+            for line in fh:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError as exc:
+                        # keep row numbering aligned; the service reports it as a bad row
+                        yield exc
+
+
+def write_records(path: str, fmt: str, records: Iterable[Dict[str, Any]], fields: Sequence[str]) -> int:
+    count: int = 0
+    with open(path, "w", newline = "", encoding = "utf-8") as fh:
+        if fmt == "csv":
+            writer = csv.DictWriter(fh, fieldnames = fields)
+            writer.writeheader()
+            for record in records:
+                writer.writerow(record)
+                count += 1
+        else:
+            for record in records:
+                fh.write(json.dumps(record, ensure_ascii = False) + "\n")
+                count += 1
+    return count
@@ -7,9 +7,58 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import os
+import sys
 from typing import Optional
 
-from dotenv import load_dotenv
+# every variable read by Settings.load; when all are set .env is not read
+ENV_KEYS = (
+    "MAX_NUMBER_OF_PROJECT",
+    "MAX_NUMBER_OF_TASK",
+    "MAX_NAME_LENGTH",
+    "MAX_DESCRIPTION_LENGTH",
+    "STORAGE_BACKEND",
+    "DATA_DIR",
+    "COMPACT_TASKS",
+    "CACHE_SIZE",
+    "SHARDS",
+)
+
+
+def find_dotenv() -> Optional[str]:
+    """Locate .env the way ``dotenv.load_dotenv()`` does, without importing it.
+
+    The search walks up from this package, or from the working directory in
+    an interactive session, and stops at the first .env file.
+    """
+    main = sys.modules.get("__main__")
+    if main is None or not hasattr(main, "__file__") or getattr(sys, "frozen", False):
+        path = os.getcwd()
+    else:
+        path = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(path, ".env")
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def load_dotenv() -> bool:
+    """Load .env into the environment unless there is nothing to gain.
+
+    python-dotenv is imported only when some variable is unset and a .env
+    file exists; importing it is a large part of the start-up time.
+    """
+    if all(key in os.environ for key in ENV_KEYS):
+        return False
+    path = find_dotenv()
+    if path is None:
+        return False
+    from dotenv import load_dotenv as _load_dotenv
+
+    return _load_dotenv(path)
 
 
 @dataclass(frozen=True)
@@ -22,6 +71,13 @@ class Settings:
         
         MAX_NAME_LEN: upper bound for length of name of each task or project
         MAX_DESCRIPTION_LEN: upper bound for length of description of each task or project
+        
+        STORAGE_BACKEND: repository backend to use ("memory", "journal", "sqlite", "snapshot" or "sharded");
+            "sqlite" commits writes at least every 50 ms, so a crash can lose the writes of the last 50 ms
+        DATA_DIR: directory holding files of persistent backends
+        COMPACT_TASKS: keep in-memory tasks in compact columnar storage
+        CACHE_SIZE: entries of the read-through caches in front of the repositories (0 disables them)
+        SHARDS: worker processes of the sharded backend (0 for one per CPU)
     """
 
     MAX_PROJECTS: int = 5
@@ -30,6 +86,11 @@ class Settings:
     MAX_NAME_LEN: int = 30
     MAX_DESCRIPTION_LEN: int = 150
     
+    STORAGE_BACKEND: str = "memory"
+    DATA_DIR: str = ".todolist"
+    COMPACT_TASKS: bool = False
+    CACHE_SIZE: int = 0
+    SHARDS: int = 0
 
     @staticmethod
     def _parse_int(value: Optional[str], fallback: int) -> int:
@@ -38,6 +99,12 @@ class Settings:
         except (TypeError, ValueError):
             return fallback
 
+    @staticmethod
+    def _parse_bool(value: Optional[str], fallback: bool) -> bool:
+        if value is None:
+            return fallback
+        return value.strip().lower() in ("1", "true", "yes", "on")
+
     @classmethod
     def load(cls) -> "Settings":
         """Load settings from environment and .env file.
@@ -54,6 +121,22 @@ class Settings:
         MAX_TASKS = max(1, MAX_TASKS)
         MAX_NAME_LEN = max(1, MAX_NAME_LEN)
         MAX_DESCRIPTION_LEN = max(1, MAX_DESCRIPTION_LEN)
-        return cls(MAX_PROJECTS = MAX_PROJECTS, MAX_TASKS = MAX_TASKS, MAX_NAME_LEN = MAX_NAME_LEN, MAX_DESCRIPTION_LEN = MAX_DESCRIPTION_LEN)
+        
+        STORAGE_BACKEND = (os.getenv("STORAGE_BACKEND") or "memory").strip().lower()
+        DATA_DIR = os.getenv("DATA_DIR") or ".todolist"
+        COMPACT_TASKS = cls._parse_bool(os.getenv("COMPACT_TASKS"), fallback = False)
+        CACHE_SIZE = max(0, cls._parse_int(os.getenv("CACHE_SIZE"), fallback = 0))
+        SHARDS = max(0, cls._parse_int(os.getenv("SHARDS"), fallback = 0))
+        return cls(
+            MAX_PROJECTS = MAX_PROJECTS,
+            MAX_TASKS = MAX_TASKS,
+            MAX_NAME_LEN = MAX_NAME_LEN,
+            MAX_DESCRIPTION_LEN = MAX_DESCRIPTION_LEN,
+            STORAGE_BACKEND = STORAGE_BACKEND,
+            DATA_DIR = DATA_DIR,
+            COMPACT_TASKS = COMPACT_TASKS,
+            CACHE_SIZE = CACHE_SIZE,
+            SHARDS = SHARDS,
+        )
 
 
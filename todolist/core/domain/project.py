@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Iterable, Optional
 
-from todolist.config.settings import Settings
+from todolist.core import validation
 
 @dataclass
 class Project:
@@ -22,10 +22,4 @@ class Project:
         self.validate()
     
     def validate(self) -> None:
-        if not self.name or len(self.name.strip()) == 0:
-            raise ValueError("Project name cannot be empty.")
-        if len(self.name) > Settings.MAX_NAME_LEN:
-            raise ValueError(f"Project name must be less than {Settings.MAX_NAME_LEN} characters.")
-        if len(self.description) > Settings.MAX_DESCRIPTION_LEN:
-            raise ValueError(f"Project description must be less than {Settings.MAX_DESCRIPTION_LEN} characters.")
-        
\ No newline at end of file
+        validation.default_validator().check_project(self.name, self.description)
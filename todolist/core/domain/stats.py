@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from todolist.core.domain.status import TaskStatus
+
+
+@dataclass(frozen=True)
+class ProjectStats:
+    """Task counters of a single project.
+
+    ``overdue`` counts tasks whose deadline has passed and that are not DONE.
+    """
+
+    project_id: int
+    task_count: int = 0
+    by_status: Dict[TaskStatus, int] = field(default_factory = lambda: {status: 0 for status in TaskStatus})
+    overdue: int = 0
+
+
+@dataclass(frozen=True)
+class StoreStats:
+    """Counters over every project in the store."""
+
+    project_count: int
+    projects: List[ProjectStats]
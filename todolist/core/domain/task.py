@@ -6,7 +6,7 @@ from typing import Optional
 
 from todolist.core.domain.project import Project
 from todolist.core.domain.status import TaskStatus
-from todolist.config.settings import Settings
+from todolist.core import validation
 
 @dataclass
 class Task:
@@ -27,11 +27,4 @@ class Task:
         self.validate()
     
     def validate(self) -> None:
-        if not self.name or len(self.name.strip()) == 0:
-            raise ValueError("Task name cannot be empty.")
-        if len(self.name.strip()) > Settings.MAX_NAME_LEN:
-            raise ValueError(f"Task name should be less than {Settings.MAX_NAME_LEN} characters.")
-        if len(self.description.strip()) > Settings.MAX_DESCRIPTION_LEN:
-            raise ValueError(f"Task description should be less than {Settings.MAX_DESCRIPTION_LEN} characters.")
-        
-        
\ No newline at end of file
+        validation.default_validator().check_task(self.name, self.description)
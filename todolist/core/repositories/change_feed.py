@@ -0,0 +1,327 @@
+"""Change events published by repositories, and views kept current from them.
+
+    feed = ChangeFeed()
+    project_repo, task_repo = create_repositories(settings, feed = feed)
+    feed.subscribe(print)          # called with every Change, in order
+    changes = feed.queue(1024)     # or buffered for a consumer of its own
+
+Every write made through the repositories of a feed publishes a ``Change``
+carrying a sequence number that grows by one per change. Updates list the
+fields that changed, and deleting a project's tasks publishes one
+``CASCADE_DELETED`` change per task. Writes inside ``batch()`` are published
+together when the batch ends, and not at all if it raises.
+
+Writes run inside ``writing()``, which does not serialize them: the feed lock
+is held only to number changes and hand them to subscribers. Writes to one
+project or task outside batches also hold that entity's stripe lock until
+they are published, so its changes come in write order; changes to
+different entities come in publication order, and writes to one entity
+from concurrent batches may be published out of write order.
+
+Subscribers are called in the writing thread, under the feed lock, and must
+be quick. Queues hold at most ``maxsize`` changes; a queue that fills up is
+marked ``overflowed`` and drops further changes until ``reset()``, so its
+consumer knows to resynchronize from the repositories.
+
+``MaterializedView`` is the base for derived state: ``load()`` builds it from
+the repositories and ``apply()`` folds in one change. ``load()`` runs inside
+``paused()``, with no write in flight. Published changes and domain objects
+are shared between subscribers and must not be mutated.
+"""
+from __future__ import annotations
+
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+PROJECT = "project"
+TASK = "task"
+
+
+class ChangeKind(str, Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    CASCADE_DELETED = "cascade_deleted"
+
+
+class Change(NamedTuple):
+    """One write. ``before`` is unset for creations and ``after`` for deletions."""
+
+    seq: int
+    kind: ChangeKind
+    entity: str
+    id: int
+    before: Any
+    after: Any
+    # field name -> (old value, new value), for updates
+    fields: Dict[str, Tuple[Any, Any]]
+
+
+def diff(before: Any, after: Any) -> Dict[str, Tuple[Any, Any]]:
+    """Fields whose values differ between two versions of a domain object."""
+    old = vars(before)
+    return {name: (old.get(name), value) for name, value in vars(after).items() if old.get(name) != value}
+
+
+class ChangeQueue:
+    """Bounded buffer of changes, read at the consumer's pace."""
+
+    def __init__(self, feed: ChangeFeed, maxsize: int) -> None:
+        self.maxsize = max(1, maxsize)
+        self.overflowed: bool = False
+        self._feed = feed
+        self._changes: Deque[Change] = deque()
+        self._ready = threading.Condition()
+
+    def put(self, change: Change) -> None:
+        with self._ready:
+            if self.overflowed:
+                return
+            if len(self._changes) >= self.maxsize:
+                self.overflowed = True
+                return
+            self._changes.append(change)
+            self._ready.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Change]:
+        """The oldest buffered change, waiting up to ``timeout`` seconds; None if there is none."""
+        with self._ready:
+            if not self._changes:
+                self._ready.wait(timeout)
+            return self._changes.popleft() if self._changes else None
+
+    def drain(self) -> List[Change]:
+        with self._ready:
+            changes = list(self._changes)
+            self._changes.clear()
+            return changes
+
+    def reset(self) -> None:
+        """Clear the buffer and the overflow mark, once the consumer has resynchronized."""
+        with self._ready:
+            self._changes.clear()
+            self.overflowed = False
+
+    def __len__(self) -> int:
+        return len(self._changes)
+
+    def close(self) -> None:
+        self._feed.unsubscribe(self.put)
+
+
+class _Write:
+    """One write through a feed; see ``ChangeFeed.writing``."""
+
+    __slots__ = ("feed", "stripes", "outermost")
+
+    def __init__(self, feed: ChangeFeed, stripes: Tuple[threading.RLock, ...]) -> None:
+        self.feed = feed
+        self.stripes = stripes
+        self.outermost: bool = False
+
+    def __enter__(self) -> None:
+        self.outermost = self.feed._enter()
+        # every-stripe writes take them in index order, so writers cannot deadlock
+        for stripe in self.stripes:
+            stripe.acquire()
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        for stripe in reversed(self.stripes):
+            stripe.release()
+        self.feed._leave(self.outermost)
+
+
+class ChangeFeed:
+    """Sequence-numbered changes of one pair of repositories."""
+
+    def __init__(self, *, stripes: int = 64) -> None:
+        # guards seq and the subscribers; held only to number and publish changes
+        self.lock = threading.RLock()
+        self.seq: int = 0
+        self._subscribers: List[Callable[[Change], None]] = []
+        self._local = threading.local()
+        self._stripes = [threading.RLock() for _ in range(max(1, stripes))]
+        # writes in flight, and pauses waiting or running; new writes wait for pauses
+        self._gate_lock = threading.Lock()
+        self._gate = threading.Condition(self._gate_lock)
+        self._writers: int = 0
+        self._pausing: int = 0
+
+    def subscribe(self, callback: Callable[[Change], None]) -> None:
+        with self.lock:
+            self._subscribers = self._subscribers + [callback]
+
+    def unsubscribe(self, callback: Callable[[Change], None]) -> None:
+        with self.lock:
+            self._subscribers = [s for s in self._subscribers if s != callback]
+
+    def queue(self, maxsize: int = 1024) -> ChangeQueue:
+        queue = ChangeQueue(self, maxsize)
+        self.subscribe(queue.put)
+        return queue
+
+    def writing(self, entity: Optional[str] = None, id: Optional[int] = None) -> _Write:
+        """Context holding the block as one write, which publishes its changes before it ends.
+
+        With ``entity`` and ``id`` the entity's stripe is held too; with
+        ``entity`` alone every stripe is, for writes to many entities at once.
+        Writes inside a batch take no stripe: their changes wait for the
+        batch anyway, and the batch may hold backend locks that a stripe
+        holder is waiting for.
+        """
+        if entity is None or getattr(self._local, "depth", 0):
+            stripes: Tuple[threading.RLock, ...] = ()
+        elif id is None:
+            stripes = tuple(self._stripes)
+        else:
+            stripes = (self._stripes[(id * 2 + (entity == TASK)) % len(self._stripes)],)
+        return _Write(self, stripes)
+
+    def _enter(self) -> bool:
+        """Count this thread's outermost write in; False for a nested one."""
+        local = self._local
+        nested: int = getattr(local, "writes", 0)
+        if not nested:
+            # the bare lock is cheaper to take than the condition
+            with self._gate_lock:
+                if self._pausing:
+                    self._gate.wait_for(lambda: not self._pausing)
+                self._writers += 1
+        local.writes = nested + 1
+        return not nested
+
+    def _leave(self, outermost: bool) -> None:
+        self._local.writes -= 1
+        if outermost:
+            with self._gate_lock:
+                self._writers -= 1
+                if not self._writers and self._pausing:
+                    self._gate.notify_all()
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """Wait for the writes in flight to finish and hold off new ones, and hold the feed lock."""
+        # a pause from inside a write waits only for the others
+        mine: int = 1 if getattr(self._local, "writes", 0) else 0
+        with self._gate:
+            self._pausing += 1
+        try:
+            with self._gate:
+                self._gate.wait_for(lambda: self._writers <= mine)
+            with self.lock:
+                yield
+        finally:
+            with self._gate:
+                self._pausing -= 1
+                self._gate.notify_all()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Hold changes made in the block by this thread until it ends; drop them if it raises."""
+        local = self._local
+        with self.writing():
+            depth: int = getattr(local, "depth", 0)
+            if not depth:
+                local.pending = []
+                local.failed = False
+            local.depth = depth + 1
+            try:
+                yield
+            except BaseException:
+                local.failed = True
+                raise
+            finally:
+                local.depth = depth
+                if not depth:
+                    pending, local.pending = local.pending, None
+                    if pending and not local.failed:
+                        self._publish(pending)
+
+    def emit(self, kind: ChangeKind, entity: str, id: int, before: Any = None, after: Any = None, fields: Optional[Dict[str, Tuple[Any, Any]]] = None) -> None:
+        """Publish a change, or hold it until the enclosing batch ends. Call inside ``writing()``."""
+        pending = (kind, entity, id, before, after, fields or {})
+        if getattr(self._local, "depth", 0):
+            self._local.pending.append(pending)
+        else:
+            self._publish([pending])
+
+    def _publish(self, pending: List[tuple]) -> None:
+        error: Optional[BaseException] = None
+        with self.lock:
+            subscribers = self._subscribers
+            for kind, entity, id, before, after, fields in pending:
+                self.seq += 1
+                change = Change(self.seq, kind, entity, id, before, after, fields)
+                for callback in subscribers:
+                    try:
+                        callback(change)
+                    except Exception as exc:
+                        # the write has happened; the other subscribers still get it
+                        error = error or exc
+        if error is not None:
+            raise error
+
+
+class MaterializedView(ABC):
+    """Derived state kept current from a ``ChangeFeed``.
+
+    Subclasses implement ``load()``, which builds the state from scratch, and
+    ``apply()``, which folds in one change. With ``queue_size`` unset, changes
+    are applied as they are published; otherwise they wait in a queue until
+    ``refresh()``, which reloads instead if the queue overflowed. ``seq`` is
+    the last change the view reflects. The constructor loads the view.
+    """
+
+    def __init__(self, feed: ChangeFeed, *, queue_size: Optional[int] = None) -> None:
+        self.feed = feed
+        self.seq: int = 0
+        self._lock = threading.RLock()
+        self._queue: Optional[ChangeQueue] = None
+        if queue_size is None:
+            feed.subscribe(self._receive)
+        else:
+            self._queue = feed.queue(queue_size)
+        self.reload()
+
+    @abstractmethod
+    def load(self) -> None:
+        """Rebuild the view from the repositories."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def apply(self, change: Change) -> None:
+        raise NotImplementedError
+
+    def reload(self) -> None:
+        # no write is in flight while the repositories are read
+        with self.feed.paused(), self._lock:
+            if self._queue is not None:
+                self._queue.reset()
+            self.load()
+            self.seq = self.feed.seq
+
+    def _receive(self, change: Change) -> None:
+        with self._lock:
+            if change.seq > self.seq:
+                self.apply(change)
+                self.seq = change.seq
+
+    def refresh(self) -> None:
+        """Apply queued changes; a no-op for views updated as changes are published."""
+        if self._queue is None:
+            return
+        if self._queue.overflowed:
+            self.reload()
+            return
+        for change in self._queue.drain():
+            self._receive(change)
+
+    def close(self) -> None:
+        if self._queue is not None:
+            self._queue.close()
+        else:
+            self.feed.unsubscribe(self._receive)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Optional, Iterable
+from contextlib import nullcontext
+from heapq import nsmallest
+from typing import ContextManager, Optional, Iterable, List
 
 from todolist.core.domain.project import Project
 
@@ -34,4 +36,48 @@ class ProjectRepository(ABC):
     
     @abstractmethod
     def update(self, project: Project) -> Project:
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+    
+    def page_projects(self, after_id: int = 0, limit: int = 100) -> List[Project]:
+        """Up to ``limit`` projects with id above ``after_id``, by ascending id (keyset pagination)."""
+        return nsmallest(limit, (p for p in self.list_all_projects() if p.id > after_id), key = lambda p: p.id)
+    
+    def add_if_unique(self, project: Project, max_projects: Optional[int] = None) -> Project:
+        """Add ``project`` unless its name is taken or ``max_projects`` is reached.
+
+        Raises ValueError otherwise. Thread-safe backends make the check and the
+        insert atomic; this default is not.
+        """
+        existing = self.get_by_name(project.name)
+        if existing is not None and existing.id != project.id:
+            raise ValueError("Project name must be unique.")
+        if max_projects is not None and self.count() >= max_projects:
+            raise ValueError("You have reached maximum number of projects.")
+        return self.add(project)
+    
+    def update_if_unique(self, project: Project) -> Project:
+        """Update ``project`` unless another project already has its name (ValueError)."""
+        existing = self.get_by_name(project.name)
+        if existing is not None and existing.id != project.id:
+            raise ValueError("Project name must be unique.")
+        return self.update(project)
+    
+    def count(self) -> int:
+        """Number of stored projects; backends with counters override this scan."""
+        return sum(1 for _ in self.list_all_projects())
+    
+    # True when batch() also reverts this repository's own state if the block raises
+    rolls_back: bool = False
+    
+    def batch(self) -> ContextManager[None]:
+        """Group the writes made in the block into one flush.
+
+        Persistent backends write them together and drop them if the block
+        raises; other state is only reverted where ``rolls_back`` is set (see
+        ``UnitOfWork``).
+        No-op by default.
+        """
+        return nullcontext()
+    
+    def close(self) -> None:
+        """Release any resources held by the repository (no-op by default)."""
@@ -0,0 +1,261 @@
+"""Deferred project deletion: tombstone the tasks now, free them later.
+
+``ReclaimingTaskRepository`` wraps any ``TaskRepository``. ``defer_project``
+tombstones a project in O(1), without touching its tasks: from then on its tasks are invisible to every
+read (``get_by_id`` answers None, listings and pages are empty, counters are
+zero and ``find`` skips them) while they are still stored. They are then
+removed in chunks of ``chunk`` tasks with ``pop_by_project``, each chunk in
+its own ``batch()``, so writers wait for one chunk at most.
+
+With ``background`` a daemon thread frees the chunks; the wrapped repository
+must then be thread-safe. Otherwise one chunk is freed on the caller's
+thread after each write made outside a batch, and after each outermost
+batch. ``progress()`` tells how far each project got, ``wait()`` blocks (or,
+without the thread, frees the rest) until nothing is left, and ``close()``
+waits before closing the wrapped repository.
+
+Removals reach the wrapped repository as they are reclaimed, so a change
+feed below this wrapper publishes the ``CASCADE_DELETED`` changes chunk by
+chunk, after the project's own deletion.
+
+The tombstones themselves are kept in memory only. What persists is the
+project's removal, written before ``defer_project`` is called: a project
+that is gone while tasks of its still exist. Given ``project_repo``, the
+constructor defers every such project again, so tasks left behind by a
+process that stopped before freeing them stay hidden and are freed.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from todolist.core.domain.stats import ProjectStats
+from todolist.core.domain.status import TaskStatus
+from todolist.core.domain.task import Task
+from todolist.core.repositories.project_repository import ProjectRepository
+from todolist.core.repositories.task_query import TaskQuery
+from todolist.core.repositories.task_repository import TaskRepository
+
+
+class ReclaimProgress(NamedTuple):
+    """Tasks of a deleted project that were hidden, and how many have been freed."""
+
+    project_id: int
+    # None until the reclaimer has counted them
+    tasks: Optional[int]
+    freed: int
+
+    @property
+    def remaining(self) -> Optional[int]:
+        return None if self.tasks is None else max(0, self.tasks - self.freed)
+
+
+class ReclaimingTaskRepository(TaskRepository):
+    """``TaskRepository`` hiding the tasks of deferred projects until they are freed."""
+
+    def __init__(
+        self,
+        repo: TaskRepository,
+        *,
+        chunk: int = 1000,
+        background: bool = False,
+        project_repo: Optional[ProjectRepository] = None,
+    ) -> None:
+        self.repo = repo
+        self.chunk = max(1, chunk)
+        self.background = background
+        # project id -> [tasks hidden or None, tasks freed], in deferral order
+        self._pending: Dict[int, List[Optional[int]]] = {}
+        self._changed = threading.Condition()
+        # one chunk at a time, whoever frees it
+        self._reclaiming = threading.Lock()
+        self._depth: int = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stopping: bool = False
+        if project_repo is not None:
+            for project_id in sorted(repo.project_ids()):
+                if project_repo.get_by_id(project_id) is None:
+                    self.defer_project(project_id)
+
+    @property
+    def rolls_back(self) -> bool:
+        return self.repo.rolls_back
+
+    # deferred deletion
+
+    def defer_project(self, project_id: int) -> None:
+        """Hide a project's tasks at once and queue them to be freed.
+
+        Only a tombstone is written here; the tasks are counted when the
+        reclaimer gets to the project.
+        """
+        with self._changed:
+            self._pending.setdefault(project_id, [None, 0])
+            self._changed.notify_all()
+        if self.background:
+            self._start()
+
+    def progress(self) -> List[ReclaimProgress]:
+        """Deferred projects whose tasks are not all freed yet, in deferral order."""
+        with self._changed:
+            return [ReclaimProgress(project_id, tasks, freed) for project_id, (tasks, freed) in self._pending.items()]
+
+    def reclaim(self) -> int:
+        """Free one chunk of hidden tasks; return how many were freed."""
+        with self._reclaiming:
+            with self._changed:
+                if not self._pending:
+                    return 0
+                project_id, progress = next(iter(self._pending.items()))
+                counted: bool = progress[0] is not None
+            if not counted:
+                count: int = self.repo.count_by_project(project_id)
+                with self._changed:
+                    progress[0] = count
+            with self.repo.batch():
+                tasks = self.repo.pop_by_project(project_id, self.chunk)
+            with self._changed:
+                progress[1] += len(tasks)
+                if len(tasks) < self.chunk:
+                    del self._pending[project_id]
+                self._changed.notify_all()
+            return len(tasks)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every hidden task is freed; False if ``timeout`` seconds ran out first.
+
+        Without the background thread, the remaining chunks are freed here.
+        """
+        if self._thread is None:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while self._pending:
+                if deadline is not None and time.monotonic() >= deadline:
+                    return False
+                self.reclaim()
+            return True
+        with self._changed:
+            return self._changed.wait_for(lambda: not self._pending, timeout)
+
+    def _start(self) -> None:
+        with self._changed:
+            if self._thread is not None or self._stopping:
+                return
+            self._thread = threading.Thread(target = self._run, name = "todolist-reclaimer", daemon = True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: self._pending or self._stopping)
+                if self._stopping:
+                    return
+            self.reclaim()
+
+    def _written(self) -> None:
+        # without the thread, writers free the chunks, outside any batch
+        if self._pending and not self.background and not self._depth:
+            self.reclaim()
+
+    def _hidden(self, project_id: Optional[int]) -> bool:
+        return project_id in self._pending
+
+    # reads
+
+    def get_by_id(self, task_id: int) -> Optional[Task]:
+        task = self.repo.get_by_id(task_id)
+        if task is not None and self._hidden(task.project_id):
+            return None
+        return task
+
+    def list_by_project(self, project_id: int) -> Iterable[Task]:
+        return [] if self._hidden(project_id) else self.repo.list_by_project(project_id)
+
+    def page_by_project(self, project_id: int, after_id: int = 0, limit: int = 100) -> List[Task]:
+        return [] if self._hidden(project_id) else self.repo.page_by_project(project_id, after_id, limit)
+
+    def project_ids(self) -> Iterable[int]:
+        return [project_id for project_id in self.repo.project_ids() if not self._hidden(project_id)]
+
+    def count_by_project(self, project_id: int) -> int:
+        return 0 if self._hidden(project_id) else self.repo.count_by_project(project_id)
+
+    def stats_by_project(self, project_id: int, today: Optional[date] = None) -> ProjectStats:
+        if self._hidden(project_id):
+            return ProjectStats(project_id = project_id, task_count = 0, by_status = dict.fromkeys(TaskStatus, 0), overdue = 0)
+        return self.repo.stats_by_project(project_id, today)
+
+    def find(self, query: TaskQuery) -> List[Task]:
+        if not self._pending:
+            return self.repo.find(query)
+        if self._hidden(query.project_id):
+            return []
+        if query.project_id is not None:
+            return self.repo.find(query)
+        limit = query.limit
+        if limit is None:
+            return [task for task in self.repo.find(query) if not self._hidden(task.project_id)]
+        # ask for more until enough visible tasks come back or the store runs out
+        fetch: int = limit
+        while True:
+            tasks = self.repo.find(replace(query, limit = fetch))
+            visible = [task for task in tasks if not self._hidden(task.project_id)]
+            if len(visible) >= limit or len(tasks) < fetch:
+                return visible[:limit]
+            fetch = fetch * 2 + 1
+
+    # writes
+
+    def next_available_id(self) -> int:
+        return self.repo.next_available_id()
+
+    def add(self, task: Task) -> Task:
+        task = self.repo.add(task)
+        self._written()
+        return task
+
+    def add_if_under_limit(self, task: Task, max_tasks: int) -> Task:
+        task = self.repo.add_if_under_limit(task, max_tasks)
+        self._written()
+        return task
+
+    def update(self, task: Task) -> Task:
+        task = self.repo.update(task)
+        self._written()
+        return task
+
+    def remove(self, task_id: int) -> bool:
+        removed: bool = self.repo.remove(task_id)
+        self._written()
+        return removed
+
+    def remove_by_project(self, project_id: int) -> int:
+        count: int = self.repo.remove_by_project(project_id)
+        self._written()
+        return count
+
+    def pop_by_project(self, project_id: int, limit: int) -> List[Task]:
+        return self.repo.pop_by_project(project_id, limit)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        self._depth += 1
+        try:
+            with self.repo.batch():
+                yield
+        finally:
+            self._depth -= 1
+        self._written()
+
+    def close(self) -> None:
+        """Free every hidden task, stop the thread and close the wrapped repository."""
+        self.wait()
+        with self._changed:
+            self._stopping = True
+            self._changed.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        self.repo.close()
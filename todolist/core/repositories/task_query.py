@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from heapq import nsmallest
+from typing import Callable, FrozenSet, Iterable, List, Optional, Tuple
+
+from todolist.core.domain.status import TaskStatus
+from todolist.core.domain.task import Task
+
+ORDER_BY = ("id", "-id", "deadline", "-deadline")
+
+
+@dataclass(frozen=True)
+class TaskQuery:
+    """Filter over tasks used by ``TaskRepository.find``.
+
+    ``due_after`` is inclusive and ``due_before`` exclusive; when either is set,
+    tasks without a deadline never match. Tasks without a deadline sort last
+    when ordering by deadline.
+    """
+
+    project_id: Optional[int] = None
+    statuses: Optional[FrozenSet[TaskStatus]] = None
+    due_before: Optional[date] = None
+    due_after: Optional[date] = None
+    order_by: str = "id"
+    limit: Optional[int] = None
+
+    def __post_init__(self):
+        if self.order_by not in ORDER_BY:
+            raise ValueError(f"Invalid order_by: {self.order_by!r}. Allowed: {list(ORDER_BY)}")
+        if self.limit is not None and self.limit < 0:
+            raise ValueError("limit cannot be negative.")
+
+    @property
+    def has_deadline_range(self) -> bool:
+        return self.due_before is not None or self.due_after is not None
+
+    def matches(self, task: Task) -> bool:
+        if self.project_id is not None and task.project_id != self.project_id:
+            return False
+        if self.statuses is not None and task.status not in self.statuses:
+            return False
+        if self.has_deadline_range:
+            if task.deadline is None:
+                return False
+            if self.due_before is not None and task.deadline >= self.due_before:
+                return False
+            if self.due_after is not None and task.deadline < self.due_after:
+                return False
+        return True
+
+    def sort_key(self) -> Callable[[Task], Tuple]:
+        if self.order_by in ("deadline", "-deadline"):
+            descending = self.order_by == "-deadline"
+
+            def by_deadline(task: Task) -> Tuple:
+                if task.deadline is None:
+                    return (1, 0, task.id)
+                ordinal = task.deadline.toordinal()
+                return (0, -ordinal if descending else ordinal, task.id)
+
+            return by_deadline
+        if self.order_by == "-id":
+            return lambda task: (-task.id,)
+        return lambda task: (task.id,)
+
+    def order(self, tasks: Iterable[Task]) -> List[Task]:
+        """Sort ``tasks`` and apply the limit."""
+        if self.limit is not None:
+            return nsmallest(self.limit, tasks, key = self.sort_key())
+        return sorted(tasks, key = self.sort_key())
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Iterable, Optional
+from contextlib import nullcontext
+from datetime import date
+from heapq import nsmallest
+from typing import ContextManager, Iterable, Iterator, List, Optional
 
+from todolist.core.domain.stats import ProjectStats
+from todolist.core.domain.status import TaskStatus
 from todolist.core.domain.task import Task
+from todolist.core.repositories.task_query import TaskQuery
 
 class TaskRepository(ABC):
     "Abstract methods for tasks' repository"
@@ -36,4 +42,89 @@ class TaskRepository(ABC):
     
     @abstractmethod
     def update(self, task: Task) -> Task:
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+    
+    def find(self, query: TaskQuery) -> List[Task]:
+        """Tasks matching ``query`` across all projects, ordered and limited.
+
+        Scans the project's tasks, or ``iter_all_tasks()`` when the query names
+        no project; backends with indexes override this.
+        """
+        if query.project_id is not None:
+            candidates: Iterable[Task] = self.list_by_project(query.project_id)
+        else:
+            candidates = self.iter_all_tasks()
+        return query.order(t for t in candidates if query.matches(t))
+    
+    def project_ids(self) -> Iterable[int]:
+        """Ids of the projects with stored tasks, in no particular order.
+
+        May include a project whose tasks are all gone. Scans
+        ``iter_all_tasks()``; backends indexing tasks by project override this.
+        """
+        return {task.project_id for task in self.iter_all_tasks()}
+    
+    def iter_all_tasks(self) -> Iterator[Task]:
+        """Every stored task, for the default ``find`` across projects."""
+        raise NotImplementedError(f"{type(self).__name__} cannot list every task; override find() or iter_all_tasks().")
+    
+    def add_if_under_limit(self, task: Task, max_tasks: int) -> Task:
+        """Add ``task`` unless its project already holds ``max_tasks`` tasks (ValueError).
+
+        Thread-safe backends make the check and the insert atomic; this default is not.
+        """
+        if self.count_by_project(task.project_id) >= max_tasks:
+            raise ValueError("You have reached maximum number of tasks per project.")
+        return self.add(task)
+    
+    def page_by_project(self, project_id: int, after_id: int = 0, limit: int = 100) -> List[Task]:
+        """Up to ``limit`` tasks of a project with id above ``after_id``, by ascending id.
+
+        Keyset pagination: pass the last id of a page as ``after_id`` to get the
+        next one. Backends with ordered storage override this scan.
+        """
+        return nsmallest(limit, (t for t in self.list_by_project(project_id) if t.id > after_id), key = lambda t: t.id)
+    
+    def pop_by_project(self, project_id: int, limit: int) -> List[Task]:
+        """Remove up to ``limit`` tasks of a project and return them; [] once none are left.
+
+        ``remove_by_project`` in bounded steps. Backends that can pick the
+        tasks without sorting the project override this page scan.
+        """
+        tasks = self.page_by_project(project_id, 0, limit)
+        for task in tasks:
+            self.remove(task.id)
+        return tasks
+    
+    def count_by_project(self, project_id: int) -> int:
+        """Number of tasks in a project; backends with counters override this scan."""
+        return sum(1 for _ in self.list_by_project(project_id))
+    
+    def stats_by_project(self, project_id: int, today: Optional[date] = None) -> ProjectStats:
+        """Task counters of a project; backends with counters override this scan."""
+        today = today or date.today()
+        by_status = dict.fromkeys(TaskStatus, 0)
+        count: int = 0
+        overdue: int = 0
+        for task in self.list_by_project(project_id):
+            count += 1
+            by_status[task.status] += 1
+            if task.deadline and task.deadline < today and task.status is not TaskStatus.DONE:
+                overdue += 1
+        return ProjectStats(project_id = project_id, task_count = count, by_status = by_status, overdue = overdue)
+    
+    # True when batch() also reverts this repository's own state if the block raises
+    rolls_back: bool = False
+    
+    def batch(self) -> ContextManager[None]:
+        """Group the writes made in the block into one flush.
+
+        Persistent backends write them together and drop them if the block
+        raises; other state is only reverted where ``rolls_back`` is set (see
+        ``UnitOfWork``).
+        No-op by default.
+        """
+        return nullcontext()
+    
+    def close(self) -> None:
+        """Release any resources held by the repository (no-op by default)."""
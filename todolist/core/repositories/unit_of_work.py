@@ -0,0 +1,319 @@
+"""Unit of work spanning the project and task repositories.
+
+    uow = UnitOfWork(project_repo, task_repo)
+    service = ProjectService(uow.projects, uow.tasks, settings = settings, uow = uow)
+    with uow:
+        ...
+
+Writes made through ``uow.projects`` and ``uow.tasks`` inside ``with uow:``
+are applied as they happen, so later reads in the block see them, and each
+one records how to undo itself. If the block raises, the undo log runs in
+reverse and the error propagates; otherwise the changes stand. Both
+repositories' ``batch()`` is held open for the block, so persistent backends
+flush the whole unit once at the end and discard it on rollback.
+
+Blocks nest; only the outermost one commits or rolls back. One thread at a
+time runs a unit. While it does, writes made by other threads through the
+same views wait for it to end, so none interleave with the unit or get
+undone by its rollback. Outside units, writes only check the gate and then
+run concurrently, as far as the wrapped repositories allow. A unit starts
+once the writes already running have finished, and writes arriving while a
+unit waits queue behind it.
+
+Reads are not gated: another thread may read a unit's writes before it
+commits (dirty reads), and see them vanish if it rolls back. Ids handed
+out by ``next_available_id`` inside a rolled-back unit are not reused. The
+search index is not part of the unit; services update it after commit.
+"""
+from __future__ import annotations
+
+import threading
+from contextlib import ExitStack, contextmanager
+from datetime import date
+from typing import Any, Callable, ContextManager, Iterable, Iterator, List, Optional
+
+from todolist.core.domain.project import Project
+from todolist.core.domain.stats import ProjectStats
+from todolist.core.domain.task import Task
+from todolist.core.repositories.project_repository import ProjectRepository
+from todolist.core.repositories.task_query import TaskQuery
+from todolist.core.repositories.task_repository import TaskRepository
+
+
+def _detached(obj: Any) -> Any:
+    """Shallow copy of a domain object, skipping ``__post_init__`` validation."""
+    clone = object.__new__(type(obj))
+    clone.__dict__.update(obj.__dict__)
+    return clone
+
+
+class UnitOfWork:
+
+    def __init__(self, project_repo: ProjectRepository, task_repo: TaskRepository) -> None:
+        self.projects = TrackedProjectRepository(project_repo, self)
+        self.tasks = TrackedTaskRepository(task_repo, self)
+        # guards the fields below; never held across a repository call
+        self._gate = threading.Condition(threading.Lock())
+        self._owner: Optional[int] = None
+        self._writers: int = 0
+        self._waiting: int = 0
+        self._depth: int = 0
+        self._undo: List[Callable[[], Any]] = []
+        self._batches: Optional[ExitStack] = None
+
+    @property
+    def active(self) -> bool:
+        """True on the thread running a unit, inside its block."""
+        return self._depth > 0 and self._owner == threading.get_ident()
+
+    def _acquire(self) -> None:
+        me = threading.get_ident()
+        with self._gate:
+            if self._owner == me:
+                return
+            self._waiting += 1
+            try:
+                self._gate.wait_for(lambda: self._owner is None and not self._writers)
+            finally:
+                self._waiting -= 1
+            self._owner = me
+
+    def _release(self) -> None:
+        with self._gate:
+            self._owner = None
+            self._gate.notify_all()
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        """Let one write through: at once inside this thread's unit, otherwise once no unit runs or waits."""
+        me = threading.get_ident()
+        with self._gate:
+            if self._owner == me:
+                outside = False
+            else:
+                outside = True
+                self._gate.wait_for(lambda: self._owner is None and not self._waiting)
+                self._writers += 1
+        try:
+            yield
+        finally:
+            if outside:
+                with self._gate:
+                    self._writers -= 1
+                    if not self._writers:
+                        self._gate.notify_all()
+
+    def __enter__(self) -> UnitOfWork:
+        self._acquire()
+        if not self._depth:
+            batches = ExitStack()
+            try:
+                batches.enter_context(self.projects.repo.batch())
+                batches.enter_context(self.tasks.repo.batch())
+            except BaseException:
+                batches.close()
+                self._release()
+                raise
+            self._batches = batches
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self._depth -= 1
+        try:
+            if self._depth:
+                return
+            batches, self._batches = self._batches, None
+            undo, self._undo = self._undo, []
+            if exc_type is None:
+                batches.close()
+                return
+            # undo inside the open batches, so persistent backends drop the compensating writes too
+            try:
+                for action in reversed(undo):
+                    action()
+            finally:
+                batches.__exit__(exc_type, exc, tb)
+        finally:
+            if not self._depth:
+                self._release()
+
+    def record(self, action: Optional[Callable[[], Any]]) -> None:
+        """Remember how to revert a write just made; ignored outside a unit."""
+        if self._depth and action is not None:
+            self._undo.append(action)
+
+
+class TrackedProjectRepository(ProjectRepository):
+    """``ProjectRepository`` view whose writes take part in a ``UnitOfWork``."""
+
+    def __init__(self, repo: ProjectRepository, uow: UnitOfWork) -> None:
+        self.repo = repo
+        self._uow = uow
+
+    def _logging(self) -> bool:
+        return self._uow.active and not self.repo.rolls_back
+
+    def _restore(self, project_id: int) -> Callable[[], Any]:
+        """Undo action returning ``project_id`` to its current state."""
+        before = self.repo.get_by_id(project_id)
+        if before is None:
+            return lambda: self.repo.remove(project_id)
+        before = _detached(before)
+        return lambda: self.repo.update(before)
+
+    def next_available_id(self) -> int:
+        return self.repo.next_available_id()
+
+    def add(self, project: Project) -> Project:
+        with self._uow.writing():
+            undo = self._restore(project.id) if self._logging() else None
+            project = self.repo.add(project)
+            self._uow.record(undo)
+            return project
+
+    def add_if_unique(self, project: Project, max_projects: Optional[int] = None) -> Project:
+        with self._uow.writing():
+            undo = self._restore(project.id) if self._logging() else None
+            project = self.repo.add_if_unique(project, max_projects)
+            self._uow.record(undo)
+            return project
+
+    def update(self, project: Project) -> Project:
+        with self._uow.writing():
+            undo = self._restore(project.id) if self._logging() else None
+            project = self.repo.update(project)
+            self._uow.record(undo)
+            return project
+
+    def update_if_unique(self, project: Project) -> Project:
+        with self._uow.writing():
+            undo = self._restore(project.id) if self._logging() else None
+            project = self.repo.update_if_unique(project)
+            self._uow.record(undo)
+            return project
+
+    def remove(self, project_id: int) -> bool:
+        with self._uow.writing():
+            before = self.repo.get_by_id(project_id) if self._logging() else None
+            removed: bool = self.repo.remove(project_id)
+            if removed and before is not None:
+                before = _detached(before)
+                self._uow.record(lambda: self.repo.add(before))
+            return removed
+
+    def get_by_id(self, project_id: int) -> Optional[Project]:
+        return self.repo.get_by_id(project_id)
+
+    def get_by_name(self, project_name: str) -> Optional[Project]:
+        return self.repo.get_by_name(project_name)
+
+    def list_all_projects(self) -> Iterable[Project]:
+        return self.repo.list_all_projects()
+
+    def page_projects(self, after_id: int = 0, limit: int = 100) -> List[Project]:
+        return self.repo.page_projects(after_id, limit)
+
+    def count(self) -> int:
+        return self.repo.count()
+
+    def batch(self) -> ContextManager[None]:
+        return self.repo.batch()
+
+    def close(self) -> None:
+        self.repo.close()
+
+
+class TrackedTaskRepository(TaskRepository):
+    """``TaskRepository`` view whose writes take part in a ``UnitOfWork``."""
+
+    def __init__(self, repo: TaskRepository, uow: UnitOfWork) -> None:
+        self.repo = repo
+        self._uow = uow
+
+    def _logging(self) -> bool:
+        return self._uow.active and not self.repo.rolls_back
+
+    def _restore(self, task_id: int) -> Callable[[], Any]:
+        """Undo action returning ``task_id`` to its current state."""
+        before = self.repo.get_by_id(task_id)
+        if before is None:
+            return lambda: self.repo.remove(task_id)
+        before = _detached(before)
+        return lambda: self.repo.update(before)
+
+    def next_available_id(self) -> int:
+        return self.repo.next_available_id()
+
+    def add(self, task: Task) -> Task:
+        with self._uow.writing():
+            undo = self._restore(task.id) if self._logging() else None
+            task = self.repo.add(task)
+            self._uow.record(undo)
+            return task
+
+    def add_if_under_limit(self, task: Task, max_tasks: int) -> Task:
+        with self._uow.writing():
+            undo = self._restore(task.id) if self._logging() else None
+            task = self.repo.add_if_under_limit(task, max_tasks)
+            self._uow.record(undo)
+            return task
+
+    def update(self, task: Task) -> Task:
+        with self._uow.writing():
+            undo = self._restore(task.id) if self._logging() else None
+            task = self.repo.update(task)
+            self._uow.record(undo)
+            return task
+
+    def remove(self, task_id: int) -> bool:
+        with self._uow.writing():
+            before = self.repo.get_by_id(task_id) if self._logging() else None
+            removed: bool = self.repo.remove(task_id)
+            if removed and before is not None:
+                before = _detached(before)
+                self._uow.record(lambda: self.repo.add(before))
+            return removed
+
+    def remove_by_project(self, project_id: int) -> int:
+        with self._uow.writing():
+            before = [_detached(t) for t in self.repo.list_by_project(project_id)] if self._logging() else []
+            count: int = self.repo.remove_by_project(project_id)
+            if count and before:
+                self._uow.record(lambda: [self.repo.add(t) for t in before])
+            return count
+
+    def pop_by_project(self, project_id: int, limit: int) -> List[Task]:
+        with self._uow.writing():
+            tasks = self.repo.pop_by_project(project_id, limit)
+            if tasks and self._logging():
+                before = [_detached(t) for t in tasks]
+                self._uow.record(lambda: [self.repo.add(t) for t in before])
+            return tasks
+
+    def get_by_id(self, task_id: int) -> Optional[Task]:
+        return self.repo.get_by_id(task_id)
+
+    def list_by_project(self, project_id: int) -> Iterable[Task]:
+        return self.repo.list_by_project(project_id)
+
+    def page_by_project(self, project_id: int, after_id: int = 0, limit: int = 100) -> List[Task]:
+        return self.repo.page_by_project(project_id, after_id, limit)
+
+    def find(self, query: TaskQuery) -> List[Task]:
+        return self.repo.find(query)
+
+    def project_ids(self) -> Iterable[int]:
+        return self.repo.project_ids()
+
+    def count_by_project(self, project_id: int) -> int:
+        return self.repo.count_by_project(project_id)
+
+    def stats_by_project(self, project_id: int, today: Optional[date] = None) -> ProjectStats:
+        return self.repo.stats_by_project(project_id, today)
+
+    def batch(self) -> ContextManager[None]:
+        return self.repo.batch()
+
+    def close(self) -> None:
+        self.repo.close()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import AsyncIterator, Iterable, List, Optional, Union
+
+from todolist.core.domain.project import Project
+from todolist.core.domain.stats import StoreStats
+from todolist.core.services.bulk import BulkResult, Record
+from todolist.core.services.paging import DEFAULT_PAGE_SIZE, aiter_pages
+from todolist.core.services.project_service import ProjectService, UpdateProject
+from todolist.core.services.threaded_service import ThreadedService
+
+class AsyncProjectService(ThreadedService):
+    """Awaitable ``ProjectService``: each call runs the wrapped service in the executor."""
+
+    service: ProjectService
+
+    async def create_project(self, name: str, description: str = "") -> Project:
+        return await self._call(self.service.create_project, name, description)
+
+    async def delete_project(self, project_identifier: Union[int, str]) -> bool:
+        return await self._call(self.service.delete_project, project_identifier)
+
+    async def list_projects(self, *, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Project]:
+        """All projects; with ``after_id``/``limit``, one keyset page by ascending id."""
+        return list(await self._call(self.service.list_projects, after_id = after_id, limit = limit))
+
+    def iter_projects(self, *, page_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[Project]:
+        """Stream projects by ascending id, one page per executor call."""
+        async def fetch(after_id: int, limit: int) -> List[Project]:
+            return await self.list_projects(after_id = after_id, limit = limit)
+
+        return aiter_pages(fetch, page_size = page_size)
+
+    async def stats(self, today: Optional[date] = None) -> StoreStats:
+        return await self._call(self.service.stats, today)
+
+    async def import_projects(self, records: Iterable[Record], *, batch_size: int = 1000) -> BulkResult:
+        return await self._call(self.service.import_projects, records, batch_size = batch_size)
+
+class AsyncUpdateProject(ThreadedService):
+    """Awaitable ``UpdateProject``"""
+
+    service: UpdateProject
+
+    async def edit_project_name(self, project_identifier: Union[int, str], *, name: str) -> Project:
+        return await self._call(self.service.edit_project_name, project_identifier, name = name)
+
+    async def edit_project_description(self, project_identifier: Union[int, str], *, description: str) -> Project:
+        return await self._call(self.service.edit_project_description, project_identifier, description = description)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import AsyncIterator, Iterable, List, Optional, Union
+
+from todolist.core.domain.stats import ProjectStats
+from todolist.core.domain.status import TaskStatus
+from todolist.core.domain.task import Task
+from todolist.core.services.bulk import BulkResult, Record
+from todolist.core.services.paging import DEFAULT_PAGE_SIZE, aiter_pages
+from todolist.core.services.task_service import TaskService, UpdateTask
+from todolist.core.services.threaded_service import ThreadedService
+
+class AsyncTaskService(ThreadedService):
+    """Awaitable ``TaskService``: each call runs the wrapped service in the executor."""
+
+    service: TaskService
+
+    async def add_task(
+        self,
+        project_identifier: Union[str, int],
+        *,
+        name: str,
+        description: str = "",
+        status: TaskStatus = TaskStatus.TODO,
+        deadline: Optional[date] = None
+    ) -> Task:
+        return await self._call(
+            self.service.add_task, project_identifier, name = name, description = description, status = status, deadline = deadline
+        )
+
+    async def add_tasks_bulk(self, records: Iterable[Record], *, batch_size: int = 1000) -> BulkResult:
+        return await self._call(self.service.add_tasks_bulk, records, batch_size = batch_size)
+
+    async def delete_task(self, task_id: int) -> bool:
+        return await self._call(self.service.delete_task, task_id)
+
+    async def list_tasks_by_project(
+        self,
+        project_identifier: Union[str, int],
+        *,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Task]:
+        """Tasks of a project; with ``after_id``/``limit``, one keyset page by ascending id."""
+        return await self._call(self.service.list_tasks_by_project, project_identifier, after_id = after_id, limit = limit)
+
+    def iter_tasks_by_project(self, project_identifier: Union[str, int], *, page_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[Task]:
+        """Stream a project's tasks by ascending id, one page per executor call."""
+        async def fetch(after_id: int, limit: int) -> List[Task]:
+            return await self.list_tasks_by_project(project_identifier, after_id = after_id, limit = limit)
+
+        return aiter_pages(fetch, page_size = page_size)
+
+    async def find_tasks(
+        self,
+        project: Optional[Union[str, int]] = None,
+        status: Optional[Union[TaskStatus, str, Iterable[Union[TaskStatus, str]]]] = None,
+        due_before: Optional[date] = None,
+        due_after: Optional[date] = None,
+        order_by: str = "id",
+        limit: Optional[int] = None,
+    ) -> List[Task]:
+        """Find tasks across projects; arguments as in ``TaskService.find_tasks``."""
+        return await self._call(self.service.find_tasks, project, status, due_before, due_after, order_by, limit)
+
+    async def stats(self, project_identifier: Union[str, int], today: Optional[date] = None) -> ProjectStats:
+        return await self._call(self.service.stats, project_identifier, today)
+
+class AsyncUpdateTask(ThreadedService):
+    """Awaitable ``UpdateTask``"""
+
+    service: UpdateTask
+
+    async def edit_task_name(self, task_id: int, *, name: str) -> Task:
+        return await self._call(self.service.edit_task_name, task_id, name = name)
+
+    async def edit_task_description(self, task_id: int, *, description: str) -> Task:
+        return await self._call(self.service.edit_task_description, task_id, description = description)
+
+    async def edit_task_deadline(self, task_id: int, *, deadline: date) -> Task:
+        return await self._call(self.service.edit_task_deadline, task_id, deadline = deadline)
+
+    async def change_status(self, task_id: int, status: TaskStatus) -> Task:
+        return await self._call(self.service.change_status, task_id, status)
@@ -0,0 +1,31 @@
+"""Result types and helpers shared by the bulk service operations."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
+
+# the record helpers live with the validation rules; re-exported for the services
+from todolist.core.validation import Record, RowError, parse_deadline, parse_status, text
+
+
+@dataclass
+class BulkResult:
+    """Outcome of a bulk operation. Rejected rows never abort the run."""
+
+    added: int = 0
+    errors: List[RowError] = field(default_factory = list)
+
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+
+
+def batched(records: Iterable[Record], size: int) -> Iterator[List[Tuple[int, Record]]]:
+    """Yield lists of (row number, record) holding at most ``size`` records."""
+    numbered = enumerate(records, start = 1)
+    while True:
+        batch = list(islice(numbered, size))
+        if not batch:
+            return
+        yield batch
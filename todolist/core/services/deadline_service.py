@@ -0,0 +1,231 @@
+"""Due-soon and overdue tasks from a priority queue of deadlines.
+
+``DeadlineScheduler`` keeps every open task (not DONE) that has a deadline in
+a heap ordered by deadline. The heap is built from the repository on the
+first query and is then kept current by the services, like the search
+index: adding a task, changing its deadline or status, and deleting it or
+its project each cost O(log n). Superseded heap entries are skipped when
+they reach the top and dropped in bulk once they outnumber live ones.
+
+A deadline passes at the start of the day after it. Queries move the
+entries that passed before the day they ask about off the heap, once, so
+``next_due()`` costs O(k log n) for k results and ``overdue()`` is bounded
+by the number of overdue tasks. ``tick()`` calls the ``on_overdue``
+callbacks with the tasks whose deadline passed since the last tick, each
+reported once; ``DeadlineWatcher`` ticks on a background thread.
+"""
+from __future__ import annotations
+
+import heapq
+import threading
+from datetime import date
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from todolist.core.domain.status import TaskStatus
+from todolist.core.domain.task import Task
+from todolist.core.repositories.task_query import TaskQuery
+from todolist.core.repositories.task_repository import TaskRepository
+
+OPEN = frozenset((TaskStatus.TODO, TaskStatus.DOING))
+
+# (deadline ordinal, task id, entry number); the number tells live entries from superseded ones
+Entry = Tuple[int, int, int]
+
+
+class DeadlineScheduler:
+    """Open tasks with deadlines, ordered by deadline. Thread-safe."""
+
+    def __init__(self, task_repo: TaskRepository) -> None:
+        self.task_repo = task_repo
+        self._lock = threading.RLock()
+        self._callbacks: List[Callable[[List[Task]], None]] = []
+        self._built: bool = False
+        self._clear()
+
+    def _clear(self) -> None:
+        self._heap: List[Entry] = []
+        # task id -> its live heap entry, for deadlines not before the watermark
+        self._pending: Dict[int, Entry] = {}
+        # task id -> deadline ordinal, for deadlines before the watermark
+        self._late: Dict[int, int] = {}
+        # late tasks tick() has not reported yet, and those it has
+        self._unreported: Dict[int, int] = {}
+        self._reported: Set[int] = set()
+        # the latest day asked about; every heap entry is due on or after it
+        self._watermark: int = 0
+        self._by_project: Dict[int, Set[int]] = {}
+        self._project_of: Dict[int, int] = {}
+        self._entries: int = 0
+
+    def rebuild(self) -> None:
+        """Load open tasks with a deadline from the repository."""
+        with self._lock:
+            self._clear()
+            self._built = True
+            self._heap = [self._add(task) for task in self.task_repo.find(TaskQuery(statuses = OPEN, due_after = date.min))]
+            heapq.heapify(self._heap)
+
+    def _ensure_built(self) -> None:
+        if not self._built:
+            self.rebuild()
+
+    def _add(self, task: Task) -> Entry:
+        """Make a live entry for ``task``; the caller puts it on the heap."""
+        self._entries += 1
+        entry: Entry = (task.deadline.toordinal(), task.id, self._entries)
+        self._pending[task.id] = entry
+        self._index_project(task)
+        return entry
+
+    def _index_project(self, task: Task) -> None:
+        self._project_of[task.id] = task.project_id
+        self._by_project.setdefault(task.project_id, set()).add(task.id)
+
+    def _drop(self, task_id: int) -> None:
+        self._pending.pop(task_id, None)
+        self._late.pop(task_id, None)
+        self._unreported.pop(task_id, None)
+        self._reported.discard(task_id)
+        project_id = self._project_of.pop(task_id, None)
+        if project_id is not None:
+            tasks = self._by_project[project_id]
+            tasks.discard(task_id)
+            if not tasks:
+                del self._by_project[project_id]
+
+    def _compact(self) -> None:
+        if len(self._heap) > 2 * len(self._pending) + 64:
+            self._heap = list(self._pending.values())
+            heapq.heapify(self._heap)
+
+    def _advance(self, day: int) -> None:
+        """Move entries due before ``day`` off the heap; each entry moves once."""
+        if day <= self._watermark:
+            return
+        self._watermark = day
+        heap = self._heap
+        while heap and heap[0][0] < day:
+            ordinal, task_id, _ = entry = heapq.heappop(heap)
+            if self._pending.get(task_id) is entry:
+                del self._pending[task_id]
+                self._late[task_id] = ordinal
+                self._unreported[task_id] = ordinal
+
+    def track(self, task: Task) -> None:
+        """Schedule ``task`` as it is now; tasks that are DONE or have no deadline drop out."""
+        with self._lock:
+            if not self._built:
+                return
+            ordinal = self._late.get(task.id)
+            reported: bool = task.id in self._reported
+            self._drop(task.id)
+            if task.deadline is not None and task.status in OPEN:
+                entry = self._add(task)
+                if entry[0] < self._watermark:
+                    del self._pending[task.id]
+                    self._late[task.id] = entry[0]
+                    if reported and ordinal == entry[0]:
+                        # moving between open statuses does not report it again
+                        self._reported.add(task.id)
+                    else:
+                        self._unreported[task.id] = entry[0]
+                else:
+                    heapq.heappush(self._heap, entry)
+            self._compact()
+
+    def remove_task(self, task_id: int) -> None:
+        with self._lock:
+            self._drop(task_id)
+            self._compact()
+
+    def remove_project(self, project_id: int) -> None:
+        """Drop every task of a project, as in the cascade delete."""
+        with self._lock:
+            for task_id in list(self._by_project.get(project_id, ())):
+                self._drop(task_id)
+            self._compact()
+
+    def _tasks(self, task_ids: List[int]) -> List[Task]:
+        tasks: List[Task] = []
+        for task_id in task_ids:
+            task = self.task_repo.get_by_id(task_id)
+            if task is not None:
+                tasks.append(task)
+        return tasks
+
+    def next_due(self, n: int = 10, today: Optional[date] = None) -> List[Task]:
+        """The ``n`` open tasks due soonest, from ``today`` (default: the current date) on."""
+        if n < 0:
+            raise ValueError("n cannot be negative.")
+        day: int = (today or date.today()).toordinal()
+        with self._lock:
+            self._ensure_built()
+            self._advance(day)
+            heap = self._heap
+            found: List[Entry] = []
+            while heap and len(found) < n:
+                entry = heapq.heappop(heap)
+                if self._pending.get(entry[1]) is entry:
+                    found.append(entry)
+            for entry in found:
+                heapq.heappush(heap, entry)
+            due = [(entry[0], entry[1]) for entry in found]
+            if day < self._watermark:
+                # asking about an earlier day: some late tasks are still ahead of it
+                due.extend(heapq.nsmallest(n, ((o, t) for t, o in self._late.items() if o >= day)))
+                due = heapq.nsmallest(n, due)
+        return self._tasks([task_id for _, task_id in due])
+
+    def overdue(self, today: Optional[date] = None) -> List[Task]:
+        """Open tasks whose deadline is before ``today`` (default: the current date), earliest first."""
+        day: int = (today or date.today()).toordinal()
+        with self._lock:
+            self._ensure_built()
+            self._advance(day)
+            due = sorted((ordinal, task_id) for task_id, ordinal in self._late.items() if ordinal < day)
+        return self._tasks([task_id for _, task_id in due])
+
+    def on_overdue(self, callback: Callable[[List[Task]], None]) -> None:
+        """Call ``callback`` from ``tick()`` with the tasks whose deadline just passed."""
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def tick(self, today: Optional[date] = None) -> List[Task]:
+        """Report open tasks whose deadline passed since the last tick, each once."""
+        day: int = (today or date.today()).toordinal()
+        with self._lock:
+            self._ensure_built()
+            self._advance(day)
+            due = sorted((ordinal, task_id) for task_id, ordinal in self._unreported.items() if ordinal < day)
+            for _, task_id in due:
+                del self._unreported[task_id]
+                self._reported.add(task_id)
+            callbacks = list(self._callbacks)
+        tasks = self._tasks([task_id for _, task_id in due])
+        if tasks:
+            for callback in callbacks:
+                callback(tasks)
+        return tasks
+
+
+class DeadlineWatcher:
+    """Background thread calling ``scheduler.tick()`` every ``interval`` seconds."""
+
+    def __init__(self, scheduler: DeadlineScheduler, interval: float) -> None:
+        self._scheduler = scheduler
+        self._interval = max(0.1, interval)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target = self._run, name = "todolist-deadlines", daemon = True)
+
+    def start(self) -> DeadlineWatcher:
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        self._scheduler.tick()
+        while not self._stopped.wait(self._interval):
+            self._scheduler.tick()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
@@ -0,0 +1,178 @@
+"""Service operations as a flat table of JSON-friendly callables.
+
+Each operation takes and returns plain JSON values: dates as ISO strings,
+statuses as their values, domain objects as dicts. The server and the
+scripted CLI both dispatch through this table.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Union
+
+from todolist.core.domain.project import Project
+from todolist.core.domain.stats import ProjectStats, StoreStats
+from todolist.core.domain.task import Task
+from todolist.core.validation import parse_deadline, parse_status
+from todolist.core.services.project_service import ProjectService, UpdateProject
+from todolist.core.services.task_service import TaskService, UpdateTask
+
+if TYPE_CHECKING:
+    from todolist.core.services.search_service import SearchResult
+
+
+def encode_project(project: Project) -> Dict[str, Any]:
+    return {"id": project.id, "name": project.name, "description": project.description}
+
+
+def encode_task(task: Task) -> Dict[str, Any]:
+    return {
+        "id": task.id,
+        "project_id": task.project_id,
+        "name": task.name,
+        "description": task.description,
+        "status": task.status.value,
+        "deadline": task.deadline.isoformat() if task.deadline else None,
+    }
+
+
+def encode_project_stats(stats: ProjectStats) -> Dict[str, Any]:
+    return {
+        "project_id": stats.project_id,
+        "task_count": stats.task_count,
+        "by_status": {status.value: count for status, count in stats.by_status.items()},
+        "overdue": stats.overdue,
+    }
+
+
+def encode_store_stats(stats: StoreStats) -> Dict[str, Any]:
+    return {"project_count": stats.project_count, "projects": [encode_project_stats(p) for p in stats.projects]}
+
+
+def encode_search_result(result: SearchResult) -> Dict[str, Any]:
+    item = encode_project(result.item) if isinstance(result.item, Project) else encode_task(result.item)
+    return {"kind": result.kind, "id": result.id, "score": result.score, "item": item}
+
+
+def build_operations(
+    project_service: ProjectService,
+    task_service: TaskService,
+    project_update: UpdateProject,
+    task_update: UpdateTask,
+) -> Dict[str, Callable[..., Any]]:
+    """Operation name -> callable taking JSON values."""
+
+    def create_project(name: str, description: str = "") -> Dict[str, Any]:
+        return encode_project(project_service.create_project(name, description))
+
+    def delete_project(project: Union[int, str]) -> bool:
+        return project_service.delete_project(project)
+
+    def list_projects(after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return [encode_project(p) for p in project_service.list_projects(after_id = after_id, limit = limit)]
+
+    def rename_project(project: Union[int, str], name: str) -> Dict[str, Any]:
+        return encode_project(project_update.edit_project_name(project, name = name))
+
+    def describe_project(project: Union[int, str], description: str) -> Dict[str, Any]:
+        return encode_project(project_update.edit_project_description(project, description = description))
+
+    def store_stats(today: Optional[str] = None) -> Dict[str, Any]:
+        return encode_store_stats(project_service.stats(parse_deadline(today)))
+
+    def add_task(
+        project: Union[int, str],
+        name: str,
+        description: str = "",
+        status: Optional[str] = None,
+        deadline: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return encode_task(task_service.add_task(
+            project,
+            name = name,
+            description = description,
+            status = parse_status(status),
+            deadline = parse_deadline(deadline),
+        ))
+
+    def list_tasks(project: Union[int, str], after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return [encode_task(t) for t in task_service.list_tasks_by_project(project, after_id = after_id, limit = limit)]
+
+    def find_tasks(
+        project: Optional[Union[int, str]] = None,
+        status: Optional[Union[str, List[str]]] = None,
+        due_before: Optional[str] = None,
+        due_after: Optional[str] = None,
+        order_by: str = "id",
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        tasks = task_service.find_tasks(
+            project = project,
+            status = status,
+            due_before = parse_deadline(due_before),
+            due_after = parse_deadline(due_after),
+            order_by = order_by,
+            limit = limit,
+        )
+        return [encode_task(t) for t in tasks]
+
+    def project_stats(project: Union[int, str], today: Optional[str] = None) -> Dict[str, Any]:
+        return encode_project_stats(task_service.stats(project, parse_deadline(today)))
+
+    def rename_task(task_id: int, name: str) -> Dict[str, Any]:
+        return encode_task(task_update.edit_task_name(task_id, name = name))
+
+    def describe_task(task_id: int, description: str) -> Dict[str, Any]:
+        return encode_task(task_update.edit_task_description(task_id, description = description))
+
+    def set_deadline(task_id: int, deadline: Optional[str]) -> Dict[str, Any]:
+        return encode_task(task_update.edit_task_deadline(task_id, deadline = parse_deadline(deadline)))
+
+    def set_status(task_id: int, status: str) -> Dict[str, Any]:
+        return encode_task(task_update.change_status(task_id, parse_status(status)))
+
+    def due_tasks(limit: int = 10, today: Optional[str] = None) -> List[Dict[str, Any]]:
+        if task_service.deadlines is None:
+            raise ValueError("Deadline tracking is not available.")
+        return [encode_task(t) for t in task_service.deadlines.next_due(limit, parse_deadline(today))]
+
+    def overdue_tasks(today: Optional[str] = None) -> List[Dict[str, Any]]:
+        if task_service.deadlines is None:
+            raise ValueError("Deadline tracking is not available.")
+        return [encode_task(t) for t in task_service.deadlines.overdue(parse_deadline(today))]
+
+    def reclaiming(timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        reclaimer = project_service.reclaimer
+        if reclaimer is None:
+            return []
+        if timeout is not None:
+            reclaimer.wait(timeout)
+        return [
+            {"project_id": p.project_id, "tasks": p.tasks, "freed": p.freed, "remaining": p.remaining}
+            for p in reclaimer.progress()
+        ]
+
+    def search(query: str, limit: Optional[int] = 20) -> List[Dict[str, Any]]:
+        if task_service.search is None:
+            raise ValueError("Search is not available.")
+        return [encode_search_result(r) for r in task_service.search.search(query, limit)]
+
+    return {
+        "project.create": create_project,
+        "project.delete": delete_project,
+        "project.list": list_projects,
+        "project.rename": rename_project,
+        "project.describe": describe_project,
+        "project.stats": store_stats,
+        "project.reclaiming": reclaiming,
+        "task.add": add_task,
+        "task.delete": task_service.delete_task,
+        "task.list": list_tasks,
+        "task.find": find_tasks,
+        "task.stats": project_stats,
+        "task.rename": rename_task,
+        "task.describe": describe_task,
+        "task.set_deadline": set_deadline,
+        "task.set_status": set_status,
+        "task.due": due_tasks,
+        "task.overdue": overdue_tasks,
+        "search": search,
+    }
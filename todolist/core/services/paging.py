@@ -0,0 +1,46 @@
+"""Keyset pagination helpers shared by the services."""
+from __future__ import annotations
+
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 1000
+
+# fetch(after_id, limit) -> up to ``limit`` items with id above ``after_id``, by ascending id
+PageFetcher = Callable[[int, int], List[T]]
+AsyncPageFetcher = Callable[[int, int], Awaitable[List[T]]]
+
+
+def iter_pages(fetch: PageFetcher, after_id: int = 0, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[T]:
+    """Yield items page by page, resuming each page after the last id seen."""
+    if page_size < 1:
+        raise ValueError("page_size must be positive.")
+    while True:
+        page = fetch(after_id, page_size)
+        yield from page
+        if len(page) < page_size:
+            return
+        after_id = page[-1].id
+
+
+async def aiter_pages(fetch: AsyncPageFetcher, after_id: int = 0, page_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[T]:
+    """Async counterpart of ``iter_pages``."""
+    if page_size < 1:
+        raise ValueError("page_size must be positive.")
+    while True:
+        page = await fetch(after_id, page_size)
+        for item in page:
+            yield item
+        if len(page) < page_size:
+            return
+        after_id = page[-1].id
+
+
+def fetch_page(fetch: PageFetcher, after_id: Optional[int], limit: Optional[int]) -> List[T]:
+    """One page for the service ``after_id``/``limit`` arguments; no limit means the rest."""
+    if limit is not None and limit < 0:
+        raise ValueError("limit cannot be negative.")
+    if limit is None:
+        return list(iter_pages(fetch, after_id or 0))
+    return fetch(after_id or 0, limit) if limit else []
@@ -1,12 +1,26 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, Optional, Union
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import date
+from typing import TYPE_CHECKING, ContextManager, Iterable, Iterator, List, Optional, Union
 
 from todolist.config.settings import Settings
 from todolist.core.domain.project import Project
+from todolist.core.domain.stats import StoreStats
 from todolist.core.repositories.project_repository import ProjectRepository
 from todolist.core.repositories.task_repository import TaskRepository
+from todolist.core.services.bulk import BulkResult, Record, RowError, batched
+from todolist.core.services.paging import DEFAULT_PAGE_SIZE, fetch_page, iter_pages
+from todolist.core.validation import Validator, validator_for
+
+if TYPE_CHECKING:
+    # optional collaborators; main builds them only for the commands using them
+    from todolist.core.repositories.reclaiming import ReclaimingTaskRepository
+    from todolist.core.repositories.unit_of_work import UnitOfWork
+    from todolist.core.services.deadline_service import DeadlineScheduler
+    from todolist.core.services.search_service import SearchService
+    from todolist.core.services.version_service import VersionTracker
 
 def can_cast_to_int(s: Union[str, int]) -> bool:
     try:
@@ -20,26 +34,53 @@ class ProjectService:
     """Service for managing projects and enforcing business rules
     
     Responsibilities:
-    - Enforce name/description constraints (lengths)
+    - Enforce name/description constraints (lengths), through ``validator``
     - Enforce unique project names
     - Enforce MAX_NUMBER_OF_PROJECT limit
     - Cascade delete tasks when a project is removed
+    
+    With ``uow``, a cascade delete and each import batch run as one unit of
+    work; ``project_repo`` and ``task_rep`` must then be ``uow``'s views.
+    ``validator`` defaults to the one compiled from ``settings``.
+    ``versions`` answers ``project_change_records``.
+    With ``reclaimer`` (the repository below ``task_rep``), deleting a
+    project hides its tasks at once and leaves freeing them to the reclaimer.
     """
     
     project_repo: ProjectRepository
     task_rep: TaskRepository
     settings: Settings
+    search: Optional[SearchService] = None
+    uow: Optional[UnitOfWork] = None
+    validator: Optional[Validator] = None
+    deadlines: Optional[DeadlineScheduler] = None
+    versions: Optional[VersionTracker] = None
+    reclaimer: Optional[ReclaimingTaskRepository] = None
+    
+    def __post_init__(self) -> None:
+        if self.validator is None:
+            self.validator = validator_for(self.settings)
+    
+    def _transaction(self) -> ContextManager:
+        return self.uow if self.uow is not None else nullcontext()
     
     def create_project(self, name: str, description: str = "") -> Project:
-        if can_cast_to_int(name):
-            raise ValueError("Project name cannot be just numbers.")
+        self.validator.check_project(name, description)
+        existing_count: int = self.project_repo.count()
+        return self._create_project(name, description, existing_count)
+    
+    def _create_project(self, name: str, description: str, existing_count: int, *, index: bool = True) -> Project:
+        """Create a project from fields that already passed the validator."""
         if self.project_repo.get_by_name(name) is not None:
             raise ValueError("Project name must be unique.")
-        existing_count: int = len(list(self.project_repo.list_all_projects()))
-        if existing_count == self.settings.MAX_PROJECTS:
+        if existing_count >= self.settings.MAX_PROJECTS:
             raise ValueError("You have reached maximum number of projects.")
-        project = Project(id = self.project_repo.next_available_id(), name = name, description = description)
-        return self.project_repo.add(project)
+        project = self.validator.build_project(self.project_repo.next_available_id(), name, description)
+        # checked again atomically: another writer may have taken the name or the last slot
+        project = self.project_repo.add_if_unique(project, self.settings.MAX_PROJECTS)
+        if index and self.search is not None:
+            self.search.index_project(project)
+        return project
     
     def delete_project(self, project_identifier: Union[int, str]) -> bool:
         project: Project
@@ -49,19 +90,104 @@ class ProjectService:
             project = self.project_repo.get_by_name(project_identifier)
         if project is None:
             return False
-        # Cascade deleting tasks
-        self.task_rep.remove_by_project(project.id)
-        return self.project_repo.remove(project.id)
+        if self.reclaimer is not None:
+            # the tasks vanish with the project and are freed in chunks later
+            removed: bool = self.project_repo.remove(project.id)
+            if removed:
+                self.reclaimer.defer_project(project.id)
+        else:
+            # Cascade deleting tasks
+            with self._transaction():
+                self.task_rep.remove_by_project(project.id)
+                removed = self.project_repo.remove(project.id)
+        if self.search is not None:
+            self.search.remove_project(project.id)
+        if self.deadlines is not None:
+            self.deadlines.remove_project(project.id)
+        return removed
     
-    def list_projects(self) -> Iterable[Project]:
+    def list_projects(self, *, after_id: Optional[int] = None, limit: Optional[int] = None) -> Iterable[Project]:
+        """All projects; with ``after_id``/``limit``, one keyset page by ascending id."""
+        if after_id is not None or limit is not None:
+            return fetch_page(self.project_repo.page_projects, after_id, limit)
         projects: list = list(self.project_repo.list_all_projects())
         return projects
     
+    def iter_projects(self, *, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Project]:
+        """Stream projects by ascending id, holding one page at a time."""
+        return iter_pages(self.project_repo.page_projects, page_size = page_size)
+    
+    def stats(self, today: Optional[date] = None) -> StoreStats:
+        """Project count and per-project task counters, read from repository counters."""
+        projects = [self.task_rep.stats_by_project(p.id, today) for p in self.project_repo.list_all_projects()]
+        return StoreStats(project_count = self.project_repo.count(), projects = projects)
+    
+    def import_projects(self, records: Iterable[Record], *, batch_size: int = 1000) -> BulkResult:
+        """Create projects streamed from ``records`` ("name", "description") and report rejected rows.
+        
+        The fields of each batch are validated in one pass before any of its
+        projects is created.
+        """
+        result = BulkResult()
+        for batch in batched(records, max(1, batch_size)):
+            valid, errors = self.validator.project_records(batch)
+            created: List[Project] = []
+            with self._transaction():
+                existing_count: int = self.project_repo.count()
+                for row, fields in valid:
+                    try:
+                        project = self._create_project(fields.name, fields.description, existing_count, index = False)
+                    except ValueError as exc:
+                        errors.append(RowError(row, str(exc)))
+                        continue
+                    created.append(project)
+                    existing_count += 1
+            result.added += len(created)
+            result.errors.extend(sorted(errors, key = lambda error: error.row))
+            if self.search is not None:
+                for project in created:
+                    self.search.index_project(project)
+        return result
+    
+    def iter_project_records(self) -> Iterable[Record]:
+        for project in self.iter_projects():
+            yield {"name": project.name, "description": project.description}
+    
+    def project_change_records(self, version: int) -> Iterator[Record]:
+        """Projects created, changed or deleted after store ``version``, as export records.
+
+        Deleted projects only carry their id, version and ``deleted`` flag.
+        Raises ValueError right away if versions are not tracked or ``version``
+        is not valid.
+        """
+        from todolist.core.repositories.change_feed import PROJECT
+
+        if self.versions is None:
+            raise ValueError("Versions are not tracked.")
+        changes = self.versions.changes_since(version, PROJECT)
+        return (
+            {
+                "id": change.id,
+                "version": change.version,
+                "deleted": change.deleted,
+                "name": project.name if project else "",
+                "description": project.description if project else "",
+            }
+            for change, project in ((change, change.item) for change in changes)
+        )
+    
 @dataclass  
 class UpdateProject:
     """This class handles update procedure for different features of projects"""
     
     project_repo: ProjectRepository
+    settings: Settings = field(default_factory = Settings)
+    search: Optional[SearchService] = None
+    validator: Optional[Validator] = None
+    
+    def __post_init__(self) -> None:
+        if self.validator is None:
+            self.validator = validator_for(self.settings)
     
     def edit_project_name(self, project_identifier: Union[int, str], *, name: str) -> Project:
         project: Project
@@ -71,15 +197,15 @@ class UpdateProject:
             project = self.project_repo.get_by_name(project_identifier)
         if project is None:
             raise ValueError("Project not found.")
-        if not name or len(name.strip()) == 0:
-            raise ValueError("Name of project cannot be empty")
+        # rename a copy so a rejected name never reaches the stored project
+        renamed = self.validator.edit_project(project, name = name)
         if name != project.name:
             if self.project_repo.get_by_name(name) is not None:
                 raise ValueError("Project name must be unique.")
-        if len(name) > Settings.MAX_NAME_LEN:
-            raise ValueError(f"Length of project name cannot be more than {Settings.MAX_NAME_LEN} characters.")
-        project.name = name
-        return self.project_repo.update(project)
+        project = self.project_repo.update_if_unique(renamed)
+        if self.search is not None:
+            self.search.index_project(project)
+        return project
     
     def edit_project_description(self, project_identifier: Union[int, str],  *, description: str) -> Project:
         project: Project
@@ -89,9 +215,9 @@ class UpdateProject:
             project = self.project_repo.get_by_name(project_identifier)
         if project is None:
             raise ValueError("Project not found.")
-        if len(description) > Settings.MAX_DESCRIPTION_LEN:
-            raise ValueError(f"Length of project description cannot be more than {Settings.MAX_DESCRIPTION_LEN} characters.")
-        project.description = description
-        return self.project_repo.update(project)
+        project = self.project_repo.update(self.validator.edit_project(project, description = description))
+        if self.search is not None:
+            self.search.index_project(project)
+        return project
     
     
\ No newline at end of file
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import math
+import re
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from todolist.core.domain.project import Project
+from todolist.core.domain.task import Task
+from todolist.core.repositories.project_repository import ProjectRepository
+from todolist.core.repositories.task_repository import TaskRepository
+
+PROJECT = "project"
+TASK = "task"
+
+# (kind, id) of an indexed document
+DocKey = Tuple[str, int]
+
+_TOKEN = re.compile(r"\w+")
+NAME_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+PREFIX_FACTOR = 0.5
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.casefold())
+
+
+class InvertedIndex:
+    """Term -> postings index with prefix lookup over a sorted vocabulary.
+
+    Every query token must match (exactly or as a prefix) for a document to be
+    returned. Scores are tf-idf style: field weight times inverse document
+    frequency, halved for prefix-only matches.
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self._postings: Dict[str, Dict[DocKey, float]] = {}
+        self._documents: Dict[DocKey, Dict[str, float]] = {}
+        self._vocabulary: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, key: DocKey) -> bool:
+        return key in self._documents
+
+    def index(self, key: DocKey, fields: Iterable[Tuple[str, float]]) -> None:
+        """(Re)index ``key`` from (text, weight) pairs."""
+        weights: Dict[str, float] = {}
+        for text, weight in fields:
+            for term in tokenize(text):
+                weights[term] = weights.get(term, 0.0) + weight
+        if self._documents.get(key) == weights:
+            return
+        self.remove(key)
+        self._documents[key] = weights
+        for term, weight in weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._vocabulary, term)
+            postings[key] = weight
+
+    def remove(self, key: DocKey) -> None:
+        weights = self._documents.pop(key, None)
+        if weights is None:
+            return
+        for term in weights:
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+                del self._vocabulary[bisect_left(self._vocabulary, term)]
+
+    def _terms_with_prefix(self, prefix: str) -> Iterable[str]:
+        for i in range(bisect_left(self._vocabulary, prefix), len(self._vocabulary)):
+            term = self._vocabulary[i]
+            if not term.startswith(prefix):
+                break
+            yield term
+
+    def search(self, query: str, limit: Optional[int] = 20) -> List[Tuple[DocKey, float]]:
+        tokens = tokenize(query)
+        if not tokens or not self._documents:
+            return []
+        total: int = len(self._documents)
+        per_token: List[Dict[DocKey, float]] = []
+        for token in dict.fromkeys(tokens):
+            scores: Dict[DocKey, float] = {}
+            for term in self._terms_with_prefix(token):
+                postings = self._postings[term]
+                factor = math.log(1 + total / len(postings)) * (1.0 if term == token else PREFIX_FACTOR)
+                for key, weight in postings.items():
+                    score = weight * factor
+                    if score > scores.get(key, 0.0):
+                        scores[key] = score
+            if not scores:
+                return []
+            per_token.append(scores)
+
+        per_token.sort(key = len)
+        results: Dict[DocKey, float] = dict(per_token[0])
+        for scores in per_token[1:]:
+            results = {key: score + scores[key] for key, score in results.items() if key in scores}
+        ranked = sorted(results.items(), key = lambda item: (-item[1], item[0]))
+        return ranked if limit is None else ranked[:limit]
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    kind: str
+    id: int
+    score: float
+    item: Union[Project, Task]
+
+
+@dataclass
+class SearchService:
+    """Full-text search over project and task names and descriptions.
+
+    The index is built from the repositories on the first search and is then
+    kept current by the services that own the edit and delete paths. A lock
+    guards the index so services shared between threads can use it.
+    """
+
+    project_repo: ProjectRepository
+    task_repo: TaskRepository
+    index: InvertedIndex = field(default_factory = InvertedIndex)
+
+    def __post_init__(self):
+        self._built: bool = False
+        self._project_tasks: Dict[int, Set[int]] = {}
+        self._task_project: Dict[int, int] = {}
+        self._lock = threading.RLock()
+
+    def rebuild(self) -> None:
+        with self._lock:
+            self.index.clear()
+            self._project_tasks = {}
+            self._task_project = {}
+            self._built = True
+            for project in self.project_repo.list_all_projects():
+                self.index_project(project)
+                for task in self.task_repo.list_by_project(project.id):
+                    self.index_task(task)
+
+    def index_project(self, project: Project) -> None:
+        with self._lock:
+            if not self._built:
+                return
+            self.index.index((PROJECT, project.id), ((project.name, NAME_WEIGHT), (project.description, DESCRIPTION_WEIGHT)))
+
+    def index_task(self, task: Task) -> None:
+        with self._lock:
+            if not self._built:
+                return
+            previous = self._task_project.get(task.id)
+            if previous is not None and previous != task.project_id:
+                self._project_tasks[previous].discard(task.id)
+            self._task_project[task.id] = task.project_id
+            self._project_tasks.setdefault(task.project_id, set()).add(task.id)
+            self.index.index((TASK, task.id), ((task.name, NAME_WEIGHT), (task.description, DESCRIPTION_WEIGHT)))
+
+    def remove_task(self, task_id: int) -> None:
+        with self._lock:
+            project_id = self._task_project.pop(task_id, None)
+            if project_id is not None:
+                self._project_tasks[project_id].discard(task_id)
+            self.index.remove((TASK, task_id))
+
+    def remove_project(self, project_id: int) -> None:
+        """Drop a project and, as in the cascade delete, all of its tasks."""
+        with self._lock:
+            for task_id in self._project_tasks.pop(project_id, set()):
+                self._task_project.pop(task_id, None)
+                self.index.remove((TASK, task_id))
+            self.index.remove((PROJECT, project_id))
+
+    def search(self, query: str, limit: Optional[int] = 20) -> List[SearchResult]:
+        with self._lock:
+            if not self._built:
+                self.rebuild()
+            results: List[SearchResult] = []
+            for (kind, item_id), score in self.index.search(query, limit):
+                item = self.project_repo.get_by_id(item_id) if kind == PROJECT else self.task_repo.get_by_id(item_id)
+                if item is not None:
+                    results.append(SearchResult(kind = kind, id = item_id, score = score, item = item))
+            return results
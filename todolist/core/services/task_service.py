@@ -1,15 +1,29 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 from datetime import date
-from typing import Iterable, Optional, Union
+from functools import partial
+from typing import TYPE_CHECKING, ContextManager, Dict, Iterable, Iterator, List, Optional, Union
 
 from todolist.config.settings import Settings
+from todolist.core.domain.stats import ProjectStats
 from todolist.core.domain.status import TaskStatus
 from todolist.core.domain.task import Task
 from todolist.core.domain.project import Project
 from todolist.core.repositories.project_repository import ProjectRepository
+from todolist.core.repositories.task_query import TaskQuery
 from todolist.core.repositories.task_repository import TaskRepository
+from todolist.core.services.bulk import BulkResult, Record, RowError, batched
+from todolist.core.services.paging import DEFAULT_PAGE_SIZE, fetch_page, iter_pages
+from todolist.core.validation import Validator, validator_for
+
+if TYPE_CHECKING:
+    # optional collaborators; main builds them only for the commands using them
+    from todolist.core.repositories.unit_of_work import UnitOfWork
+    from todolist.core.services.deadline_service import DeadlineScheduler
+    from todolist.core.services.search_service import SearchService
+    from todolist.core.services.version_service import VersionTracker
 
 def can_cast_to_int(s: Union[str, int]) -> bool:
     try:
@@ -20,11 +34,29 @@ def can_cast_to_int(s: Union[str, int]) -> bool:
 
 @dataclass
 class TaskService:
-    """Service for managing tasks whithin a project context."""
+    """Service for managing tasks whithin a project context.
+    
+    With ``uow``, each bulk batch runs as one unit of work; ``task_repo`` and
+    ``project_repo`` must then be ``uow``'s views. ``validator`` defaults to
+    the one compiled from ``settings``. ``search`` and ``deadlines`` are
+    kept current with every write; ``versions`` answers ``task_change_records``.
+    """
     
     task_repo: TaskRepository
     project_repo: ProjectRepository
     settings: Settings
+    search: Optional[SearchService] = None
+    uow: Optional[UnitOfWork] = None
+    validator: Optional[Validator] = None
+    deadlines: Optional[DeadlineScheduler] = None
+    versions: Optional[VersionTracker] = None
+    
+    def __post_init__(self) -> None:
+        if self.validator is None:
+            self.validator = validator_for(self.settings)
+    
+    def _transaction(self) -> ContextManager:
+        return self.uow if self.uow is not None else nullcontext()
     
     def add_task(
         self,
@@ -42,25 +74,172 @@ class TaskService:
             project = self.project_repo.get_by_name(project_identifier)
         if project is None:
             raise ValueError("Project not found.")
-        task_count: int = len(list(self.task_repo.list_by_project(project.id)))
-        if task_count == self.settings.MAX_TASKS:
+        task_count: int = self.task_repo.count_by_project(project.id)
+        if task_count >= self.settings.MAX_TASKS:
             raise ValueError("You have reached maximum number of tasks per project.")
+        self.validator.check_task(name, description)
+        task = self.validator.build_task(self.task_repo.next_available_id(), project.id, name, description, status, deadline)
+        # checked again atomically: another writer may have filled the project meanwhile
+        task = self.task_repo.add_if_under_limit(task, self.settings.MAX_TASKS)
+        if self.search is not None:
+            self.search.index_task(task)
+        if self.deadlines is not None:
+            self.deadlines.track(task)
+        return task
+    
+    def add_tasks_bulk(self, records: Iterable[Record], *, batch_size: int = 1000) -> BulkResult:
+        """Add tasks streamed from ``records`` and report rejected rows.
+        
+        Each record maps "project" (id or name), "name", "description", "status"
+        and "deadline" (YYYY-MM-DD). Records are consumed in batches: every
+        project is resolved and its task count read once per batch, and the
+        fields of the whole batch are validated in one pass before any task of
+        it is added.
+        """
+        result = BulkResult()
+        for batch in batched(records, max(1, batch_size)):
+            valid, errors = self.validator.task_records(batch)
+            projects: Dict[str, Optional[Project]] = {}
+            counts: Dict[int, int] = {}
+            added: List[Task] = []
+            with self._transaction():
+                for row, fields in valid:
+                    try:
+                        if fields.project not in projects:
+                            projects[fields.project] = self._resolve_project(fields.project)
+                        project = projects[fields.project]
+                        if project is None:
+                            raise ValueError("Project not found.")
+                        if project.id not in counts:
+                            counts[project.id] = self.task_repo.count_by_project(project.id)
+                        if counts[project.id] >= self.settings.MAX_TASKS:
+                            raise ValueError("You have reached maximum number of tasks per project.")
+                        task = self.validator.build_task(
+                            self.task_repo.next_available_id(),
+                            project.id,
+                            fields.name,
+                            fields.description,
+                            fields.status,
+                            fields.deadline,
+                        )
+                        self.task_repo.add(task)
+                    except ValueError as exc:
+                        errors.append(RowError(row, str(exc)))
+                        continue
+                    added.append(task)
+                    counts[project.id] += 1
+            result.added += len(added)
+            result.errors.extend(sorted(errors, key = lambda error: error.row))
+            if self.search is not None:
+                for task in added:
+                    self.search.index_task(task)
+            if self.deadlines is not None:
+                for task in added:
+                    self.deadlines.track(task)
+        return result
+    
+    def find_tasks(
+        self,
+        project: Optional[Union[str, int]] = None,
+        status: Optional[Union[TaskStatus, str, Iterable[Union[TaskStatus, str]]]] = None,
+        due_before: Optional[date] = None,
+        due_after: Optional[date] = None,
+        order_by: str = "id",
+        limit: Optional[int] = None,
+    ) -> List[Task]:
+        """Find tasks across projects.
         
-        task = Task(
-            id = self.task_repo.next_available_id(),
-            project_id = project.id,
-            name = name,
-            description = description,
-            status = status,
-            deadline = deadline
+        ``status`` accepts one status or several; ``due_before`` is exclusive and
+        ``due_after`` inclusive, e.g. overdue open tasks are
+        ``find_tasks(status=["todo", "doing"], due_before=date.today())``.
+        """
+        project_id: Optional[int] = None
+        if project is not None:
+            resolved = self._resolve_project(project)
+            if resolved is None:
+                raise ValueError("Project not found.")
+            project_id = resolved.id
+        statuses = None
+        if status is not None:
+            if isinstance(status, (str, TaskStatus)):
+                status = [status]
+            statuses = frozenset(s if isinstance(s, TaskStatus) else TaskStatus.from_string(s) for s in status)
+        query = TaskQuery(
+            project_id = project_id,
+            statuses = statuses,
+            due_before = due_before,
+            due_after = due_after,
+            order_by = order_by,
+            limit = limit,
         )
-        task.validate()
-        return self.task_repo.add(task)
+        return self.task_repo.find(query)
+    
+    def stats(self, project_identifier: Union[str, int], today: Optional[date] = None) -> ProjectStats:
+        project = self._resolve_project(project_identifier)
+        if project is None:
+            raise ValueError("Project not found.")
+        return self.task_repo.stats_by_project(project.id, today)
+    
+    def iter_task_records(self) -> Iterable[Record]:
+        """Yield every task as an export record, project by project."""
+        for project in iter_pages(self.project_repo.page_projects):
+            for task in self._iter_project_tasks(project.id):
+                yield {
+                    "project": project.name,
+                    "name": task.name,
+                    "description": task.description,
+                    "status": task.status.value,
+                    "deadline": task.deadline.isoformat() if task.deadline else "",
+                }
+    
+    def task_change_records(self, version: int) -> Iterator[Record]:
+        """Tasks created, changed or deleted after store ``version``, as export records.
+
+        ``project`` is the project id; deleted tasks, including those removed
+        with their project, only carry their id, version and ``deleted`` flag.
+        Raises ValueError right away if versions are not tracked or ``version``
+        is not valid.
+        """
+        from todolist.core.repositories.change_feed import TASK
+
+        if self.versions is None:
+            raise ValueError("Versions are not tracked.")
+        changes = self.versions.changes_since(version, TASK)
+        return (
+            {
+                "id": change.id,
+                "version": change.version,
+                "deleted": change.deleted,
+                "project": task.project_id if task else "",
+                "name": task.name if task else "",
+                "description": task.description if task else "",
+                "status": task.status.value if task else "",
+                "deadline": task.deadline.isoformat() if task and task.deadline else "",
+            }
+            for change, task in ((change, change.item) for change in changes)
+        )
+    
+    def _resolve_project(self, project_identifier: Union[str, int]) -> Optional[Project]:
+        if can_cast_to_int(project_identifier):
+            return self.project_repo.get_by_id(int(project_identifier))
+        return self.project_repo.get_by_name(project_identifier)
     
     def delete_task(self, task_id: int) -> bool:
-        return self.task_repo.remove(task_id)
+        removed: bool = self.task_repo.remove(task_id)
+        if removed and self.search is not None:
+            self.search.remove_task(task_id)
+        if removed and self.deadlines is not None:
+            self.deadlines.remove_task(task_id)
+        return removed
     
-    def list_tasks_by_project(self, project_identifier: Union[str, int]) -> Iterable[Task]:
+    def list_tasks_by_project(
+        self,
+        project_identifier: Union[str, int],
+        *,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> Iterable[Task]:
+        """Tasks of a project; with ``after_id``/``limit``, one keyset page by ascending id."""
         project: Project
         if can_cast_to_int(project_identifier):
             project = self.project_repo.get_by_id(int(project_identifier))
@@ -68,46 +247,69 @@ class TaskService:
             project = self.project_repo.get_by_name(project_identifier)
         if project is None:
             raise ValueError("Project not found.")
+        if after_id is not None or limit is not None:
+            return fetch_page(partial(self.task_repo.page_by_project, project.id), after_id, limit)
         tasks: list = list(self.task_repo.list_by_project(project.id))
         return tasks
     
+    def iter_tasks_by_project(self, project_identifier: Union[str, int], *, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Task]:
+        """Stream a project's tasks by ascending id, holding one page at a time."""
+        project = self._resolve_project(project_identifier)
+        if project is None:
+            raise ValueError("Project not found.")
+        return self._iter_project_tasks(project.id, page_size)
+    
+    def _iter_project_tasks(self, project_id: int, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Task]:
+        return iter_pages(partial(self.task_repo.page_by_project, project_id), page_size = page_size)
+    
 @dataclass
 class UpdateTask:
     """This class handles update procedure for different features of tasks"""
         
     task_repo: TaskRepository
+    settings: Settings = field(default_factory = Settings)
+    search: Optional[SearchService] = None
+    validator: Optional[Validator] = None
+    deadlines: Optional[DeadlineScheduler] = None
+        
+    def __post_init__(self) -> None:
+        if self.validator is None:
+            self.validator = validator_for(self.settings)
         
     def edit_task_name(self, task_id: int, *, name: str) -> Task:
         task: Task = self.task_repo.get_by_id(task_id)
         if task is None:
            raise ValueError("No Task found.")    
-        if not name or len(name.strip()) == 0:
-            raise ValueError("Task name cannot be empty")   
-        if len(name) > Settings.MAX_NAME_LEN:
-            raise ValueError(f"Length of task name cannot be more than {Settings.MAX_NAME_LEN} characters.")
-        task.name = name
-        return self.task_repo.update(task)
+        task = self.task_repo.update(self.validator.edit_task(task, name = name))
+        if self.search is not None:
+            self.search.index_task(task)
+        return task
         
     def edit_task_description(self, task_id: int, *, description: str) -> Task:
         task: Task = self.task_repo.get_by_id(task_id)
         if task is None:
             raise ValueError("No Task found.")    
-        if len(description) > Settings.MAX_DESCRIPTION_LEN:
-            raise ValueError(f"Length of task description cannot be more than {Settings.MAX_DESCRIPTION_LEN} characters.")
-        task.description = description            
-        return self.task_repo.update(task)
+        task = self.task_repo.update(self.validator.edit_task(task, description = description))
+        if self.search is not None:
+            self.search.index_task(task)
+        return task
         
     def edit_task_deadline(self, task_id: int, *, deadline: date) -> Task:
         task: Task = self.task_repo.get_by_id(task_id)
         if task is None:
             raise ValueError("No Task found.")    
-        task.deadline = deadline           
-        return self.task_repo.update(task)
+        task = self.task_repo.update(self.validator.edit_task(task, deadline = deadline))
+        if self.deadlines is not None:
+            self.deadlines.track(task)
+        return task
         
     def change_status(self, task_id: int, status: TaskStatus) -> Task:
         task: Task = self.task_repo.get_by_id(task_id)
         if task is None:
             raise ValueError("No Task found.")            
-        task.status = status
-        return self.task_repo.update(task)
+        task = self.task_repo.update(self.validator.edit_task(task, status = status))
+        if self.deadlines is not None:
+            self.deadlines.track(task)
+        return task
+
         
\ No newline at end of file
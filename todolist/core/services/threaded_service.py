@@ -0,0 +1,38 @@
+"""Base of the awaitable services: synchronous service calls run in a thread pool.
+
+The async services hold a synchronous service and hand each call to an
+``Executor``, so the business rules live in one place and storage work
+never blocks the event loop. Without an ``executor`` all of them share one
+single-worker pool, which serializes calls for repositories that are not
+thread-safe; pass a larger pool only for thread-safe repositories, and the
+same one to every service sharing repositories.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+_default_executor: Optional[Executor] = None
+_default_lock = threading.Lock()
+
+
+def default_executor() -> Executor:
+    """Single-worker pool shared by the async services given no executor."""
+    global _default_executor
+    with _default_lock:
+        if _default_executor is None:
+            _default_executor = ThreadPoolExecutor(max_workers = 1, thread_name_prefix = "todolist-service")
+        return _default_executor
+
+
+class ThreadedService:
+
+    def __init__(self, service: Any, *, executor: Optional[Executor] = None) -> None:
+        self.service = service
+        self.executor: Executor = executor or default_executor()
+
+    async def _call(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, partial(fn, *args, **kwargs))
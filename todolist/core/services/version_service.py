@@ -0,0 +1,223 @@
+"""Store-wide and per-entity versions, and what changed since a version.
+
+``VersionTracker`` follows a ``ChangeFeed``: every published change advances
+the store version by one and stamps it on the project or task it touched, so
+an entity's version is the store version of its last change. Deleted
+entities keep their last version as a tombstone, and so do tasks removed
+with their project. Entities unchanged since tracking began are at version 0.
+
+``changes_since(v)`` bisects a list of stamps kept in version order, so it
+costs in proportion to the changes after ``v`` (plus one lookup per changed
+entity), not to the size of the store. ``changes_since(0)`` lists every
+entity and tombstone, for a first copy.
+
+With a ``log`` (a ``Journal``) versions survive restarts: stamps are
+appended as changes are published, replayed on start-up and compacted to
+one record per entity, on a thread of their own so writers do not wait for
+the snapshot. Writes made without the tracker are not versioned.
+
+The log is not written atomically with the data: a change is stored before
+its stamp is appended, so a process killed in between leaves changes no
+version covers. ``close()`` marks the log as shut down cleanly; a tracker
+that starts from a log without the mark rejects every version it had
+reached (``changes_since`` raises ValueError), so clients resynchronize from
+version 0 after a crash.
+"""
+from __future__ import annotations
+
+import threading
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from todolist.core.repositories.change_feed import PROJECT, TASK, Change, ChangeFeed
+from todolist.core.repositories.project_repository import ProjectRepository
+from todolist.core.repositories.task_repository import TaskRepository
+
+# journal record holding the store version, ahead of the stamps of a compacted log
+_HEADER = "v"
+# journal record of the last version reached before an unclean shutdown
+_FLOOR = "f"
+# journal record closing a clean shutdown
+_CLOSED = "c"
+
+
+class Versioned(NamedTuple):
+    """A project or task as of its last change; ``item`` is None for a tombstone."""
+
+    entity: str
+    id: int
+    version: int
+    item: Any
+
+    @property
+    def deleted(self) -> bool:
+        return self.item is None
+
+
+def _key(entity: str, entity_id: int) -> int:
+    return entity_id * 2 + (entity == TASK)
+
+
+def _entity(key: int) -> Tuple[str, int]:
+    return (TASK if key & 1 else PROJECT), key >> 1
+
+
+class VersionTracker:
+    """Versions of the projects and tasks written through one feed. Thread-safe."""
+
+    def __init__(self, feed: ChangeFeed, project_repo: ProjectRepository, task_repo: TaskRepository, *, log: Any = None) -> None:
+        self.project_repo = project_repo
+        self.task_repo = task_repo
+        self.version: int = 0
+        self._lock = threading.Lock()
+        # entity key -> version of its last change, negated for tombstones
+        self._stamps: Dict[int, int] = {}
+        # every stamp in version order; superseded ones are skipped and dropped in bulk
+        self._versions: List[int] = []
+        self._keys: List[int] = []
+        # versions up to this one predate an unclean shutdown
+        self.floor: int = 0
+        self._log = log
+        self._compactor: Optional[threading.Thread] = None
+        if log is not None:
+            if not self._replay(log.replay()):
+                self.floor = self.version
+                log.append([_FLOOR, self.floor])
+        self._feed = feed
+        feed.subscribe(self._on_change)
+
+    def _replay(self, records: Iterable[list]) -> bool:
+        """Load stamps from the log; False if it was not shut down cleanly."""
+        clean: bool = True
+        for record in records:
+            clean = record[0] == _CLOSED
+            if record[0] == _CLOSED:
+                continue
+            if record[0] == _FLOOR:
+                self.floor = max(self.floor, record[1])
+                continue
+            if record[0] == _HEADER:
+                self.version = max(self.version, record[1])
+                continue
+            version, key, deleted = record
+            # a journal replayed over its own snapshot repeats older stamps
+            if version > abs(self._stamps.get(key, 0)) and (not self._versions or version > self._versions[-1]):
+                self._stamp(key, version, bool(deleted))
+            self.version = max(self.version, version)
+        return clean
+
+    def _stamp(self, key: int, version: int, deleted: bool) -> None:
+        self._stamps[key] = -version if deleted else version
+        self._versions.append(version)
+        self._keys.append(key)
+
+    def _on_change(self, change: Change) -> None:
+        with self._lock:
+            self.version += 1
+            key = _key(change.entity, change.id)
+            deleted: bool = change.after is None
+            self._stamp(key, self.version, deleted)
+            if len(self._keys) > 2 * len(self._stamps) + 1024:
+                self._versions, self._keys = self._live()
+            if self._log is not None:
+                self._log.append([self.version, key, int(deleted)])
+                # called under the feed lock, so the snapshot is written elsewhere
+                if self._compactor is None and self._log.needs_compaction():
+                    self._compactor = threading.Thread(target = self._compact, name = "todolist-versions", daemon = True)
+                    self._compactor.start()
+
+    def _live(self) -> Tuple[List[int], List[int]]:
+        stamps = self._stamps
+        live = [(v, k) for v, k in zip(self._versions, self._keys) if abs(stamps[k]) == v]
+        return [v for v, _ in live], [k for _, k in live]
+
+    def _compact(self) -> None:
+        def state() -> List[list]:
+            with self._lock:
+                return list(self._records())
+
+        try:
+            self._log.compact_live(state)
+        finally:
+            with self._lock:
+                self._compactor = None
+
+    def _records(self) -> Iterator[list]:
+        yield [_HEADER, self.version]
+        if self.floor:
+            yield [_FLOOR, self.floor]
+        stamps = self._stamps
+        for version, key in zip(*self._live()):
+            yield [version, key, int(stamps[key] < 0)]
+
+    def version_of(self, entity: str, entity_id: int) -> int:
+        """Version of the last change to an entity, 0 if it has not changed since tracking began."""
+        with self._lock:
+            return abs(self._stamps.get(_key(entity, entity_id), 0))
+
+    def changes_since(self, version: int, entity: Optional[str] = None) -> List[Versioned]:
+        """Entities (of kind ``entity``, if given) changed after ``version``, oldest change first.
+
+        ``changes_since(0)`` instead lists every stored entity in store order,
+        followed by the tombstones. Raises ValueError for a version the store
+        has not reached, e.g. after the store was reset, and for one reached
+        before an unclean shutdown; the caller should start over from
+        version 0.
+        """
+        if version < 0:
+            raise ValueError("Version cannot be negative.")
+        with self._lock:
+            if version > self.version:
+                raise ValueError(f"Version {version} is ahead of the store, which is at version {self.version}.")
+            if 0 < version <= self.floor:
+                raise ValueError(f"Version {version} predates an unclean shutdown at version {self.floor}; start over from version 0.")
+            if version == 0:
+                stamps = dict(self._stamps)
+            else:
+                start = bisect_right(self._versions, version)
+                changed = [
+                    (v, key)
+                    for v, key in zip(self._versions[start:], self._keys[start:])
+                    if abs(self._stamps[key]) == v
+                ]
+                deleted = [self._stamps[key] < 0 for _, key in changed]
+        if version == 0:
+            return self._everything(stamps, entity)
+        result: List[Versioned] = []
+        for (v, key), gone in zip(changed, deleted):
+            kind, entity_id = _entity(key)
+            if entity is not None and kind != entity:
+                continue
+            item = None if gone else self._get(kind, entity_id)
+            result.append(Versioned(kind, entity_id, v, item))
+        return result
+
+    def _get(self, entity: str, entity_id: int) -> Any:
+        if entity == PROJECT:
+            return self.project_repo.get_by_id(entity_id)
+        return self.task_repo.get_by_id(entity_id)
+
+    def _everything(self, stamps: Dict[int, int], entity: Optional[str]) -> List[Versioned]:
+        """Every stored entity with its version, then the tombstones by version."""
+        result: List[Versioned] = []
+        for project in self.project_repo.list_all_projects():
+            if entity != TASK:
+                result.append(Versioned(PROJECT, project.id, stamps.get(_key(PROJECT, project.id), 0), project))
+            if entity != PROJECT:
+                result.extend(Versioned(TASK, task.id, stamps.get(task.id * 2 + 1, 0), task) for task in self.task_repo.list_by_project(project.id))
+        tombstones = sorted((-v, key) for key, v in stamps.items() if v < 0)
+        for v, key in tombstones:
+            kind, entity_id = _entity(key)
+            if entity is None or kind == entity:
+                result.append(Versioned(kind, entity_id, v, None))
+        return result
+
+    def close(self) -> None:
+        self._feed.unsubscribe(self._on_change)
+        if self._log is not None:
+            with self._lock:
+                compactor = self._compactor
+            if compactor is not None:
+                compactor.join()
+            self._log.append([_CLOSED, self.version])
+            self._log.close()
@@ -0,0 +1,277 @@
+"""Name and description rules of projects and tasks, compiled from ``Settings``.
+
+A ``Validator`` takes its limits from one ``Settings`` instance, so limits
+loaded from the environment hold in every layer; ``validator_for`` compiles
+one per settings object and reuses it. Services check each object once:
+``check_project``/``check_task`` validate the fields, ``build_project``/
+``build_task`` then construct without running the domain ``__post_init__``
+again, and ``edit_project``/``edit_task`` check only the fields they change.
+
+Domain objects constructed directly still validate, against the validator
+of the ``Settings`` class defaults (``default_validator``); code honouring
+loaded limits goes through a service or ``validator_for``.
+
+``project_records`` and ``task_records`` check a whole import batch in one
+pass, returning the parsed rows that passed and a ``RowError`` per row that
+did not. The record helpers (``Record``, ``RowError``, ``text``,
+``parse_status``, ``parse_deadline``) live here, below the services.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from todolist.config.settings import Settings
+from todolist.core.domain.status import TaskStatus
+
+if TYPE_CHECKING:
+    from todolist.core.domain.project import Project
+    from todolist.core.domain.task import Task
+
+_NOT_AN_OBJECT = "Row is not an object."
+
+Record = Mapping[str, Any]
+
+
+@dataclass
+class RowError:
+    """A record rejected by a bulk operation; ``row`` is 1-based."""
+
+    row: int
+    message: str
+
+
+def text(record: Record, key: str) -> str:
+    value = record.get(key)
+    return "" if value is None else str(value)
+
+
+def parse_status(value: Any) -> TaskStatus:
+    if isinstance(value, TaskStatus):
+        return value
+    if value is None:
+        return TaskStatus.TODO
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid status: {value!r}; expected text.")
+    return TaskStatus.from_string(value) if value else TaskStatus.TODO
+
+
+def parse_deadline(value: Any) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid deadline: {value!r}; expected YYYY-MM-DD.")
+    value = value.strip()
+    return date.fromisoformat(value) if value else None
+
+
+def _not_an_object(record: Any) -> str:
+    # readers pass on the error of a row they could not decode
+    return f"Row is not valid JSON: {record}" if isinstance(record, ValueError) else _NOT_AN_OBJECT
+
+
+class ProjectFields(NamedTuple):
+    name: str
+    description: str
+
+
+class TaskFields(NamedTuple):
+    project: str
+    name: str
+    description: str
+    status: TaskStatus
+    deadline: Optional[date]
+
+
+def _is_number(value: str) -> bool:
+    try:
+        int(value)
+        return True
+    except (ValueError, TypeError):
+        return False
+
+
+def _copy(obj: Any, changes: dict) -> Any:
+    clone = object.__new__(type(obj))
+    clone.__dict__.update(obj.__dict__)
+    clone.__dict__.update(changes)
+    return clone
+
+
+class Validator:
+    """Checks for one ``Settings``; limits and messages are prepared up front."""
+
+    def __init__(self, settings: Settings) -> None:
+        # imported here: the domain modules import this one
+        from todolist.core.domain.project import Project
+        from todolist.core.domain.task import Task
+
+        self._project = Project
+        self._task = Task
+        self.max_name_len: int = settings.MAX_NAME_LEN
+        self.max_description_len: int = settings.MAX_DESCRIPTION_LEN
+        self._long_name = {
+            kind: f"Length of {kind.lower()} name cannot be more than {self.max_name_len} characters."
+            for kind in ("Project", "Task")
+        }
+        self._long_description = {
+            kind: f"Length of {kind.lower()} description cannot be more than {self.max_description_len} characters."
+            for kind in ("Project", "Task")
+        }
+        # exact status spellings, so import rows rarely need TaskStatus.from_string
+        self._statuses = {status.value: status for status in TaskStatus}
+        self._statuses[""] = self._statuses[None] = TaskStatus.TODO
+
+    def _name_error(self, kind: str, name: str) -> Optional[str]:
+        if not name or name.isspace():
+            return f"{kind} name cannot be empty."
+        if len(name) > self.max_name_len:
+            return self._long_name[kind]
+        return None
+
+    def _description_error(self, kind: str, description: str) -> Optional[str]:
+        if len(description) > self.max_description_len:
+            return self._long_description[kind]
+        return None
+
+    def _project_name_error(self, name: str) -> Optional[str]:
+        message = self._name_error("Project", name)
+        if message is None and _is_number(name):
+            # names and ids are both accepted wherever a project is looked up
+            return "Project name cannot be just numbers."
+        return message
+
+    def project_error(self, name: str, description: str) -> Optional[str]:
+        """The first rule ``name`` and ``description`` break, or None."""
+        return self._project_name_error(name) or self._description_error("Project", description)
+
+    def task_error(self, name: str, description: str) -> Optional[str]:
+        return self._name_error("Task", name) or self._description_error("Task", description)
+
+    def check_project(self, name: str, description: str = "") -> None:
+        message = self.project_error(name, description)
+        if message is not None:
+            raise ValueError(message)
+
+    def check_task(self, name: str, description: str = "") -> None:
+        message = self.task_error(name, description)
+        if message is not None:
+            raise ValueError(message)
+
+    def build_project(self, id: int, name: str, description: str = "") -> Project:
+        """Construct a project from fields that passed ``check_project``."""
+        project = object.__new__(self._project)
+        project.id = id
+        project.name = name
+        project.description = description
+        return project
+
+    def build_task(
+        self,
+        id: int,
+        project_id: int,
+        name: str,
+        description: str = "",
+        status: TaskStatus = TaskStatus.TODO,
+        deadline: Optional[date] = None,
+    ) -> Task:
+        """Construct a task from fields that passed ``check_task``."""
+        task = object.__new__(self._task)
+        task.id = id
+        task.project_id = project_id
+        task.name = name
+        task.description = description
+        task.status = status
+        task.deadline = deadline
+        return task
+
+    def edit_project(self, project: Project, **changes: Any) -> Project:
+        """Copy of ``project`` with ``changes`` applied, checking only the changed fields."""
+        if "name" in changes:
+            message = self._project_name_error(changes["name"])
+            if message is not None:
+                raise ValueError(message)
+        if "description" in changes:
+            message = self._description_error("Project", changes["description"])
+            if message is not None:
+                raise ValueError(message)
+        return _copy(project, changes)
+
+    def edit_task(self, task: Task, **changes: Any) -> Task:
+        """Copy of ``task`` with ``changes`` applied, checking only the changed fields."""
+        if "name" in changes:
+            message = self._name_error("Task", changes["name"])
+            if message is not None:
+                raise ValueError(message)
+        if "description" in changes:
+            message = self._description_error("Task", changes["description"])
+            if message is not None:
+                raise ValueError(message)
+        return _copy(task, changes)
+
+    def project_records(self, batch: Iterable[Tuple[int, Record]]) -> Tuple[List[Tuple[int, ProjectFields]], List[RowError]]:
+        """Split numbered import records ("name", "description") into valid fields and row errors."""
+        valid: List[Tuple[int, ProjectFields]] = []
+        errors: List[RowError] = []
+        for row, record in batch:
+            if not isinstance(record, Mapping):
+                errors.append(RowError(row, _not_an_object(record)))
+                continue
+            fields = ProjectFields(text(record, "name"), text(record, "description"))
+            message = self.project_error(fields.name, fields.description)
+            if message is None:
+                valid.append((row, fields))
+            else:
+                errors.append(RowError(row, message))
+        return valid, errors
+
+    def task_records(self, batch: Iterable[Tuple[int, Record]]) -> Tuple[List[Tuple[int, TaskFields]], List[RowError]]:
+        """Split numbered import records into valid fields and row errors.
+
+        Records hold "project", "name", "description", "status" and
+        "deadline"; status and deadline are parsed here. Whether the project
+        exists is left to the caller.
+        """
+        valid: List[Tuple[int, TaskFields]] = []
+        errors: List[RowError] = []
+        statuses = self._statuses
+        max_name_len, max_description_len = self.max_name_len, self.max_description_len
+        for row, record in batch:
+            if not isinstance(record, Mapping):
+                errors.append(RowError(row, _not_an_object(record)))
+                continue
+            name: str = text(record, "name")
+            description: str = text(record, "description")
+            message: Optional[str] = None
+            if not name or name.isspace() or len(name) > max_name_len or len(description) > max_description_len:
+                message = self.task_error(name, description)
+            if message is None:
+                try:
+                    value = record.get("status")
+                    status = statuses.get(value) if isinstance(value, str) or value is None else None
+                    if status is None:
+                        status = parse_status(value)
+                    deadline = parse_deadline(record.get("deadline"))
+                except ValueError as exc:
+                    message = str(exc)
+            if message is None:
+                valid.append((row, TaskFields(text(record, "project").strip(), name, description, status, deadline)))
+            else:
+                errors.append(RowError(row, message))
+        return valid, errors
+
+
+@lru_cache(maxsize = None)
+def validator_for(settings: Settings) -> Validator:
+    """The validator of ``settings``, compiled on first use."""
+    return Validator(settings)
+
+
+_DEFAULTS = Settings()
+
+
+def default_validator() -> Validator:
+    """The validator of the ``Settings`` class defaults, which domain constructors check against."""
+    return validator_for(_DEFAULTS)
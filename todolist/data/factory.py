@@ -0,0 +1,94 @@
+"""Builds the repository pair selected by ``Settings.STORAGE_BACKEND``."""
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from todolist.config.settings import Settings
+from todolist.core.repositories.project_repository import ProjectRepository
+from todolist.core.repositories.task_repository import TaskRepository
+
+if TYPE_CHECKING:
+    from todolist.core.repositories.change_feed import ChangeFeed
+    from todolist.data.journal import Journal
+
+
+def create_repositories(
+    settings: Settings,
+    *,
+    thread_safe: bool = False,
+    feed: Optional[ChangeFeed] = None,
+) -> Tuple[ProjectRepository, TaskRepository]:
+    """``thread_safe`` asks for repositories that may be shared between threads.
+
+    With ``CACHE_SIZE`` set, both repositories are wrapped in read-through caches.
+    With ``feed``, their writes are published to it.
+    """
+    project_repo, task_repo = _create_backend(settings, thread_safe)
+    if settings.CACHE_SIZE > 0:
+        from todolist.data.repositories.caching_repository import CachingProjectRepository, CachingTaskRepository
+
+        project_repo = CachingProjectRepository(project_repo, capacity = settings.CACHE_SIZE)
+        task_repo = CachingTaskRepository(task_repo, capacity = settings.CACHE_SIZE)
+    if feed is not None:
+        from todolist.data.repositories.feed_repository import FeedProjectRepository, FeedTaskRepository
+
+        project_repo = FeedProjectRepository(project_repo, feed)
+        task_repo = FeedTaskRepository(task_repo, feed)
+    return project_repo, task_repo
+
+
+def create_version_log(settings: Settings) -> Optional[Journal]:
+    """Journal keeping store versions across restarts, for backends that persist data."""
+    if settings.STORAGE_BACKEND not in ("journal", "sqlite", "snapshot"):
+        return None
+    from todolist.data.journal import Journal
+
+    return Journal(settings.DATA_DIR, "versions")
+
+
+def _create_backend(settings: Settings, thread_safe: bool) -> Tuple[ProjectRepository, TaskRepository]:
+    backend: str = settings.STORAGE_BACKEND
+    if thread_safe and backend in ("journal", "snapshot"):
+        raise ValueError(f"Storage backend {backend!r} cannot be shared between threads.")
+    if backend == "memory" and thread_safe:
+        from todolist.data.repositories.thread_safe_project_repository import ThreadSafeProjectRepository
+        from todolist.data.repositories.thread_safe_task_repository import ThreadSafeTaskRepository
+
+        return ThreadSafeProjectRepository(), ThreadSafeTaskRepository(compact = settings.COMPACT_TASKS)
+    if backend == "memory":
+        from todolist.data.repositories.in_memory_project_repository import InMemoryProjectRepository
+        from todolist.data.repositories.in_memory_task_repository import InMemoryTaskRepository
+
+        return InMemoryProjectRepository(), InMemoryTaskRepository(compact = settings.COMPACT_TASKS)
+    if backend == "journal":
+        from todolist.data.journal import Journal
+        from todolist.data.repositories.journal_project_repository import JournalProjectRepository
+        from todolist.data.repositories.journal_task_repository import JournalTaskRepository
+
+        return (
+            JournalProjectRepository(Journal(settings.DATA_DIR, "projects")),
+            JournalTaskRepository(Journal(settings.DATA_DIR, "tasks"), compact = settings.COMPACT_TASKS),
+        )
+    if backend == "sqlite":
+        from todolist.data.sqlite import SqliteDatabase
+        from todolist.data.repositories.sqlite_project_repository import SqliteProjectRepository
+        from todolist.data.repositories.sqlite_task_repository import SqliteTaskRepository
+
+        db = SqliteDatabase(os.path.join(settings.DATA_DIR, "todolist.db"))
+        return SqliteProjectRepository(db), SqliteTaskRepository(db)
+    if backend == "snapshot":
+        from todolist.data.snapshot import SnapshotStore
+        from todolist.data.repositories.snapshot_project_repository import SnapshotProjectRepository
+        from todolist.data.repositories.snapshot_task_repository import SnapshotTaskRepository
+
+        store = SnapshotStore(os.path.join(settings.DATA_DIR, "todolist.snap"))
+        return SnapshotProjectRepository(store), SnapshotTaskRepository(store)
+    if backend == "sharded":
+        from todolist.data.sharding import ShardPool
+        from todolist.data.repositories.sharded_project_repository import ShardedProjectRepository
+        from todolist.data.repositories.sharded_task_repository import ShardedTaskRepository
+
+        pool = ShardPool(settings.SHARDS or os.cpu_count() or 1, compact = settings.COMPACT_TASKS)
+        return ShardedProjectRepository(pool), ShardedTaskRepository(pool)
+    raise ValueError(f"Unknown storage backend: {backend!r}.")
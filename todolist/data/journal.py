@@ -0,0 +1,246 @@
+"""Append-only journal with group commit and snapshot compaction.
+
+Each repository mutation is appended as one compact JSON line and handed to
+the operating system at once, so killing the process loses nothing that was
+appended. Writes are fsynced in groups (every ``group_size`` records or
+``group_interval`` seconds, whichever comes first; a timer syncs a group left
+open that long) instead of once per record, so an OS crash or power loss can
+lose at most the last unsynced group. Once the journal grows past ``compact_after`` records
+the owning repository writes a snapshot of its live state and the journal is
+truncated, which keeps replay time proportional to the data, not its history.
+``compact_live`` does the same while appends go on, carrying the records
+appended meanwhile over into the new journal.
+
+Replaying is idempotent: if a crash happens after a snapshot is installed but
+before the journal is truncated, re-applying the old journal on top of the
+snapshot yields the same state.
+
+Records appended inside ``batch()`` are written together as a single line, so
+a torn write drops the whole batch rather than part of it.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import IO, Callable, Iterable, Iterator, List, Optional
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+_READ_CHUNK = 1 << 20
+# tag of a line holding the records of one batch; repositories never use it
+_BATCH = "b"
+
+
+class Journal:
+    """Durable record log backing a single repository."""
+
+    def __init__(
+        self,
+        directory: str,
+        name: str,
+        *,
+        group_size: int = 512,
+        group_interval: float = 0.05,
+        compact_after: int = 250_000,
+    ) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._log_path = os.path.join(directory, f"{name}.journal")
+        self._snapshot_path = os.path.join(directory, f"{name}.snapshot")
+        self.group_size = max(1, group_size)
+        self.group_interval = group_interval
+        self.compact_after = max(1, compact_after)
+        self.records_since_snapshot: int = 0
+        self._file: Optional[IO[str]] = None
+        self._pending: int = 0
+        self._last_sync: float = time.monotonic()
+        self._batch: Optional[List[list]] = None
+        # the timer syncs from its own thread
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        # lines appended while compact_live writes a snapshot, and their record count
+        self._carried: Optional[List[str]] = None
+        self._carried_count: int = 0
+
+    def replay(self) -> Iterator[list]:
+        """Yield snapshot records followed by journal records, oldest first."""
+        yield from self._read(self._snapshot_path, truncate_tail=False)
+        self.records_since_snapshot = 0
+        for record in self._read(self._log_path, truncate_tail=True):
+            if record[0] == _BATCH:
+                self.records_since_snapshot += len(record[1])
+                yield from record[1]
+            else:
+                self.records_since_snapshot += 1
+                yield record
+
+    def append(self, record: list) -> None:
+        if self._batch is not None:
+            self._batch.append(record)
+            return
+        self._write(record, 1)
+
+    def _write(self, record: list, count: int) -> None:
+        with self._lock:
+            if self._file is None:
+                self._file = open(self._log_path, "a", encoding="utf-8")
+            line = _ENCODER.encode(record) + "\n"
+            self._file.write(line)
+            self._file.flush()
+            if self._carried is not None:
+                self._carried.append(line)
+                self._carried_count += count
+            self._pending += 1
+            self.records_since_snapshot += count
+            if self._pending >= self.group_size or time.monotonic() - self._last_sync >= self.group_interval:
+                self._sync()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.group_interval, self.sync)
+                self._timer.daemon = True
+                self._timer.start()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Hold back records appended in the block and write them as one line.
+
+        Nothing is written if the block raises. Blocks nest; the outermost one
+        writes.
+        """
+        if self._batch is not None:
+            yield
+            return
+        self._batch = []
+        try:
+            yield
+        except BaseException:
+            self._batch = None
+            raise
+        records, self._batch = self._batch, None
+        if len(records) == 1:
+            self._write(records[0], 1)
+        elif records:
+            self._write([_BATCH, records], len(records))
+
+    def sync(self) -> None:
+        """Force pending records to stable storage."""
+        with self._lock:
+            self._sync()
+
+    def _sync(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._file is not None and self._pending:
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def needs_compaction(self) -> bool:
+        # a snapshot taken mid-batch would persist records that may still be dropped
+        return self._batch is None and self.records_since_snapshot >= self.compact_after
+
+    def compact(self, records: Iterable[list]) -> None:
+        """Replace snapshot and journal with ``records`` describing the live state."""
+        with self._lock:
+            self._compact(records)
+
+    def compact_live(self, state: Callable[[], Iterable[list]]) -> None:
+        """Compact without holding up appends while the snapshot is written.
+
+        ``state()`` is called once the records appended from then on are
+        being kept; it returns the live state, which may already include some
+        of them. Those records are carried over into the new journal, so
+        replay must be idempotent. One compaction may run at a time.
+        """
+        with self._lock:
+            self._carried, self._carried_count = [], 0
+        try:
+            tmp_path = self._write_snapshot(state())
+            with self._lock:
+                self._install(tmp_path, self._carried, self._carried_count)
+        finally:
+            self._carried = None
+
+    def _compact(self, records: Iterable[list]) -> None:
+        self._install(self._write_snapshot(records), [], 0)
+
+    def _write_snapshot(self, records: Iterable[list]) -> str:
+        tmp_path = self._snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            fh.writelines(_ENCODER.encode(record) + "\n" for record in records)
+            fh.flush()
+            os.fsync(fh.fileno())
+        return tmp_path
+
+    def _install(self, tmp_path: str, carried: List[str], count: int) -> None:
+        # the new journal is complete before it replaces the old one; until
+        # then the old journal replays over the new snapshot
+        log_tmp_path = self._log_path + ".tmp"
+        with open(log_tmp_path, "w", encoding="utf-8") as fh:
+            fh.writelines(carried)
+            fh.flush()
+            os.fsync(fh.fileno())
+        if self._file is not None:
+            self._file.close()
+        os.replace(tmp_path, self._snapshot_path)
+        os.replace(log_tmp_path, self._log_path)
+        self._fsync_directory()
+        self._file = open(self._log_path, "a", encoding="utf-8")
+        self._pending = 0
+        self._sync()
+        self.records_since_snapshot = count
+
+    def close(self) -> None:
+        with self._lock:
+            self._sync()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _read(self, path: str, *, truncate_tail: bool) -> Iterator[list]:
+        if not os.path.exists(path):
+            return
+        good_offset: int = 0
+        with open(path, "rb") as fh:
+            while True:
+                chunk: List[bytes] = fh.readlines(_READ_CHUNK)
+                if not chunk:
+                    break
+                try:
+                    if not chunk[-1].endswith(b"\n"):
+                        raise ValueError("torn record")
+                    # One parser call per chunk is much cheaper than one per line
+                    records: List[list] = json.loads(b"[" + b",".join(chunk) + b"]")
+                except ValueError:
+                    records = []
+                    for line in chunk:
+                        if not line.endswith(b"\n"):
+                            break
+                        try:
+                            records.append(json.loads(line))
+                        except ValueError:
+                            break
+                        good_offset += len(line)
+                    yield from records
+                    break
+                good_offset += sum(map(len, chunk))
+                yield from records
+            end_offset = fh.seek(0, os.SEEK_END)
+        # Drop a torn final write so later appends start on a clean line
+        if truncate_tail and good_offset < end_offset:
+            with open(path, "r+b") as fh:
+                fh.truncate(good_offset)
+
+    def _fsync_directory(self) -> None:
+        try:
+            fd = os.open(self._directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
@@ -0,0 +1,47 @@
+"""Compact record encoding of domain objects shared by persistent backends.
+
+Records are plain lists so they serialize cheaply to JSON and back. Decoding
+skips ``__post_init__`` validation: records are only ever written from objects
+that were already validated when they entered a repository.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import List, Sequence
+
+from todolist.core.domain.project import Project
+from todolist.core.domain.status import TaskStatus
+from todolist.core.domain.task import Task
+
+STATUSES = (TaskStatus.TODO, TaskStatus.DOING, TaskStatus.DONE)
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+
+def task_to_record(task: Task) -> List:
+    deadline: int = task.deadline.toordinal() if task.deadline else 0
+    return [task.id, task.project_id, task.name, task.description, STATUS_CODES[task.status], deadline]
+
+
+def task_from_record(record: Sequence) -> Task:
+    task_id, project_id, name, description, status, deadline = record
+    task = object.__new__(Task)
+    task.id = task_id
+    task.project_id = project_id
+    task.name = name
+    task.description = description
+    task.status = STATUSES[status]
+    task.deadline = date.fromordinal(deadline) if deadline else None
+    return task
+
+
+def project_to_record(project: Project) -> List:
+    return [project.id, project.name, project.description]
+
+
+def project_from_record(record: Sequence) -> Project:
+    project_id, name, description = record
+    project = object.__new__(Project)
+    project.id = project_id
+    project.name = name
+    project.description = description
+    return project
@@ -0,0 +1,289 @@
+"""Read-through LRU caches in front of any project or task repository.
+
+``get_by_id`` answers from a bounded LRU cache, and ``get_by_name`` resolves
+names through a second one mapping lower-cased names to ids. Writes go
+straight to the wrapped repository and drop the entries they touch. A
+cached name is checked against the project it points to, so a rename or
+delete can never resolve a stale name. Misses are not cached.
+
+The cache only sees writes made through the wrapper. Another process
+writing to the same database would go unnoticed, which is why the factory
+leaves caching off unless ``CACHE_SIZE`` is set. Cached objects are shared
+between callers and must not be mutated; store an edited copy instead.
+Hit, miss and eviction counters are read with ``repo.by_id.stats()`` and
+``repo.by_name.stats()``.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Hashable, Iterable, Iterator, List, Optional
+
+from todolist.core.domain.project import Project
+from todolist.core.domain.stats import ProjectStats
+from todolist.core.domain.task import Task
+from todolist.core.repositories.project_repository import ProjectRepository
+from todolist.core.repositories.task_query import TaskQuery
+from todolist.core.repositories.task_repository import TaskRepository
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters of one cache since it was created."""
+
+    size: int
+    capacity: int
+    hits: int
+    misses: int
+    evictions: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LruCache:
+    """Thread-safe bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, capacity)
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        # bumped by every invalidation; a value read before one is not stored
+        self.version: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, version: int) -> None:
+        """Store ``value`` unless the cache was invalidated since ``version`` was read."""
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last = False)
+                self.evictions += 1
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            self.version += 1
+            self._entries.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[Any], bool]) -> None:
+        with self._lock:
+            self.version += 1
+            for key in [k for k, v in self._entries.items() if predicate(v)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(len(self._entries), self.capacity, self.hits, self.misses, self.evictions)
+
+
+class CachingProjectRepository(ProjectRepository):
+    """``ProjectRepository`` caching lookups by id and by name."""
+
+    def __init__(self, repo: ProjectRepository, *, capacity: int = 1024) -> None:
+        self.repo = repo
+        self.by_id = LruCache(capacity)
+        self.by_name = LruCache(capacity)
+
+    @property
+    def rolls_back(self) -> bool:
+        return self.repo.rolls_back
+
+    def _forget(self, project_id: int) -> None:
+        # names are checked on lookup, so only the id entry has to go
+        self.by_id.discard(project_id)
+
+    def next_available_id(self) -> int:
+        return self.repo.next_available_id()
+
+    def add(self, project: Project) -> Project:
+        try:
+            return self.repo.add(project)
+        finally:
+            self._forget(project.id)
+
+    def add_if_unique(self, project: Project, max_projects: Optional[int] = None) -> Project:
+        try:
+            return self.repo.add_if_unique(project, max_projects)
+        finally:
+            self._forget(project.id)
+
+    def update(self, project: Project) -> Project:
+        try:
+            return self.repo.update(project)
+        finally:
+            self._forget(project.id)
+
+    def update_if_unique(self, project: Project) -> Project:
+        try:
+            return self.repo.update_if_unique(project)
+        finally:
+            self._forget(project.id)
+
+    def remove(self, project_id: int) -> bool:
+        try:
+            return self.repo.remove(project_id)
+        finally:
+            self._forget(project_id)
+
+    def get_by_id(self, project_id: int) -> Optional[Project]:
+        project = self.by_id.get(project_id)
+        if project is None:
+            version: int = self.by_id.version
+            project = self.repo.get_by_id(project_id)
+            if project is not None:
+                self.by_id.put(project_id, project, version)
+        return project
+
+    def get_by_name(self, project_name: str) -> Optional[Project]:
+        key: str = project_name.lower()
+        project_id = self.by_name.get(key)
+        if project_id is not None:
+            project = self.get_by_id(project_id)
+            if project is not None and project.name.lower() == key:
+                return project
+        version: int = self.by_name.version
+        project = self.repo.get_by_name(project_name)
+        if project is not None:
+            self.by_name.put(key, project.id, version)
+        return project
+
+    def list_all_projects(self) -> Iterable[Project]:
+        return self.repo.list_all_projects()
+
+    def page_projects(self, after_id: int = 0, limit: int = 100) -> List[Project]:
+        return self.repo.page_projects(after_id, limit)
+
+    def count(self) -> int:
+        return self.repo.count()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        try:
+            with self.repo.batch():
+                yield
+        except BaseException:
+            # the block may have cached writes that the backend has now rolled back
+            self.by_id.clear()
+            raise
+
+    def close(self) -> None:
+        self.repo.close()
+
+
+class CachingTaskRepository(TaskRepository):
+    """``TaskRepository`` caching lookups by id."""
+
+    def __init__(self, repo: TaskRepository, *, capacity: int = 4096) -> None:
+        self.repo = repo
+        self.by_id = LruCache(capacity)
+
+    @property
+    def rolls_back(self) -> bool:
+        return self.repo.rolls_back
+
+    def next_available_id(self) -> int:
+        return self.repo.next_available_id()
+
+    def add(self, task: Task) -> Task:
+        try:
+            return self.repo.add(task)
+        finally:
+            self.by_id.discard(task.id)
+
+    def add_if_under_limit(self, task: Task, max_tasks: int) -> Task:
+        try:
+            return self.repo.add_if_under_limit(task, max_tasks)
+        finally:
+            self.by_id.discard(task.id)
+
+    def update(self, task: Task) -> Task:
+        try:
+            return self.repo.update(task)
+        finally:
+            self.by_id.discard(task.id)
+
+    def remove(self, task_id: int) -> bool:
+        try:
+            return self.repo.remove(task_id)
+        finally:
+            self.by_id.discard(task_id)
+
+    def remove_by_project(self, project_id: int) -> int:
+        try:
+            return self.repo.remove_by_project(project_id)
+        finally:
+            self.by_id.discard_where(lambda task: task.project_id == project_id)
+
+    def pop_by_project(self, project_id: int, limit: int) -> List[Task]:
+        try:
+            tasks = self.repo.pop_by_project(project_id, limit)
+        except BaseException:
+            self.by_id.discard_where(lambda task: task.project_id == project_id)
+            raise
+        for task in tasks:
+            self.by_id.discard(task.id)
+        return tasks
+
+    def get_by_id(self, task_id: int) -> Optional[Task]:
+        task = self.by_id.get(task_id)
+        if task is None:
+            version: int = self.by_id.version
+            task = self.repo.get_by_id(task_id)
+            if task is not None:
+                self.by_id.put(task_id, task, version)
+        return task
+
+    def list_by_project(self, project_id: int) -> Iterable[Task]:
+        return self.repo.list_by_project(project_id)
+
+    def page_by_project(self, project_id: int, after_id: int = 0, limit: int = 100) -> List[Task]:
+        return self.repo.page_by_project(project_id, after_id, limit)
+
+    def find(self, query: TaskQuery) -> List[Task]:
+        return self.repo.find(query)
+
+    def project_ids(self) -> Iterable[int]:
+        return self.repo.project_ids()
+
+    def count_by_project(self, project_id: int) -> int:
+        return self.repo.count_by_project(project_id)
+
+    def stats_by_project(self, project_id: int, today: Optional[date] = None) -> ProjectStats:
+        return self.repo.stats_by_project(project_id, today)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        try:
+            with self.repo.batch():
+                yield
+        except BaseException:
+            self.by_id.clear()
+            raise
+
+    def close(self) -> None:
+        self.repo.close()
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from todolist.core.domain.status import TaskStatus
+from todolist.core.domain.task import Task
+from todolist.data.records import STATUS_CODES, STATUSES, task_from_record
+
+_MISSING = object()
+
+
+class ColumnarTaskStore:
+    """Struct-of-arrays task storage used by the compact in-memory mode.
+
+    Each stored task owns one row of the columns: project ids and deadline
+    ordinals live in typed arrays, statuses in a byte array and
+    names/descriptions as plain string lists, so no per-task ``Task`` or
+    ``date`` object is kept (a slots dataclass would still cost one object
+    per task, plus its ``date``). Task ids map to rows through ``_rows``;
+    rows stay dense whatever the ids are, since removing a task moves the
+    last row into its place. Descriptions are interned since they repeat
+    often (empty ones especially); names are mostly unique and an intern
+    table entry would cost more than it saves. Reads hand out fresh
+    ``Task`` views; edits made to a view only reach the store through
+    ``__setitem__`` (i.e. the repository's ``update``).
+
+    Implements the subset of the ``dict`` interface used by
+    ``InMemoryTaskRepository``.
+    """
+
+    def __init__(self) -> None:
+        # task id -> row, and row -> task id
+        self._rows: Dict[int, int] = {}
+        self._ids = array("q")
+        self._project_ids = array("q")
+        self._deadlines = array("i")
+        self._statuses = bytearray()
+        self._names: List[str] = []
+        self._descriptions: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._rows
+
+    def _view(self, task_id: int, row: int) -> Task:
+        return task_from_record((
+            task_id, self._project_ids[row], self._names[row],
+            self._descriptions[row], self._statuses[row], self._deadlines[row],
+        ))
+
+    def __getitem__(self, task_id: int) -> Task:
+        return self._view(task_id, self._rows[task_id])
+
+    def get(self, task_id: int, default: Optional[Task] = None) -> Optional[Task]:
+        row = self._rows.get(task_id)
+        return default if row is None else self._view(task_id, row)
+
+    def state(self, task_id: int) -> Optional[Tuple[int, TaskStatus, int]]:
+        """(project id, status, deadline ordinal) of a stored task without building a view."""
+        row = self._rows.get(task_id)
+        if row is None:
+            return None
+        return (self._project_ids[row], STATUSES[self._statuses[row]], self._deadlines[row])
+
+    def __setitem__(self, task_id: int, task: Task) -> None:
+        deadline: int = task.deadline.toordinal() if task.deadline else 0
+        row = self._rows.get(task_id)
+        if row is None:
+            self._rows[task_id] = len(self._ids)
+            self._ids.append(task_id)
+            self._project_ids.append(task.project_id)
+            self._deadlines.append(deadline)
+            self._statuses.append(STATUS_CODES[task.status])
+            self._names.append(task.name)
+            self._descriptions.append(sys.intern(task.description))
+            return
+        self._project_ids[row] = task.project_id
+        self._deadlines[row] = deadline
+        self._statuses[row] = STATUS_CODES[task.status]
+        self._names[row] = task.name
+        self._descriptions[row] = sys.intern(task.description)
+
+    def pop(self, task_id: int, default=_MISSING):
+        row = self._rows.pop(task_id, None)
+        if row is None:
+            if default is _MISSING:
+                raise KeyError(task_id)
+            return default
+        task = self._view(task_id, row)
+        # fill the hole with the last row so the columns stay dense
+        last: int = len(self._ids) - 1
+        if row != last:
+            moved: int = self._ids[last]
+            self._rows[moved] = row
+            self._ids[row] = moved
+            self._project_ids[row] = self._project_ids[last]
+            self._deadlines[row] = self._deadlines[last]
+            self._statuses[row] = self._statuses[last]
+            self._names[row] = self._names[last]
+            self._descriptions[row] = self._descriptions[last]
+        self._ids.pop()
+        self._project_ids.pop()
+        self._deadlines.pop()
+        self._statuses.pop()
+        self._names.pop()
+        self._descriptions.pop()
+        return task
+
+    def keys(self) -> Iterator[int]:
+        return iter(self._rows)
+
+    __iter__ = keys
+
+    def values(self) -> Iterator[Task]:
+        return (self._view(task_id, row) for task_id, row in self._rows.items())
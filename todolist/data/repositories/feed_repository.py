@@ -0,0 +1,189 @@
+"""Repositories publishing their writes to a ``ChangeFeed``.
+
+The wrappers work with any backend. Each write runs inside the feed's
+``writing()``, holding the stripe of the entity it names (or every stripe,
+for the cascades), and publishes once the wrapped repository has accepted
+it; a write that raises publishes nothing. The feed lock itself is taken
+only to publish. Updates read the stored version first to work out which
+fields changed (none, if the caller edited the stored object in place),
+and ``remove_by_project`` lists the project's tasks first to publish one
+``CASCADE_DELETED`` change per task, as ``pop_by_project`` does for the
+tasks it removes. Reads go straight through.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import date
+from typing import Iterable, Iterator, List, Optional
+
+from todolist.core.domain.project import Project
+from todolist.core.domain.stats import ProjectStats
+from todolist.core.domain.task import Task
+from todolist.core.repositories.change_feed import PROJECT, TASK, ChangeFeed, ChangeKind, diff
+from todolist.core.repositories.project_repository import ProjectRepository
+from todolist.core.repositories.task_query import TaskQuery
+from todolist.core.repositories.task_repository import TaskRepository
+
+
+class FeedProjectRepository(ProjectRepository):
+    """``ProjectRepository`` publishing creations, updates and deletions."""
+
+    def __init__(self, repo: ProjectRepository, feed: ChangeFeed) -> None:
+        self.repo = repo
+        self.feed = feed
+
+    @property
+    def rolls_back(self) -> bool:
+        return self.repo.rolls_back
+
+    def next_available_id(self) -> int:
+        return self.repo.next_available_id()
+
+    def add(self, project: Project) -> Project:
+        with self.feed.writing(PROJECT, project.id):
+            project = self.repo.add(project)
+            self.feed.emit(ChangeKind.CREATED, PROJECT, project.id, after = project)
+            return project
+
+    def add_if_unique(self, project: Project, max_projects: Optional[int] = None) -> Project:
+        with self.feed.writing(PROJECT, project.id):
+            project = self.repo.add_if_unique(project, max_projects)
+            self.feed.emit(ChangeKind.CREATED, PROJECT, project.id, after = project)
+            return project
+
+    def _updated(self, before: Optional[Project], project: Project) -> None:
+        fields = diff(before, project) if before is not None else {}
+        self.feed.emit(ChangeKind.UPDATED, PROJECT, project.id, before = before, after = project, fields = fields)
+
+    def update(self, project: Project) -> Project:
+        with self.feed.writing(PROJECT, project.id):
+            before = self.repo.get_by_id(project.id)
+            project = self.repo.update(project)
+            self._updated(before, project)
+            return project
+
+    def update_if_unique(self, project: Project) -> Project:
+        with self.feed.writing(PROJECT, project.id):
+            before = self.repo.get_by_id(project.id)
+            project = self.repo.update_if_unique(project)
+            self._updated(before, project)
+            return project
+
+    def remove(self, project_id: int) -> bool:
+        with self.feed.writing(PROJECT, project_id):
+            before = self.repo.get_by_id(project_id)
+            removed: bool = self.repo.remove(project_id)
+            if removed:
+                self.feed.emit(ChangeKind.DELETED, PROJECT, project_id, before = before)
+            return removed
+
+    def get_by_id(self, project_id: int) -> Optional[Project]:
+        return self.repo.get_by_id(project_id)
+
+    def get_by_name(self, project_name: str) -> Optional[Project]:
+        return self.repo.get_by_name(project_name)
+
+    def list_all_projects(self) -> Iterable[Project]:
+        return self.repo.list_all_projects()
+
+    def page_projects(self, after_id: int = 0, limit: int = 100) -> List[Project]:
+        return self.repo.page_projects(after_id, limit)
+
+    def count(self) -> int:
+        return self.repo.count()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        # the feed batch is outermost, so nothing is published before the backend commits
+        with self.feed.batch(), self.repo.batch():
+            yield
+
+    def close(self) -> None:
+        self.repo.close()
+
+
+class FeedTaskRepository(TaskRepository):
+    """``TaskRepository`` publishing creations, updates and (cascade) deletions."""
+
+    def __init__(self, repo: TaskRepository, feed: ChangeFeed) -> None:
+        self.repo = repo
+        self.feed = feed
+
+    @property
+    def rolls_back(self) -> bool:
+        return self.repo.rolls_back
+
+    def next_available_id(self) -> int:
+        return self.repo.next_available_id()
+
+    def add(self, task: Task) -> Task:
+        with self.feed.writing(TASK, task.id):
+            task = self.repo.add(task)
+            self.feed.emit(ChangeKind.CREATED, TASK, task.id, after = task)
+            return task
+
+    def add_if_under_limit(self, task: Task, max_tasks: int) -> Task:
+        with self.feed.writing(TASK, task.id):
+            task = self.repo.add_if_under_limit(task, max_tasks)
+            self.feed.emit(ChangeKind.CREATED, TASK, task.id, after = task)
+            return task
+
+    def update(self, task: Task) -> Task:
+        with self.feed.writing(TASK, task.id):
+            before = self.repo.get_by_id(task.id)
+            task = self.repo.update(task)
+            fields = diff(before, task) if before is not None else {}
+            self.feed.emit(ChangeKind.UPDATED, TASK, task.id, before = before, after = task, fields = fields)
+            return task
+
+    def remove(self, task_id: int) -> bool:
+        with self.feed.writing(TASK, task_id):
+            before = self.repo.get_by_id(task_id)
+            removed: bool = self.repo.remove(task_id)
+            if removed:
+                self.feed.emit(ChangeKind.DELETED, TASK, task_id, before = before)
+            return removed
+
+    def remove_by_project(self, project_id: int) -> int:
+        with self.feed.writing(TASK):
+            tasks = list(self.repo.list_by_project(project_id))
+            removed: int = self.repo.remove_by_project(project_id)
+            for task in tasks:
+                self.feed.emit(ChangeKind.CASCADE_DELETED, TASK, task.id, before = task)
+            return removed
+
+    def pop_by_project(self, project_id: int, limit: int) -> List[Task]:
+        with self.feed.writing(TASK):
+            tasks = self.repo.pop_by_project(project_id, limit)
+            for task in tasks:
+                self.feed.emit(ChangeKind.CASCADE_DELETED, TASK, task.id, before = task)
+            return tasks
+
+    def get_by_id(self, task_id: int) -> Optional[Task]:
+        return self.repo.get_by_id(task_id)
+
+    def list_by_project(self, project_id: int) -> Iterable[Task]:
+        return self.repo.list_by_project(project_id)
+
+    def page_by_project(self, project_id: int, after_id: int = 0, limit: int = 100) -> List[Task]:
+        return self.repo.page_by_project(project_id, after_id, limit)
+
+    def find(self, query: TaskQuery) -> List[Task]:
+        return self.repo.find(query)
+
+    def project_ids(self) -> Iterable[int]:
+        return self.repo.project_ids()
+
+    def count_by_project(self, project_id: int) -> int:
+        return self.repo.count_by_project(project_id)
+
+    def stats_by_project(self, project_id: int, today: Optional[date] = None) -> ProjectStats:
+        return self.repo.stats_by_project(project_id, today)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        with self.feed.batch(), self.repo.batch():
+            yield
+
+    def close(self) -> None:
+        self.repo.close()
@@ -13,6 +13,11 @@ class InMemoryProjectRepository(ProjectRepository):
         self._name_index: Dict[str, int] = {}
         self._next_available_id: int = 1
         
+    def _load(self, projects: Iterable[Project]) -> None:
+        """Replace the repository contents in bulk, rebuilding indexes once."""
+        self._projects = {project.id: project for project in projects}
+        self._name_index = {project.name.lower(): project.id for project in self._projects.values()}
+        
     def next_available_id(self) -> int:
         new_id = self._next_available_id
         self._next_available_id += 1
@@ -43,9 +48,17 @@ class InMemoryProjectRepository(ProjectRepository):
     def list_all_projects(self) -> Iterable[Project]:
         return list(self._projects.values())
     
+    def count(self) -> int:
+        return len(self._projects)
+    
     def update(self, project: Project) -> Project:
-        if project.id not in self._projects:
+        previous = self._projects.get(project.id)
+        if previous is None:
             raise ValueError("Project not found.")
+        # drop the old name when a renamed copy replaces the stored project
+        lowered_name = previous.name.lower()
+        if lowered_name != project.name.lower() and self._name_index.get(lowered_name) == project.id:
+            self._name_index.pop(lowered_name)
         self._projects[project.id] = project
         self._name_index[project.name.lower()] = project.id
         return project
\ No newline at end of file
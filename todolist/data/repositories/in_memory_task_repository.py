@@ -1,17 +1,98 @@
 from __future__ import annotations
 
+from bisect import bisect_right
 from collections import defaultdict
+from datetime import date
+from itertools import islice
 from typing import DefaultDict, Dict, List, Iterable, Optional
 
+from todolist.core.domain.stats import ProjectStats
 from todolist.core.domain.task import Task
+from todolist.core.repositories.task_query import TaskQuery
 from todolist.core.repositories.task_repository import TaskRepository
+from todolist.data.repositories.columnar_task_store import ColumnarTaskStore
+from todolist.data.repositories.task_query_index import TaskQueryIndex
+from todolist.data.repositories.task_stats_index import TaskState, TaskStatsIndex, task_state
 
 class InMemoryTaskRepository(TaskRepository):
+    """Dictionary-backed task repository.
+
+    With ``compact=True`` tasks are kept in a ``ColumnarTaskStore`` instead of
+    as ``Task`` objects, trading a view allocation per read for a much smaller
+    per-task footprint. Tasks read in compact mode are detached copies: edits
+    take effect once passed to ``update``.
+    """
     
-    def __init__(self) -> None:
-        self._tasks: Dict[int, Task] = {}
-        self._by_project_id: DefaultDict[int, List[int]] = defaultdict(list)
+    def __init__(self, compact: bool = False) -> None:
+        self._compact: bool = compact
+        self._tasks = ColumnarTaskStore() if compact else {}
+        # last indexed state per task; the columnar store keeps it in its columns
+        self._states: Dict[int, TaskState] = {}
+        # project id -> task ids; dicts double as insertion-ordered sets
+        self._by_project_id: DefaultDict[int, Dict[int, None]] = defaultdict(dict)
+        # ascending ids per project for keyset pages: extended in place when a new id
+        # is the largest, dropped on any other change
+        self._sorted_ids: Dict[int, List[int]] = {}
         self._next_available_id: int = 1
+        self._stats = TaskStatsIndex()
+        self._query_index = TaskQueryIndex()
+        
+    def _load(self, tasks: Iterable[Task]) -> None:
+        """Replace the repository contents in bulk, rebuilding indexes once."""
+        self._tasks = ColumnarTaskStore() if self._compact else {}
+        self._states = {}
+        self._by_project_id = defaultdict(dict)
+        self._sorted_ids = {}
+        for task in tasks:
+            self._tasks[task.id] = task
+            if not self._compact:
+                self._states[task.id] = task_state(task)
+            self._by_project_id[task.project_id][task.id] = None
+        items = [(task_id, self._state_of(task_id)) for task_id in self._tasks.keys()]
+        self._stats.load(state for _, state in items)
+        self._query_index.load(items)
+        
+    def _state_of(self, task_id: int) -> Optional[TaskState]:
+        if self._compact:
+            return self._tasks.state(task_id)
+        return self._states.get(task_id)
+    
+    def _place(self, task_id: int, previous: Optional[TaskState], project_id: int) -> None:
+        """Keep ``task_id`` listed under ``project_id`` only."""
+        if previous is not None and previous[0] != project_id:
+            self._unlist(task_id, previous[0])
+        ids = self._by_project_id[project_id]
+        if task_id not in ids:
+            ids[task_id] = None
+            sorted_ids = self._sorted_ids.get(project_id)
+            if sorted_ids is not None:
+                if not sorted_ids or task_id > sorted_ids[-1]:
+                    sorted_ids.append(task_id)
+                else:
+                    del self._sorted_ids[project_id]
+    
+    def _unlist(self, task_id: int, project_id: int) -> None:
+        ids = self._by_project_id.get(project_id)
+        if ids is not None and task_id in ids:
+            del ids[task_id]
+            self._sorted_ids.pop(project_id, None)
+            if not ids:
+                del self._by_project_id[project_id]
+    
+    def _reindex(self, task_id: int, previous: Optional[TaskState], current: Optional[TaskState]) -> None:
+        if previous == current:
+            return
+        if previous is not None:
+            self._stats.discard(previous)
+            self._query_index.discard(task_id, previous)
+        if current is not None:
+            self._stats.add(current)
+            self._query_index.add(task_id, current)
+        if not self._compact:
+            if current is None:
+                self._states.pop(task_id, None)
+            else:
+                self._states[task_id] = current
         
     def next_available_id(self) -> int:
         new_id: int = self._next_available_id
@@ -19,41 +100,91 @@ class InMemoryTaskRepository(TaskRepository):
         return new_id
     
     def add(self, task: Task) -> Task:
+        previous = self._state_of(task.id)
         self._tasks[task.id] = task
-        if task.id not in self._by_project_id[task.project_id]:
-            self._by_project_id[task.project_id].append(task.id)
+        self._place(task.id, previous, task.project_id)
+        self._reindex(task.id, previous, task_state(task))
         return task
     
     def remove(self, task_id: int) -> bool:
+        previous = self._state_of(task_id)
         task = self._tasks.pop(task_id, None)
         if task is None:
             return False
-        
-        if task_id in self._by_project_id.get(task.project_id, []):
-            self._by_project_id[task.project_id] = [i for i in self._by_project_id[task.project_id] if i != task_id]
+        self._reindex(task_id, previous, None)
+        self._unlist(task_id, task.project_id)
         return True
     
     def get_by_id(self, task_id: int) -> Optional[Task]:
         return self._tasks.get(task_id, None)
     
+    def project_ids(self) -> Iterable[int]:
+        return [project_id for project_id, task_ids in self._by_project_id.items() if task_ids]
+
     def list_by_project(self, project_id: int) -> Iterable[Task]:
-        ids: list = self._by_project_id.get(project_id, [])
+        ids = self._by_project_id.get(project_id, ())
         return [self._tasks[i] for i in ids]
     
+    def page_by_project(self, project_id: int, after_id: int = 0, limit: int = 100) -> List[Task]:
+        ids = self._sorted_ids.get(project_id)
+        if ids is None:
+            ids = self._sorted_ids[project_id] = sorted(self._by_project_id.get(project_id, ()))
+        start = bisect_right(ids, after_id)
+        return [self._tasks[i] for i in ids[start:start + limit]]
+    
     def remove_by_project(self, project_id: int) -> int:
-        ids: list = self._by_project_id.get(project_id, [])        
-        count: int = 0
+        ids = self._by_project_id.pop(project_id, {})
+        self._sorted_ids.pop(project_id, None)
         for i in ids:
+            previous = self._state_of(i)
             self._tasks.pop(i, None)
-            count += 1
-        self._by_project_id.pop(project_id, None)
-        return count        
+            self._reindex(i, previous, None)
+        return len(ids)
+    
+    def pop_by_project(self, project_id: int, limit: int) -> List[Task]:
+        # oldest first, without the sort a page needs after every removal
+        ids = list(islice(self._by_project_id.get(project_id, ()), limit))
+        tasks = [self._tasks[i] for i in ids]
+        for i in ids:
+            self.remove(i)
+        return tasks
         
     def update(self, task: Task) -> Task:
         if task.id not in self._tasks:
             raise ValueError("Task not found.")
-        # ensure project index contains id
-        if task.id not in self._by_project_id[task.project_id]:
-            self._by_project_id[task.project_id].append(task.id)
+        previous = self._state_of(task.id)
         self._tasks[task.id] = task
-        return task
\ No newline at end of file
+        self._place(task.id, previous, task.project_id)
+        self._reindex(task.id, previous, task_state(task))
+        return task
+    
+    def find(self, query: TaskQuery) -> List[Task]:
+        # Plan: drive the scan from the most selective available index
+        plans = [(len(self._tasks), "scan")]
+        if query.project_id is not None:
+            plans.append((self._stats.count(query.project_id), "project"))
+        if query.statuses is not None:
+            plans.append((self._query_index.status_size(query), "status"))
+        if query.has_deadline_range:
+            plans.append((self._query_index.deadline_size(query), "deadline"))
+        _, plan = min(plans)
+        
+        if plan == "deadline":
+            matches = (t for t in map(self._tasks.__getitem__, self._query_index.iter_deadline(query)) if query.matches(t))
+            if query.order_by == "deadline":
+                # the index already yields tasks in (deadline, id) order
+                return list(islice(matches, query.limit))
+            return query.order(matches)
+        if plan == "project":
+            candidates = map(self._tasks.__getitem__, self._by_project_id.get(query.project_id, ()))
+        elif plan == "status":
+            candidates = map(self._tasks.__getitem__, self._query_index.iter_status(query))
+        else:
+            candidates = iter(self._tasks.values())
+        return query.order(t for t in candidates if query.matches(t))
+    
+    def count_by_project(self, project_id: int) -> int:
+        return self._stats.count(project_id)
+    
+    def stats_by_project(self, project_id: int, today: Optional[date] = None) -> ProjectStats:
+        return self._stats.stats(project_id, today)
\ No newline at end of file
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import ContextManager, Dict, Iterator
+
+from todolist.core.domain.project import Project
+from todolist.data.journal import Journal
+from todolist.data.records import project_from_record, project_to_record
+from todolist.data.repositories.in_memory_project_repository import InMemoryProjectRepository
+
+# Journal record tags
+_HEADER, _ADD, _UPDATE, _REMOVE = "h", "a", "u", "r"
+
+
+class JournalProjectRepository(InMemoryProjectRepository):
+    """Project repository kept in memory and persisted through an append-only journal.
+
+    The journal is compacted in ``close()`` once it has grown past its
+    threshold, never on a write.
+    """
+
+    def __init__(self, journal: Journal) -> None:
+        super().__init__()
+        self._journal = journal
+        self._replay()
+
+    def _replay(self) -> None:
+        projects: Dict[int, Project] = {}
+        next_id: int = 1
+        for record in self._journal.replay():
+            op = record[0]
+            if op == _ADD or op == _UPDATE:
+                project = project_from_record(record[1:])
+                projects[project.id] = project
+                next_id = max(next_id, project.id + 1)
+            elif op == _REMOVE:
+                projects.pop(record[1], None)
+                next_id = max(next_id, record[1] + 1)
+            elif op == _HEADER:
+                next_id = max(next_id, record[1])
+        self._load(projects.values())
+        self._next_available_id = next_id
+
+    def _snapshot(self) -> Iterator[list]:
+        yield [_HEADER, self._next_available_id]
+        for project in self._projects.values():
+            yield [_ADD, *project_to_record(project)]
+
+    def _log(self, record: list) -> None:
+        self._journal.append(record)
+
+    def add(self, project: Project) -> Project:
+        project = super().add(project)
+        self._log([_ADD, *project_to_record(project)])
+        return project
+
+    def remove(self, project_id: int) -> bool:
+        removed: bool = super().remove(project_id)
+        if removed:
+            self._log([_REMOVE, project_id])
+        return removed
+
+    def update(self, project: Project) -> Project:
+        project = super().update(project)
+        self._log([_UPDATE, *project_to_record(project)])
+        return project
+
+    def batch(self) -> ContextManager[None]:
+        return self._journal.batch()
+
+    def close(self) -> None:
+        if self._journal.needs_compaction():
+            self._journal.compact(self._snapshot())
+        self._journal.close()
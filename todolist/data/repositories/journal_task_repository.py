@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import ContextManager, DefaultDict, Dict, Iterator
+
+from todolist.core.domain.task import Task
+from todolist.data.journal import Journal
+from todolist.data.records import task_from_record, task_to_record
+from todolist.data.repositories.in_memory_task_repository import InMemoryTaskRepository
+
+# Journal record tags
+_HEADER, _ADD, _UPDATE, _REMOVE, _REMOVE_PROJECT = "h", "a", "u", "r", "p"
+
+
+class JournalTaskRepository(InMemoryTaskRepository):
+    """Task repository kept in memory and persisted through an append-only journal.
+
+    State is rebuilt by replaying the journal on construction; every mutation
+    is appended after it has been applied in memory. The journal is compacted
+    in ``close()`` once it has grown past its threshold, never on a write.
+    """
+
+    def __init__(self, journal: Journal, *, compact: bool = False) -> None:
+        super().__init__(compact = compact)
+        self._journal = journal
+        self._replay()
+
+    def _replay(self) -> None:
+        # Fold the log into its final state first, then build indexes once
+        tasks: Dict[int, Task] = {}
+        # project id -> task ids, so a project removal touches only its own tasks
+        by_project: DefaultDict[int, Dict[int, None]] = defaultdict(dict)
+        next_id: int = 1
+        for record in self._journal.replay():
+            op = record[0]
+            if op == _ADD or op == _UPDATE:
+                task = task_from_record(record[1:])
+                previous = tasks.get(task.id)
+                if previous is not None and previous.project_id != task.project_id:
+                    by_project[previous.project_id].pop(task.id, None)
+                tasks[task.id] = task
+                by_project[task.project_id][task.id] = None
+                next_id = max(next_id, task.id + 1)
+            elif op == _REMOVE:
+                task = tasks.pop(record[1], None)
+                if task is not None:
+                    by_project[task.project_id].pop(task.id, None)
+                next_id = max(next_id, record[1] + 1)
+            elif op == _REMOVE_PROJECT:
+                for task_id in by_project.pop(record[1], {}):
+                    del tasks[task_id]
+            elif op == _HEADER:
+                next_id = max(next_id, record[1])
+        self._load(tasks.values())
+        self._next_available_id = next_id
+
+    def _snapshot(self) -> Iterator[list]:
+        yield [_HEADER, self._next_available_id]
+        for task in self._tasks.values():
+            yield [_ADD, *task_to_record(task)]
+
+    def _log(self, record: list) -> None:
+        self._journal.append(record)
+
+    def add(self, task: Task) -> Task:
+        task = super().add(task)
+        self._log([_ADD, *task_to_record(task)])
+        return task
+
+    def remove(self, task_id: int) -> bool:
+        removed: bool = super().remove(task_id)
+        if removed:
+            self._log([_REMOVE, task_id])
+        return removed
+
+    def remove_by_project(self, project_id: int) -> int:
+        count: int = super().remove_by_project(project_id)
+        if count:
+            self._log([_REMOVE_PROJECT, project_id])
+        return count
+
+    def update(self, task: Task) -> Task:
+        task = super().update(task)
+        self._log([_UPDATE, *task_to_record(task)])
+        return task
+
+    def batch(self) -> ContextManager[None]:
+        return self._journal.batch()
+
+    def close(self) -> None:
+        if self._journal.needs_compaction():
+            self._journal.compact(self._snapshot())
+        self._journal.close()
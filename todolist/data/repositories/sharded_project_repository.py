@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+from heapq import nsmallest
+from typing import Iterable, List, Optional
+
+from todolist.core.domain.project import Project
+from todolist.core.repositories.project_repository import ProjectRepository
+from todolist.data.records import project_from_record, project_to_record
+from todolist.data.sharding import IdBlocks, ShardPool
+
+
+class ShardedProjectRepository(ProjectRepository):
+    """Projects spread over the worker processes of a ``ShardPool`` by id.
+
+    Lookups by id go to one shard; lookups by name, listings and counts ask
+    every shard at once. The name and limit checks of ``add_if_unique`` and
+    ``update_if_unique`` are atomic among callers sharing this repository.
+    """
+
+    def __init__(self, pool: ShardPool) -> None:
+        self._pool = pool
+        self._ids = IdBlocks(pool, "project")
+        self._lock = threading.Lock()
+
+    def next_available_id(self) -> int:
+        return self._ids.next()
+
+    def add(self, project: Project) -> Project:
+        self._pool.call(self._pool.shard_of(project.id), "project.add", project_to_record(project))
+        return project
+
+    def add_if_unique(self, project: Project, max_projects: Optional[int] = None) -> Project:
+        with self._lock:
+            answers = self._pool.call_all("project.check", project.name)
+            for record, _ in answers:
+                if record is not None and record[0] != project.id:
+                    raise ValueError("Project name must be unique.")
+            if max_projects is not None and sum(count for _, count in answers) >= max_projects:
+                raise ValueError("You have reached maximum number of projects.")
+            return self.add(project)
+
+    def update_if_unique(self, project: Project) -> Project:
+        with self._lock:
+            return super().update_if_unique(project)
+
+    def remove(self, project_id: int) -> bool:
+        return self._pool.call(self._pool.shard_of(project_id), "project.remove", project_id)
+
+    def get_by_id(self, project_id: int) -> Optional[Project]:
+        record = self._pool.call(self._pool.shard_of(project_id), "project.get", project_id)
+        return project_from_record(record) if record is not None else None
+
+    def get_by_name(self, project_name: str) -> Optional[Project]:
+        for record in self._pool.call_all("project.by_name", project_name):
+            if record is not None:
+                return project_from_record(record)
+        return None
+
+    def list_all_projects(self) -> Iterable[Project]:
+        records = [record for answer in self._pool.call_all("project.all") for record in answer]
+        records.sort(key = lambda record: record[0])
+        return [project_from_record(record) for record in records]
+
+    def page_projects(self, after_id: int = 0, limit: int = 100) -> List[Project]:
+        records = [record for answer in self._pool.call_all("project.page", after_id, limit) for record in answer]
+        return [project_from_record(record) for record in nsmallest(limit, records, key = lambda record: record[0])]
+
+    def count(self) -> int:
+        return sum(self._pool.call_all("project.count"))
+
+    def update(self, project: Project) -> Project:
+        self._pool.call(self._pool.shard_of(project.id), "project.update", project_to_record(project))
+        return project
+
+    def close(self) -> None:
+        self._pool.close()
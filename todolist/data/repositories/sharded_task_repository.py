@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import threading
+from datetime import date
+from typing import Iterable, List, Optional
+
+from todolist.core.domain.stats import ProjectStats
+from todolist.core.domain.task import Task
+from todolist.core.repositories.task_query import TaskQuery
+from todolist.core.repositories.task_repository import TaskRepository
+from todolist.data.records import task_from_record, task_to_record
+from todolist.data.sharding import IdBlocks, ShardPool
+
+
+class ShardedTaskRepository(TaskRepository):
+    """Tasks kept on the shard of their project.
+
+    Calls naming a project go to its shard, including the atomic limit check
+    of ``add_if_under_limit``. Calls naming a task find its shard in a table
+    indexed by task id, one byte per id, filled in as tasks are added; a task
+    missing from it is looked up on every shard. ``find`` without a project
+    runs on every shard at once and merges the ordered, limited answers.
+    """
+
+    def __init__(self, pool: ShardPool) -> None:
+        self._pool = pool
+        self._ids = IdBlocks(pool, "task")
+        self._lock = threading.Lock()
+        # task id -> shard + 1; 0 where unknown
+        self._shard_of_task = bytearray()
+
+    def _remember(self, task_id: int, shard: Optional[int]) -> None:
+        with self._lock:
+            table = self._shard_of_task
+            if task_id >= len(table):
+                table.extend(bytes(max(task_id + 1 - len(table), len(table))))
+            table[task_id] = 0 if shard is None else shard + 1
+
+    def _locate(self, task_id: int) -> Optional[int]:
+        """The shard holding ``task_id``, asking every shard if it is not in the table."""
+        table = self._shard_of_task
+        if 0 <= task_id < len(table) and table[task_id]:
+            return table[task_id] - 1
+        for shard, record in enumerate(self._pool.call_all("task.get", task_id)):
+            if record is not None:
+                self._remember(task_id, shard)
+                return shard
+        return None
+
+    def next_available_id(self) -> int:
+        return self._ids.next()
+
+    def add(self, task: Task) -> Task:
+        shard = self._pool.shard_of(task.project_id)
+        self._pool.call(shard, "task.add", task_to_record(task))
+        self._remember(task.id, shard)
+        return task
+
+    def add_if_under_limit(self, task: Task, max_tasks: int) -> Task:
+        shard = self._pool.shard_of(task.project_id)
+        self._pool.call(shard, "task.add_if_under_limit", task_to_record(task), max_tasks)
+        self._remember(task.id, shard)
+        return task
+
+    def remove(self, task_id: int) -> bool:
+        shard = self._locate(task_id)
+        if shard is None:
+            return False
+        removed: bool = self._pool.call(shard, "task.remove", task_id)
+        self._remember(task_id, None)
+        return removed
+
+    def get_by_id(self, task_id: int) -> Optional[Task]:
+        shard = self._locate(task_id)
+        if shard is None:
+            return None
+        record = self._pool.call(shard, "task.get", task_id)
+        return task_from_record(record) if record is not None else None
+
+    def list_by_project(self, project_id: int) -> Iterable[Task]:
+        records = self._pool.call(self._pool.shard_of(project_id), "task.by_project", project_id)
+        return [task_from_record(record) for record in records]
+
+    def page_by_project(self, project_id: int, after_id: int = 0, limit: int = 100) -> List[Task]:
+        records = self._pool.call(self._pool.shard_of(project_id), "task.page", project_id, after_id, limit)
+        return [task_from_record(record) for record in records]
+
+    def remove_by_project(self, project_id: int) -> int:
+        # table entries of the removed tasks stay; their shard just answers None
+        return self._pool.call(self._pool.shard_of(project_id), "task.remove_by_project", project_id)
+
+    def pop_by_project(self, project_id: int, limit: int) -> List[Task]:
+        records = self._pool.call(self._pool.shard_of(project_id), "task.pop_by_project", project_id, limit)
+        return [task_from_record(record) for record in records]
+
+    def update(self, task: Task) -> Task:
+        shard = self._pool.shard_of(task.project_id)
+        current = self._locate(task.id)
+        if current is None:
+            raise ValueError("Task not found.")
+        if current == shard:
+            self._pool.call(shard, "task.update", task_to_record(task))
+        else:
+            # moved to a project on another shard
+            self._pool.call(shard, "task.add", task_to_record(task))
+            self._pool.call(current, "task.remove", task.id)
+            self._remember(task.id, shard)
+        return task
+
+    def find(self, query: TaskQuery) -> List[Task]:
+        if query.project_id is not None:
+            records = self._pool.call(self._pool.shard_of(query.project_id), "task.find", query)
+            return [task_from_record(record) for record in records]
+        # each shard answers its own first ``limit`` tasks in order; merging those is enough
+        answers = self._pool.call_all("task.find", query)
+        return query.order(task_from_record(record) for answer in answers for record in answer)
+
+    def project_ids(self) -> Iterable[int]:
+        return [project_id for answer in self._pool.call_all("task.project_ids") for project_id in answer]
+
+    def count_by_project(self, project_id: int) -> int:
+        return self._pool.call(self._pool.shard_of(project_id), "task.count", project_id)
+
+    def stats_by_project(self, project_id: int, today: Optional[date] = None) -> ProjectStats:
+        return self._pool.call(self._pool.shard_of(project_id), "task.stats", project_id, today)
+
+    def close(self) -> None:
+        self._pool.close()
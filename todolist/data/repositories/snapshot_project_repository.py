@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from typing import ContextManager, Dict, Iterable, List, Optional, Set
+
+from todolist.core.domain.project import Project
+from todolist.core.repositories.project_repository import ProjectRepository
+from todolist.data.records import project_from_record, project_to_record
+from todolist.data.snapshot import SnapshotStore
+
+# Journal record tags
+_ADD, _REMOVE = "a", "r"
+
+
+class SnapshotProjectRepository(ProjectRepository):
+    """Project repository reading lazily from a memory-mapped snapshot."""
+
+    def __init__(self, store: SnapshotStore) -> None:
+        self._store = store
+        store.project_repo = self
+        self.reset()
+        self._replaying: bool = True
+        for record in store.project_log.replay():
+            if record[0] == _ADD:
+                self.add(project_from_record(record[1:]))
+            elif record[0] == _REMOVE:
+                self.remove(record[1])
+        self._replaying = False
+
+    def _log(self, record: list) -> None:
+        if not self._replaying:
+            self._store.project_log.append(record)
+
+    def reset(self) -> None:
+        """Drop the overlay; called once its contents are part of the snapshot."""
+        snapshot = self._store.snapshot
+        self._overlay: Dict[int, Project] = {}
+        self._hidden: Set[int] = set()
+        # built on first name lookup so opening stays independent of size
+        self._name_index: Optional[Dict[str, int]] = None
+        self._next_available_id: int = snapshot.next_project_id if snapshot else 1
+
+    def _base_project(self, project_id: int) -> Optional[Project]:
+        snapshot = self._store.snapshot
+        if snapshot is None or project_id in self._hidden:
+            return None
+        row = snapshot.project_row(project_id)
+        return snapshot.project_at(row) if row is not None else None
+
+    def _names(self) -> Dict[str, int]:
+        if self._name_index is None:
+            self._name_index = {p.name.lower(): p.id for p in self.list_all_projects()}
+        return self._name_index
+
+    def peek_next_id(self) -> int:
+        return self._next_available_id
+
+    def next_available_id(self) -> int:
+        new_id = self._next_available_id
+        self._next_available_id += 1
+        return new_id
+
+    def add(self, project: Project) -> Project:
+        previous = self.get_by_id(project.id)
+        if previous is not None and self._name_index is not None:
+            self._name_index.pop(previous.name.lower(), None)
+        self._hidden.add(project.id)
+        self._overlay[project.id] = project
+        if self._name_index is not None:
+            self._name_index[project.name.lower()] = project.id
+        self._next_available_id = max(self._next_available_id, project.id + 1)
+        self._log([_ADD, *project_to_record(project)])
+        return project
+
+    def remove(self, project_id: int) -> bool:
+        project = self.get_by_id(project_id)
+        if project is None:
+            return False
+        self._overlay.pop(project_id, None)
+        self._hidden.add(project_id)
+        if self._name_index is not None and self._name_index.get(project.name.lower()) == project_id:
+            self._name_index.pop(project.name.lower(), None)
+        self._log([_REMOVE, project_id])
+        return True
+
+    def get_by_id(self, project_id: int) -> Optional[Project]:
+        project = self._overlay.get(project_id)
+        return project if project is not None else self._base_project(project_id)
+
+    def get_by_name(self, project_name: str) -> Optional[Project]:
+        project_id = self._names().get(project_name.lower())
+        return self.get_by_id(project_id) if project_id is not None else None
+
+    def list_all_projects(self) -> Iterable[Project]:
+        snapshot = self._store.snapshot
+        projects: List[Project] = []
+        if snapshot is not None:
+            projects.extend(p for p in snapshot.iter_projects() if p.id not in self._hidden)
+        projects.extend(self._overlay.values())
+        return projects
+
+    def update(self, project: Project) -> Project:
+        if self.get_by_id(project.id) is None:
+            raise ValueError("Project not found.")
+        return self.add(project)
+
+    def batch(self) -> ContextManager[None]:
+        return self._store.project_log.batch()
+
+    def close(self) -> None:
+        self._store.close()
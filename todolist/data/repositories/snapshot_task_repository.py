@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from heapq import merge
+from itertools import islice
+from typing import ContextManager, DefaultDict, Dict, Iterable, Iterator, List, Optional, Set
+
+from todolist.core.domain.task import Task
+from todolist.core.repositories.task_query import TaskQuery
+from todolist.core.repositories.task_repository import TaskRepository
+from todolist.data.records import task_from_record, task_to_record
+from todolist.data.snapshot import SnapshotStore
+
+# Journal record tags
+_ADD, _REMOVE, _REMOVE_PROJECT = "a", "r", "p"
+
+
+class SnapshotTaskRepository(TaskRepository):
+    """Task repository reading lazily from a memory-mapped snapshot.
+
+    Tasks in the snapshot are decoded on access. Changes since the snapshot was
+    saved live in an in-memory overlay, rebuilt from the store's task journal
+    on open, until the store is saved again.
+    """
+
+    def __init__(self, store: SnapshotStore) -> None:
+        self._store = store
+        store.task_repo = self
+        self.reset()
+        self._replaying: bool = True
+        for record in store.task_log.replay():
+            if record[0] == _ADD:
+                self.add(task_from_record(record[1:]))
+            elif record[0] == _REMOVE:
+                self.remove(record[1])
+            elif record[0] == _REMOVE_PROJECT:
+                self.remove_by_project(record[1])
+        self._replaying = False
+
+    def _log(self, record: list) -> None:
+        if not self._replaying:
+            self._store.task_log.append(record)
+
+    def reset(self) -> None:
+        """Drop the overlay; called once its contents are part of the snapshot."""
+        snapshot = self._store.snapshot
+        self._overlay: Dict[int, Task] = {}
+        self._overlay_by_project: DefaultDict[int, Dict[int, None]] = defaultdict(dict)
+        # snapshot task ids that were removed or superseded by the overlay
+        self._hidden: Set[int] = set()
+        self._removed_projects: Set[int] = set()
+        self._next_available_id: int = snapshot.next_task_id if snapshot else 1
+
+    def _base_task(self, task_id: int) -> Optional[Task]:
+        snapshot = self._store.snapshot
+        if snapshot is None or task_id in self._hidden:
+            return None
+        row = snapshot.task_row(task_id)
+        if row is None:
+            return None
+        task = snapshot.task_at(row)
+        return None if task.project_id in self._removed_projects else task
+
+    def _base_ids(self, project_id: int) -> Iterator[int]:
+        snapshot = self._store.snapshot
+        if snapshot is None or project_id in self._removed_projects:
+            return
+        for row in snapshot.task_range(project_id):
+            task_id = snapshot.task_id_at(row)
+            if task_id not in self._hidden:
+                yield task_id
+
+    def peek_next_id(self) -> int:
+        return self._next_available_id
+
+    def next_available_id(self) -> int:
+        new_id: int = self._next_available_id
+        self._next_available_id += 1
+        return new_id
+
+    def add(self, task: Task) -> Task:
+        existing = self._overlay.get(task.id)
+        if existing is not None:
+            self._overlay_by_project[existing.project_id].pop(task.id, None)
+        self._hidden.add(task.id)
+        self._overlay[task.id] = task
+        self._overlay_by_project[task.project_id][task.id] = None
+        self._next_available_id = max(self._next_available_id, task.id + 1)
+        self._log([_ADD, *task_to_record(task)])
+        return task
+
+    def remove(self, task_id: int) -> bool:
+        task = self._overlay.pop(task_id, None)
+        if task is not None:
+            self._overlay_by_project[task.project_id].pop(task_id, None)
+        elif self._base_task(task_id) is None:
+            return False
+        self._hidden.add(task_id)
+        self._log([_REMOVE, task_id])
+        return True
+
+    def get_by_id(self, task_id: int) -> Optional[Task]:
+        task = self._overlay.get(task_id)
+        return task if task is not None else self._base_task(task_id)
+
+    def list_by_project(self, project_id: int) -> Iterable[Task]:
+        snapshot = self._store.snapshot
+        tasks: List[Task] = []
+        if snapshot is not None and project_id not in self._removed_projects:
+            for row in snapshot.task_range(project_id):
+                if snapshot.task_id_at(row) not in self._hidden:
+                    tasks.append(snapshot.task_at(row))
+        tasks.extend(self._overlay[i] for i in self._overlay_by_project.get(project_id, ()))
+        return tasks
+
+    def page_by_project(self, project_id: int, after_id: int = 0, limit: int = 100) -> List[Task]:
+        snapshot = self._store.snapshot
+        base: Iterable[Task] = ()
+        if snapshot is not None and project_id not in self._removed_projects:
+            rows = snapshot.task_range(project_id)
+            # a project's rows are sorted by id: binary search the first one past after_id
+            lo, hi = rows.start, rows.stop
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if snapshot.task_id_at(mid) <= after_id:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            base = (snapshot.task_at(row) for row in range(lo, rows.stop) if snapshot.task_id_at(row) not in self._hidden)
+        overlay_ids = sorted(i for i in self._overlay_by_project.get(project_id, ()) if i > after_id)
+        tasks = merge(base, (self._overlay[i] for i in overlay_ids), key = lambda t: t.id)
+        return list(islice(tasks, limit))
+
+    def count_by_project(self, project_id: int) -> int:
+        # reads task ids only; nothing is decoded
+        return sum(1 for _ in self._base_ids(project_id)) + len(self._overlay_by_project.get(project_id, ()))
+
+    def project_ids(self) -> Iterable[int]:
+        project_ids = {project_id for project_id, task_ids in self._overlay_by_project.items() if task_ids}
+        snapshot = self._store.snapshot
+        if snapshot is not None:
+            project_ids.update(i for i in snapshot.task_project_ids() if i not in self._removed_projects)
+        return project_ids
+
+    def remove_by_project(self, project_id: int) -> int:
+        count: int = sum(1 for _ in self._base_ids(project_id))
+        self._removed_projects.add(project_id)
+        for task_id in self._overlay_by_project.pop(project_id, {}):
+            del self._overlay[task_id]
+            self._hidden.add(task_id)
+            count += 1
+        if count:
+            self._log([_REMOVE_PROJECT, project_id])
+        return count
+
+    def update(self, task: Task) -> Task:
+        if self.get_by_id(task.id) is None:
+            raise ValueError("Task not found.")
+        return self.add(task)
+
+    # no secondary indexes in the snapshot: the default find scans one project's range or iter_all_tasks()
+
+    def iter_all_tasks(self) -> Iterator[Task]:
+        snapshot = self._store.snapshot
+        if snapshot is not None:
+            for row in range(snapshot.task_count):
+                if snapshot.task_id_at(row) in self._hidden:
+                    continue
+                task = snapshot.task_at(row)
+                if task.project_id not in self._removed_projects:
+                    yield task
+        yield from self._overlay.values()
+
+    def batch(self) -> ContextManager[None]:
+        return self._store.task_log.batch()
+
+    def close(self) -> None:
+        self._store.close()
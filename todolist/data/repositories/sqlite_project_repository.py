@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import ContextManager, Iterable, List, Optional
+
+from todolist.core.domain.project import Project
+from todolist.core.repositories.project_repository import ProjectRepository
+from todolist.data.records import project_from_record
+from todolist.data.sqlite import SqliteDatabase
+
+_COLUMNS = "id, name, description"
+_INSERT = "INSERT OR REPLACE INTO projects (id, name, name_lower, description) VALUES (?, ?, ?, ?)"
+_UPDATE = "UPDATE projects SET name = ?, name_lower = ?, description = ? WHERE id = ?"
+_DELETE = "DELETE FROM projects WHERE id = ?"
+_BY_ID = f"SELECT {_COLUMNS} FROM projects WHERE id = ?"
+_BY_NAME = f"SELECT {_COLUMNS} FROM projects WHERE name_lower = ? ORDER BY id DESC LIMIT 1"
+_ALL = f"SELECT {_COLUMNS} FROM projects ORDER BY id"
+_PAGE = f"SELECT {_COLUMNS} FROM projects WHERE id > ? ORDER BY id LIMIT ?"
+_COUNT = "SELECT COUNT(*) FROM projects"
+_MAX_ID = "SELECT COALESCE(MAX(id), 0) FROM projects"
+
+
+class SqliteProjectRepository(ProjectRepository):
+    """SQLite implementation of project repository"""
+
+    def __init__(self, db: SqliteDatabase) -> None:
+        self._db = db
+        self._next_available_id: int = db.query_one(_MAX_ID)[0] + 1
+
+    def next_available_id(self) -> int:
+        with self._db.lock:
+            new_id: int = self._next_available_id
+            self._next_available_id += 1
+            return new_id
+
+    def add(self, project: Project) -> Project:
+        self._db.write(_INSERT, (project.id, project.name, project.name.lower(), project.description))
+        return project
+
+    def add_if_unique(self, project: Project, max_projects: Optional[int] = None) -> Project:
+        # every statement takes the connection lock, so holding it makes check and insert atomic
+        with self._db.lock:
+            return super().add_if_unique(project, max_projects)
+
+    def update_if_unique(self, project: Project) -> Project:
+        with self._db.lock:
+            return super().update_if_unique(project)
+
+    def remove(self, project_id: int) -> bool:
+        return self._db.write(_DELETE, (project_id,)) > 0
+
+    def get_by_id(self, project_id: int) -> Optional[Project]:
+        row = self._db.query_one(_BY_ID, (project_id,))
+        return project_from_record(row) if row else None
+
+    def get_by_name(self, project_name: str) -> Optional[Project]:
+        row = self._db.query_one(_BY_NAME, (project_name.lower(),))
+        return project_from_record(row) if row else None
+
+    def list_all_projects(self) -> Iterable[Project]:
+        return [project_from_record(row) for row in self._db.query(_ALL)]
+
+    def page_projects(self, after_id: int = 0, limit: int = 100) -> List[Project]:
+        return [project_from_record(row) for row in self._db.query(_PAGE, (after_id, limit))]
+
+    def count(self) -> int:
+        return self._db.query_one(_COUNT)[0]
+
+    def update(self, project: Project) -> Project:
+        if self._db.write(_UPDATE, (project.name, project.name.lower(), project.description, project.id)) == 0:
+            raise ValueError("Project not found.")
+        return project
+
+    # the batch is one SQL transaction, so a failed block leaves no trace
+    rolls_back = True
+
+    def batch(self) -> ContextManager[None]:
+        return self._db.transaction()
+
+    def close(self) -> None:
+        self._db.close()
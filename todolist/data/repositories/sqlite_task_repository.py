@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, ContextManager, Iterable, List, Optional
+
+from todolist.core.domain.stats import ProjectStats
+from todolist.core.domain.status import TaskStatus
+from todolist.core.domain.task import Task
+from todolist.core.repositories.task_query import TaskQuery
+from todolist.core.repositories.task_repository import TaskRepository
+from todolist.data.records import STATUS_CODES, STATUSES, task_from_record
+from todolist.data.sqlite import SqliteDatabase
+
+_COLUMNS = "id, project_id, name, description, status, deadline"
+_INSERT = f"INSERT OR REPLACE INTO tasks ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)"
+_UPDATE = "UPDATE tasks SET project_id = ?, name = ?, description = ?, status = ?, deadline = ? WHERE id = ?"
+_DELETE = "DELETE FROM tasks WHERE id = ?"
+_DELETE_BY_PROJECT = "DELETE FROM tasks WHERE project_id = ?"
+_DELETE_PAGE = "DELETE FROM tasks WHERE project_id = ? AND id <= ?"
+_BY_ID = f"SELECT {_COLUMNS} FROM tasks WHERE id = ?"
+_BY_PROJECT = f"SELECT {_COLUMNS} FROM tasks WHERE project_id = ? ORDER BY id"
+_PAGE_BY_PROJECT = f"SELECT {_COLUMNS} FROM tasks WHERE project_id = ? AND id > ? ORDER BY id LIMIT ?"
+_COUNT_BY_PROJECT = "SELECT COUNT(*) FROM tasks WHERE project_id = ?"
+_STATUS_COUNTS = "SELECT status, COUNT(*) FROM tasks WHERE project_id = ? GROUP BY status"
+_OVERDUE = "SELECT COUNT(*) FROM tasks WHERE project_id = ? AND status != ? AND deadline < ?"
+_ORDER_BY = {
+    "id": "id",
+    "-id": "id DESC",
+    "deadline": "deadline IS NULL, deadline, id",
+    "-deadline": "deadline IS NULL, deadline DESC, id",
+}
+_MAX_ID = "SELECT COALESCE(MAX(id), 0) FROM tasks"
+_PROJECT_IDS = "SELECT DISTINCT project_id FROM tasks"
+
+
+def _deadline(task: Task) -> Optional[int]:
+    return task.deadline.toordinal() if task.deadline else None
+
+
+class SqliteTaskRepository(TaskRepository):
+    """SQLite implementation of task repository"""
+
+    def __init__(self, db: SqliteDatabase) -> None:
+        self._db = db
+        self._next_available_id: int = db.query_one(_MAX_ID)[0] + 1
+
+    def next_available_id(self) -> int:
+        with self._db.lock:
+            new_id: int = self._next_available_id
+            self._next_available_id += 1
+            return new_id
+
+    def add(self, task: Task) -> Task:
+        self._db.write(_INSERT, (
+            task.id, task.project_id, task.name, task.description, STATUS_CODES[task.status], _deadline(task)
+        ))
+        return task
+
+    def add_if_under_limit(self, task: Task, max_tasks: int) -> Task:
+        with self._db.lock:
+            return super().add_if_under_limit(task, max_tasks)
+
+    def remove(self, task_id: int) -> bool:
+        return self._db.write(_DELETE, (task_id,)) > 0
+
+    def get_by_id(self, task_id: int) -> Optional[Task]:
+        row = self._db.query_one(_BY_ID, (task_id,))
+        return task_from_record(row) if row else None
+
+    def list_by_project(self, project_id: int) -> Iterable[Task]:
+        return [task_from_record(row) for row in self._db.query(_BY_PROJECT, (project_id,))]
+
+    def page_by_project(self, project_id: int, after_id: int = 0, limit: int = 100) -> List[Task]:
+        # served by the (project_id, id) index
+        return [task_from_record(row) for row in self._db.query(_PAGE_BY_PROJECT, (project_id, after_id, limit))]
+
+    def remove_by_project(self, project_id: int) -> int:
+        return self._db.write(_DELETE_BY_PROJECT, (project_id,))
+
+    def pop_by_project(self, project_id: int, limit: int) -> List[Task]:
+        with self._db.transaction():
+            tasks = self.page_by_project(project_id, 0, limit)
+            if tasks:
+                # the page holds the project's lowest ids, so one range delete removes it
+                self._db.write(_DELETE_PAGE, (project_id, tasks[-1].id))
+            return tasks
+
+    def project_ids(self) -> Iterable[int]:
+        # read from the (project_id, id) index
+        return [row[0] for row in self._db.query(_PROJECT_IDS)]
+
+    def count_by_project(self, project_id: int) -> int:
+        return self._db.query_one(_COUNT_BY_PROJECT, (project_id,))[0]
+
+    def stats_by_project(self, project_id: int, today: Optional[date] = None) -> ProjectStats:
+        today = today or date.today()
+        by_status = dict.fromkeys(TaskStatus, 0)
+        for status, count in self._db.query(_STATUS_COUNTS, (project_id,)):
+            by_status[STATUSES[status]] = count
+        overdue = self._db.query_one(_OVERDUE, (project_id, STATUS_CODES[TaskStatus.DONE], today.toordinal()))[0]
+        return ProjectStats(project_id = project_id, task_count = sum(by_status.values()), by_status = by_status, overdue = overdue)
+
+    def find(self, query: TaskQuery) -> List[Task]:
+        # SQL text only varies with the set of filters, so the statement cache stays small
+        clauses: List[str] = []
+        params: List[Any] = []
+        if query.project_id is not None:
+            clauses.append("project_id = ?")
+            params.append(query.project_id)
+        if query.statuses is not None:
+            codes = sorted(STATUS_CODES[s] for s in query.statuses)
+            clauses.append(f"status IN ({', '.join('?' * len(codes))})")
+            params.extend(codes)
+        if query.due_after is not None:
+            clauses.append("deadline >= ?")
+            params.append(query.due_after.toordinal())
+        if query.due_before is not None:
+            clauses.append("deadline < ?")
+            params.append(query.due_before.toordinal())
+        sql = f"SELECT {_COLUMNS} FROM tasks"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY " + _ORDER_BY[query.order_by]
+        if query.limit is not None:
+            sql += " LIMIT ?"
+            params.append(query.limit)
+        return [task_from_record(row) for row in self._db.query(sql, params)]
+
+    def update(self, task: Task) -> Task:
+        params = (task.project_id, task.name, task.description, STATUS_CODES[task.status], _deadline(task), task.id)
+        if self._db.write(_UPDATE, params) == 0:
+            raise ValueError("Task not found.")
+        return task
+
+    # the batch is one SQL transaction, so a failed block leaves no trace
+    rolls_back = True
+
+    def batch(self) -> ContextManager[None]:
+        return self._db.transaction()
+
+    def close(self) -> None:
+        self._db.close()
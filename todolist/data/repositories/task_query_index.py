@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from todolist.core.domain.status import TaskStatus
+from todolist.core.repositories.task_query import TaskQuery
+from todolist.data.repositories.task_stats_index import TaskState
+
+
+class TaskQueryIndex:
+    """Secondary indexes answering ``TaskQuery`` filters without a full scan.
+
+    Keeps a set of task ids per status, and task ids bucketed by deadline:
+    a sorted id list per deadline ordinal plus the sorted list of ordinals in
+    use. A deadline write shifts only its own day's bucket, and a new list
+    entry is made only for a day no task was due on yet. Like
+    ``TaskStatsIndex`` it is fed the previous and new state of a task by
+    the repository.
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self._by_status: Dict[TaskStatus, Set[int]] = {status: set() for status in TaskStatus}
+        # deadline ordinal -> ascending task ids; ordinals in use, ascending
+        self._by_deadline: Dict[int, List[int]] = {}
+        self._ordinals: List[int] = []
+
+    def load(self, items: Iterable[Tuple[int, TaskState]]) -> None:
+        self.clear()
+        for task_id, (_, status, ordinal) in items:
+            self._by_status[status].add(task_id)
+            if ordinal:
+                self._by_deadline.setdefault(ordinal, []).append(task_id)
+        for bucket in self._by_deadline.values():
+            bucket.sort()
+        self._ordinals = sorted(self._by_deadline)
+
+    def add(self, task_id: int, state: TaskState) -> None:
+        _, status, ordinal = state
+        self._by_status[status].add(task_id)
+        if ordinal:
+            bucket = self._by_deadline.get(ordinal)
+            if bucket is None:
+                self._by_deadline[ordinal] = [task_id]
+                insort(self._ordinals, ordinal)
+            elif task_id > bucket[-1]:
+                bucket.append(task_id)
+            else:
+                insort(bucket, task_id)
+
+    def discard(self, task_id: int, state: TaskState) -> None:
+        _, status, ordinal = state
+        self._by_status[status].discard(task_id)
+        if ordinal:
+            bucket = self._by_deadline[ordinal]
+            del bucket[bisect_left(bucket, task_id)]
+            if not bucket:
+                del self._by_deadline[ordinal]
+                del self._ordinals[bisect_left(self._ordinals, ordinal)]
+
+    def status_size(self, query: TaskQuery) -> int:
+        return sum(len(self._by_status[status]) for status in query.statuses)
+
+    def iter_status(self, query: TaskQuery) -> Iterator[int]:
+        for status in query.statuses:
+            yield from self._by_status[status]
+
+    def _deadline_bounds(self, query: TaskQuery) -> Tuple[int, int]:
+        """Positions in ``_ordinals`` of the days in the query's deadline range."""
+        lo: int = 0
+        hi: int = len(self._ordinals)
+        if query.due_after is not None:
+            lo = bisect_left(self._ordinals, query.due_after.toordinal())
+        if query.due_before is not None:
+            hi = bisect_left(self._ordinals, query.due_before.toordinal())
+        return lo, max(lo, hi)
+
+    def deadline_size(self, query: TaskQuery) -> int:
+        lo, hi = self._deadline_bounds(query)
+        by_deadline = self._by_deadline
+        return sum(len(by_deadline[ordinal]) for ordinal in self._ordinals[lo:hi])
+
+    def iter_deadline(self, query: TaskQuery) -> Iterator[int]:
+        """Task ids in the query's deadline range, by ascending (deadline, id)."""
+        lo, hi = self._deadline_bounds(query)
+        for ordinal in self._ordinals[lo:hi]:
+            yield from self._by_deadline[ordinal]
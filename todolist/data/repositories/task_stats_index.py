@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import date
+from typing import DefaultDict, Dict, Iterable, List, Optional, Tuple
+
+from todolist.core.domain.stats import ProjectStats
+from todolist.core.domain.status import TaskStatus
+from todolist.core.domain.task import Task
+
+# (project id, status, deadline ordinal or 0) of a task
+TaskState = Tuple[int, TaskStatus, int]
+
+
+def task_state(task: Task) -> TaskState:
+    return (task.project_id, task.status, task.deadline.toordinal() if task.deadline else 0)
+
+
+class TaskStatsIndex:
+    """Per-project task counters maintained incrementally by a repository.
+
+    Tasks are edited in place before ``update`` is called, so the repository
+    passes the previously indexed state to ``discard`` and the new one to
+    ``add``. Open (not DONE) deadlines are kept sorted per project, which makes
+    the overdue count a binary search.
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self._counts: DefaultDict[int, int] = defaultdict(int)
+        self._status_counts: DefaultDict[int, Dict[TaskStatus, int]] = defaultdict(lambda: dict.fromkeys(TaskStatus, 0))
+        self._open_deadlines: DefaultDict[int, List[int]] = defaultdict(list)
+
+    def load(self, states: Iterable[TaskState]) -> None:
+        self.clear()
+        deadlines: DefaultDict[int, List[int]] = defaultdict(list)
+        for state in states:
+            self._count(state, 1)
+            if state[2] and state[1] is not TaskStatus.DONE:
+                deadlines[state[0]].append(state[2])
+        for project_id, ordinals in deadlines.items():
+            ordinals.sort()
+            self._open_deadlines[project_id] = ordinals
+
+    def add(self, state: TaskState) -> None:
+        self._count(state, 1)
+        if state[2] and state[1] is not TaskStatus.DONE:
+            insort(self._open_deadlines[state[0]], state[2])
+
+    def discard(self, state: TaskState) -> None:
+        if state[2] and state[1] is not TaskStatus.DONE:
+            ordinals = self._open_deadlines[state[0]]
+            del ordinals[bisect_left(ordinals, state[2])]
+        self._count(state, -1)
+
+    def count(self, project_id: int) -> int:
+        return self._counts.get(project_id, 0)
+
+    def stats(self, project_id: int, today: Optional[date] = None) -> ProjectStats:
+        today = today or date.today()
+        ordinals = self._open_deadlines.get(project_id, [])
+        by_status = self._status_counts.get(project_id)
+        return ProjectStats(
+            project_id = project_id,
+            task_count = self.count(project_id),
+            by_status = dict(by_status) if by_status else dict.fromkeys(TaskStatus, 0),
+            overdue = bisect_left(ordinals, today.toordinal()),
+        )
+
+    def _count(self, state: TaskState, delta: int) -> None:
+        project_id, status, _ = state
+        self._counts[project_id] += delta
+        self._status_counts[project_id][status] += delta
+        if self._counts[project_id] == 0:
+            self._counts.pop(project_id)
+            self._status_counts.pop(project_id, None)
+            self._open_deadlines.pop(project_id, None)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+from typing import Iterable, List, Optional
+
+from todolist.core.domain.project import Project
+from todolist.data.repositories.in_memory_project_repository import InMemoryProjectRepository
+
+
+class ThreadSafeProjectRepository(InMemoryProjectRepository):
+    """In-memory project repository that can be shared between threads.
+
+    Projects are few, so a single re-entrant lock guards every operation; it
+    also makes ``add_if_unique`` and ``update_if_unique`` atomic.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = threading.RLock()
+
+    def _load(self, projects: Iterable[Project]) -> None:
+        with self._lock:
+            super()._load(projects)
+
+    def next_available_id(self) -> int:
+        with self._lock:
+            return super().next_available_id()
+
+    def add(self, project: Project) -> Project:
+        with self._lock:
+            return super().add(project)
+
+    def add_if_unique(self, project: Project, max_projects: Optional[int] = None) -> Project:
+        with self._lock:
+            return super().add_if_unique(project, max_projects)
+
+    def update_if_unique(self, project: Project) -> Project:
+        with self._lock:
+            return super().update_if_unique(project)
+
+    def remove(self, project_id: int) -> bool:
+        with self._lock:
+            return super().remove(project_id)
+
+    def get_by_id(self, project_id: int) -> Optional[Project]:
+        with self._lock:
+            return super().get_by_id(project_id)
+
+    def get_by_name(self, project_name: str) -> Optional[Project]:
+        with self._lock:
+            return super().get_by_name(project_name)
+
+    def list_all_projects(self) -> Iterable[Project]:
+        with self._lock:
+            return super().list_all_projects()
+
+    def page_projects(self, after_id: int = 0, limit: int = 100) -> List[Project]:
+        with self._lock:
+            return super().page_projects(after_id, limit)
+
+    def count(self) -> int:
+        with self._lock:
+            return super().count()
+
+    def update(self, project: Project) -> Project:
+        with self._lock:
+            return super().update(project)
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import threading
+from contextlib import ExitStack
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, TypeVar
+
+from todolist.core.domain.stats import ProjectStats
+from todolist.core.domain.task import Task
+from todolist.core.repositories.task_query import TaskQuery
+from todolist.core.repositories.task_repository import TaskRepository
+from todolist.data.repositories.in_memory_task_repository import InMemoryTaskRepository
+
+T = TypeVar("T")
+
+
+class ThreadSafeTaskRepository(TaskRepository):
+    """In-memory task repository that can be shared between threads.
+
+    Projects map to one of ``stripes`` stripes, each an
+    ``InMemoryTaskRepository`` with its own lock holding the tasks of its
+    projects. Work on a project's tasks, including the check-then-act of
+    ``add_if_under_limit``, holds that stripe's lock alone, so readers and
+    writers of projects on other stripes go ahead. A global lock guards only
+    the id counter and the task id -> project id map routing calls that name
+    a task; it is never held while waiting for a stripe. ``find`` without a
+    project asks the stripes one after another and merges their ordered,
+    limited answers, so it is not a snapshot of every stripe at once.
+
+    Tasks handed out in object mode are the stored instances; edit them only
+    through ``update``.
+    """
+
+    def __init__(self, compact: bool = False, *, stripes: int = 64) -> None:
+        count: int = max(1, stripes)
+        self._stripes = [InMemoryTaskRepository(compact = compact) for _ in range(count)]
+        self._stripe_locks = [threading.RLock() for _ in range(count)]
+        self._lock = threading.Lock()
+        # task id -> project id, for calls naming only a task
+        self._project_of: Dict[int, int] = {}
+        self._next_available_id: int = 1
+
+    def _index(self, project_id: int) -> int:
+        return project_id % len(self._stripes)
+
+    def _stripe_of(self, task_id: int) -> Optional[int]:
+        with self._lock:
+            project_id = self._project_of.get(task_id)
+        return None if project_id is None else self._index(project_id)
+
+    def _on_task(self, task_id: int, action: Callable[[InMemoryTaskRepository], T], missing: T) -> T:
+        """Run ``action`` on the stripe holding ``task_id``, under that stripe's lock."""
+        while True:
+            index = self._stripe_of(task_id)
+            if index is None:
+                return missing
+            with self._stripe_locks[index]:
+                current = self._stripe_of(task_id)
+                if current is None:
+                    return missing
+                if current == index:
+                    return action(self._stripes[index])
+            # the task moved to another stripe before this one was held; retry
+
+    def _put(self, task: Task, *, must_exist: bool, max_tasks: Optional[int] = None) -> Task:
+        """Store ``task`` on its project's stripe, moving it off its previous one."""
+        index = self._index(task.project_id)
+        while True:
+            previous = self._stripe_of(task.id)
+            if previous is None and must_exist:
+                raise ValueError("Task not found.")
+            with ExitStack() as stack:
+                # stripes are always taken in index order so two writers cannot deadlock
+                for stripe in sorted({index, index if previous is None else previous}):
+                    stack.enter_context(self._stripe_locks[stripe])
+                if self._stripe_of(task.id) != previous:
+                    continue
+                stripe = self._stripes[index]
+                if max_tasks is not None and stripe.count_by_project(task.project_id) >= max_tasks:
+                    raise ValueError("You have reached maximum number of tasks per project.")
+                if previous is not None and previous != index:
+                    self._stripes[previous].remove(task.id)
+                    stripe.add(task)
+                elif must_exist:
+                    stripe.update(task)
+                else:
+                    stripe.add(task)
+                with self._lock:
+                    self._project_of[task.id] = task.project_id
+                return task
+
+    def _forget(self, task_ids: Iterable[int]) -> None:
+        with self._lock:
+            for task_id in task_ids:
+                self._project_of.pop(task_id, None)
+
+    def next_available_id(self) -> int:
+        with self._lock:
+            new_id: int = self._next_available_id
+            self._next_available_id += 1
+            return new_id
+
+    def add(self, task: Task) -> Task:
+        return self._put(task, must_exist = False)
+
+    def add_if_under_limit(self, task: Task, max_tasks: int) -> Task:
+        # the stripe keeps the project's count stable between the check and the insert
+        return self._put(task, must_exist = False, max_tasks = max_tasks)
+
+    def update(self, task: Task) -> Task:
+        return self._put(task, must_exist = True)
+
+    def remove(self, task_id: int) -> bool:
+        def remove(stripe: InMemoryTaskRepository) -> bool:
+            removed: bool = stripe.remove(task_id)
+            self._forget((task_id,))
+            return removed
+
+        return self._on_task(task_id, remove, False)
+
+    def remove_by_project(self, project_id: int) -> int:
+        index = self._index(project_id)
+        with self._stripe_locks[index]:
+            stripe = self._stripes[index]
+            task_ids = list(stripe._by_project_id.get(project_id, ()))
+            count: int = stripe.remove_by_project(project_id)
+            self._forget(task_ids)
+            return count
+
+    def pop_by_project(self, project_id: int, limit: int) -> List[Task]:
+        index = self._index(project_id)
+        with self._stripe_locks[index]:
+            tasks = self._stripes[index].pop_by_project(project_id, limit)
+            self._forget(task.id for task in tasks)
+            return tasks
+
+    def get_by_id(self, task_id: int) -> Optional[Task]:
+        return self._on_task(task_id, lambda stripe: stripe.get_by_id(task_id), None)
+
+    def list_by_project(self, project_id: int) -> Iterable[Task]:
+        index = self._index(project_id)
+        with self._stripe_locks[index]:
+            return self._stripes[index].list_by_project(project_id)
+
+    def page_by_project(self, project_id: int, after_id: int = 0, limit: int = 100) -> List[Task]:
+        index = self._index(project_id)
+        with self._stripe_locks[index]:
+            return self._stripes[index].page_by_project(project_id, after_id, limit)
+
+    def find(self, query: TaskQuery) -> List[Task]:
+        if query.project_id is not None:
+            index = self._index(query.project_id)
+            with self._stripe_locks[index]:
+                return self._stripes[index].find(query)
+        # each stripe answers its own first ``limit`` tasks in order; merging those is enough
+        answers: List[Task] = []
+        for lock, stripe in zip(self._stripe_locks, self._stripes):
+            with lock:
+                answers.extend(stripe.find(query))
+        return query.order(answers)
+
+    def project_ids(self) -> Iterable[int]:
+        project_ids: List[int] = []
+        for lock, stripe in zip(self._stripe_locks, self._stripes):
+            with lock:
+                project_ids.extend(stripe.project_ids())
+        return project_ids
+
+    def count_by_project(self, project_id: int) -> int:
+        index = self._index(project_id)
+        with self._stripe_locks[index]:
+            return self._stripes[index].count_by_project(project_id)
+
+    def stats_by_project(self, project_id: int, today: Optional[date] = None) -> ProjectStats:
+        index = self._index(project_id)
+        with self._stripe_locks[index]:
+            return self._stripes[index].stats_by_project(project_id, today)
@@ -0,0 +1,197 @@
+"""Worker processes holding the projects and tasks of the sharded backend.
+
+Each shard is a process with its own in-memory repositories. A project and
+all of its tasks live on shard ``project_id % shards``, so per-project calls
+(listing, counting, stats, the task limit check) run inside one worker while
+the others serve other projects, without sharing the caller's GIL. Calls
+that span projects are sent to every shard at once and their answers merged.
+
+Requests and answers go over a pipe per shard as records (see
+``records.py``), which pickle faster than domain objects. Each pipe serves
+one request at a time; threads calling different shards run in parallel.
+Shard 0 also hands out ids, in blocks of ``IdBlocks.size``, so allocating an
+id costs a round trip once per block instead of once per call. Shards keep
+their data in memory only: it is gone once the pool is closed.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+MAX_SHARDS = 255
+
+
+def _serve(conn: Any, compact: bool) -> None:
+    """Worker loop: answer (operation, arguments) requests until told to stop."""
+    from todolist.data.records import project_from_record, project_to_record, task_from_record, task_to_record
+    from todolist.data.repositories.in_memory_project_repository import InMemoryProjectRepository
+    from todolist.data.repositories.in_memory_task_repository import InMemoryTaskRepository
+
+    projects = InMemoryProjectRepository()
+    tasks = InMemoryTaskRepository(compact = compact)
+    next_ids: Dict[str, int] = {"project": 1, "task": 1}
+
+    def reserve(kind: str, size: int) -> int:
+        first = next_ids[kind]
+        next_ids[kind] = first + size
+        return first
+
+    def project_record(project) -> Optional[list]:
+        return project_to_record(project) if project is not None else None
+
+    def task_record(task) -> Optional[list]:
+        return task_to_record(task) if task is not None else None
+
+    def check_project(name: str) -> tuple:
+        return project_record(projects.get_by_name(name)), projects.count()
+
+    # writes answer None: the caller already holds what was stored
+    def add_project(record: list) -> None:
+        projects.add(project_from_record(record))
+
+    def update_project(record: list) -> None:
+        projects.update(project_from_record(record))
+
+    def add_task(record: list) -> None:
+        tasks.add(task_from_record(record))
+
+    def add_task_if_under_limit(record: list, max_tasks: int) -> None:
+        tasks.add_if_under_limit(task_from_record(record), max_tasks)
+
+    def update_task(record: list) -> None:
+        tasks.update(task_from_record(record))
+
+    handlers: Dict[str, Callable[..., Any]] = {
+        "reserve": reserve,
+        "project.add": add_project,
+        "project.update": update_project,
+        "project.remove": projects.remove,
+        "project.get": lambda project_id: project_record(projects.get_by_id(project_id)),
+        "project.by_name": lambda name: project_record(projects.get_by_name(name)),
+        "project.check": check_project,
+        "project.all": lambda: [project_to_record(p) for p in projects.list_all_projects()],
+        "project.page": lambda after_id, limit: [project_to_record(p) for p in projects.page_projects(after_id, limit)],
+        "project.count": projects.count,
+        "task.add": add_task,
+        "task.add_if_under_limit": add_task_if_under_limit,
+        "task.update": update_task,
+        "task.remove": tasks.remove,
+        "task.remove_by_project": tasks.remove_by_project,
+        "task.pop_by_project": lambda project_id, limit: [task_to_record(t) for t in tasks.pop_by_project(project_id, limit)],
+        "task.get": lambda task_id: task_record(tasks.get_by_id(task_id)),
+        "task.by_project": lambda project_id: [task_to_record(t) for t in tasks.list_by_project(project_id)],
+        "task.page": lambda project_id, after_id, limit: [task_to_record(t) for t in tasks.page_by_project(project_id, after_id, limit)],
+        "task.find": lambda query: [task_to_record(t) for t in tasks.find(query)],
+        "task.count": tasks.count_by_project,
+        "task.project_ids": lambda: list(tasks.project_ids()),
+        "task.stats": tasks.stats_by_project,
+    }
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        operation, args = request
+        try:
+            answer = (True, handlers[operation](*args))
+        except Exception as exc:
+            answer = (False, exc)
+        conn.send(answer)
+    conn.close()
+
+
+class ShardPool:
+    """Worker processes, one pipe each. Thread-safe."""
+
+    def __init__(self, shards: int, *, compact: bool = False) -> None:
+        if not 1 <= shards <= MAX_SHARDS:
+            raise ValueError(f"Number of shards must be between 1 and {MAX_SHARDS}.")
+        # spawned, not forked: the parent may already be running threads
+        context = multiprocessing.get_context("spawn")
+        self._conns: List[Any] = []
+        self._locks: List[threading.Lock] = [threading.Lock() for _ in range(shards)]
+        self._processes: List[Any] = []
+        for i in range(shards):
+            conn, child = context.Pipe()
+            process = context.Process(target = _serve, args = (child, compact), name = f"todolist-shard-{i}", daemon = True)
+            process.start()
+            child.close()
+            self._conns.append(conn)
+            self._processes.append(process)
+        self._closed: bool = False
+
+    @property
+    def shards(self) -> int:
+        return len(self._conns)
+
+    def shard_of(self, project_id: int) -> int:
+        return project_id % len(self._conns)
+
+    def call(self, shard: int, operation: str, *args: Any) -> Any:
+        """Run ``operation`` on one shard; exceptions raised there are raised here."""
+        with self._locks[shard]:
+            conn = self._conns[shard]
+            conn.send((operation, args))
+            ok, value = conn.recv()
+        if not ok:
+            raise value
+        return value
+
+    def call_all(self, operation: str, *args: Any) -> List[Any]:
+        """Run ``operation`` on every shard at once; answers come back in shard order."""
+        # locks are taken in shard order, so concurrent fan-outs cannot deadlock
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            for conn in self._conns:
+                conn.send((operation, args))
+            answers = [conn.recv() for conn in self._conns]
+        finally:
+            for lock in self._locks:
+                lock.release()
+        for ok, value in answers:
+            if not ok:
+                raise value
+        return [value for _, value in answers]
+
+    def close(self) -> None:
+        """Stop the workers; their data is discarded. Safe to call more than once."""
+        if self._closed:
+            return
+        self._closed = True
+        for lock, conn in zip(self._locks, self._conns):
+            with lock:
+                try:
+                    conn.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+                conn.close()
+        for process in self._processes:
+            process.join(timeout = 5)
+            if process.is_alive():
+                process.terminate()
+
+
+class IdBlocks:
+    """Ids of one kind, reserved from shard 0 ``size`` at a time. Thread-safe."""
+
+    size: int = 1024
+
+    def __init__(self, pool: ShardPool, kind: str) -> None:
+        self._pool = pool
+        self._kind = kind
+        self._lock = threading.Lock()
+        self._next: int = 0
+        self._end: int = 0
+
+    def next(self) -> int:
+        with self._lock:
+            if self._next == self._end:
+                self._next = self._pool.call(0, "reserve", self._kind, self.size)
+                self._end = self._next + self.size
+            new_id = self._next
+            self._next += 1
+            return new_id
@@ -0,0 +1,285 @@
+"""Versioned binary snapshot format read through ``mmap``.
+
+Layout (all integers little-endian)::
+
+    header     magic, version, next ids, counts and section offsets
+    projects   fixed-width project records sorted by id
+    tasks      fixed-width task records sorted by (project_id, id)
+    task index (task id, task row) pairs sorted by id
+    strings    UTF-8 string table shared by names and descriptions
+
+Opening a snapshot only reads the header, so it costs the same regardless of
+dataset size. A project's tasks are stored contiguously, so listing them only
+touches that project's pages, and point lookups binary-search the index.
+Records are decoded into ``Project``/``Task`` objects only when accessed.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from todolist.core.domain.project import Project
+from todolist.core.domain.task import Task
+from todolist.data.journal import Journal
+from todolist.data.records import STATUS_CODES, project_from_record, task_from_record
+
+if TYPE_CHECKING:
+    from todolist.data.repositories.snapshot_project_repository import SnapshotProjectRepository
+    from todolist.data.repositories.snapshot_task_repository import SnapshotTaskRepository
+
+MAGIC = b"TDLSNAP\0"
+VERSION = 1
+
+# magic, version, reserved, next project id, next task id, project count, task count,
+# projects offset, tasks offset, task index offset, strings offset
+_HEADER = struct.Struct("<8sIIqqQQQQQQ")
+# id, name offset, name length, description offset, description length, first task row, task count
+_PROJECT = struct.Struct("<qQIQIQQ")
+# id, project id, name offset, name length, description offset, description length, status, deadline ordinal
+_TASK = struct.Struct("<qqQIQIbxxxi")
+# task id, task row
+_INDEX = struct.Struct("<qQ")
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+        self._chunks: List[bytes] = []
+        self._size: int = 0
+
+    def add(self, value: str) -> Tuple[int, int]:
+        location = self._offsets.get(value)
+        if location is None:
+            encoded = value.encode("utf-8")
+            location = (self._size, len(encoded))
+            self._offsets[value] = location
+            self._chunks.append(encoded)
+            self._size += len(encoded)
+        return location
+
+    def tobytes(self) -> bytes:
+        return b"".join(self._chunks)
+
+
+def write_snapshot(
+    path: str,
+    projects: Iterable[Project],
+    tasks: Iterable[Task],
+    *,
+    next_project_id: int = 1,
+    next_task_id: int = 1,
+) -> None:
+    """Write ``projects`` and ``tasks`` to ``path`` atomically."""
+    strings = _StringTable()
+    project_list: List[Project] = sorted(projects, key = lambda p: p.id)
+    task_list: List[Task] = sorted(tasks, key = lambda t: (t.project_id, t.id))
+
+    ranges: Dict[int, List[int]] = {}
+    task_bytes = bytearray(_TASK.size * len(task_list))
+    for row, task in enumerate(task_list):
+        name_off, name_len = strings.add(task.name)
+        desc_off, desc_len = strings.add(task.description)
+        deadline: int = task.deadline.toordinal() if task.deadline else 0
+        _TASK.pack_into(
+            task_bytes, row * _TASK.size, task.id, task.project_id,
+            name_off, name_len, desc_off, desc_len, STATUS_CODES[task.status], deadline,
+        )
+        span = ranges.setdefault(task.project_id, [row, 0])
+        span[1] += 1
+
+    index_bytes = bytearray(_INDEX.size * len(task_list))
+    ordered_rows = sorted(range(len(task_list)), key = lambda r: task_list[r].id)
+    for position, row in enumerate(ordered_rows):
+        _INDEX.pack_into(index_bytes, position * _INDEX.size, task_list[row].id, row)
+
+    project_bytes = bytearray(_PROJECT.size * len(project_list))
+    for row, project in enumerate(project_list):
+        name_off, name_len = strings.add(project.name)
+        desc_off, desc_len = strings.add(project.description)
+        first, count = ranges.get(project.id, (0, 0))
+        _PROJECT.pack_into(project_bytes, row * _PROJECT.size, project.id, name_off, name_len, desc_off, desc_len, first, count)
+
+    projects_off = _HEADER.size
+    tasks_off = projects_off + len(project_bytes)
+    index_off = tasks_off + len(task_bytes)
+    strings_off = index_off + len(index_bytes)
+    header = _HEADER.pack(
+        MAGIC, VERSION, 0, next_project_id, next_task_id, len(project_list), len(task_list),
+        projects_off, tasks_off, index_off, strings_off,
+    )
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as fh:
+        for part in (header, project_bytes, task_bytes, index_bytes, strings.tobytes()):
+            fh.write(part)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp_path, path)
+
+
+class Snapshot:
+    """Read-only view over a snapshot file mapped into memory."""
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access = mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Snapshot file is empty: {path!r}.")
+        (
+            magic, version, _, self.next_project_id, self.next_task_id, self.project_count,
+            self.task_count, self._projects_off, self._tasks_off, self._index_off, self._strings_off,
+        ) = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Not a ToDoList snapshot: {path!r}.")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"Unsupported snapshot version {version}; expected {VERSION}.")
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings_off + offset
+        return self._map[start:start + length].decode("utf-8")
+
+    def project_at(self, row: int) -> Project:
+        project_id, name_off, name_len, desc_off, desc_len, _, _ = _PROJECT.unpack_from(
+            self._map, self._projects_off + row * _PROJECT.size
+        )
+        return project_from_record((project_id, self._string(name_off, name_len), self._string(desc_off, desc_len)))
+
+    def project_row(self, project_id: int) -> Optional[int]:
+        lo, hi = 0, self.project_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            current = _PROJECT.unpack_from(self._map, self._projects_off + mid * _PROJECT.size)[0]
+            if current < project_id:
+                lo = mid + 1
+            elif current > project_id:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    def task_range(self, project_id: int) -> range:
+        """Rows holding the tasks of ``project_id`` (empty if none)."""
+        row = self.project_row(project_id)
+        if row is None:
+            return range(0)
+        first, count = _PROJECT.unpack_from(self._map, self._projects_off + row * _PROJECT.size)[5:]
+        return range(first, first + count)
+
+    def task_project_ids(self) -> Iterator[int]:
+        """Ids of the projects with tasks in the snapshot."""
+        for row in range(self.project_count):
+            record = _PROJECT.unpack_from(self._map, self._projects_off + row * _PROJECT.size)
+            if record[6]:
+                yield record[0]
+
+    def task_id_at(self, row: int) -> int:
+        return _TASK.unpack_from(self._map, self._tasks_off + row * _TASK.size)[0]
+
+    def task_at(self, row: int) -> Task:
+        task_id, project_id, name_off, name_len, desc_off, desc_len, status, deadline = _TASK.unpack_from(
+            self._map, self._tasks_off + row * _TASK.size
+        )
+        return task_from_record((
+            task_id, project_id, self._string(name_off, name_len), self._string(desc_off, desc_len), status, deadline
+        ))
+
+    def task_row(self, task_id: int) -> Optional[int]:
+        lo, hi = 0, self.task_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            current, row = _INDEX.unpack_from(self._map, self._index_off + mid * _INDEX.size)
+            if current < task_id:
+                lo = mid + 1
+            elif current > task_id:
+                hi = mid
+            else:
+                return row
+        return None
+
+    def iter_projects(self) -> Iterator[Project]:
+        for row in range(self.project_count):
+            yield self.project_at(row)
+
+    def iter_tasks(self) -> Iterator[Task]:
+        for row in range(self.task_count):
+            yield self.task_at(row)
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+
+class SnapshotStore:
+    """Snapshot file shared by a project and a task repository.
+
+    Repositories read through ``snapshot`` and keep their own changes in an
+    in-memory overlay. Every change is also appended to the repository's
+    journal next to the snapshot (``project_log``, ``task_log``) and replayed
+    when the store is opened again, so a killed process loses nothing.
+    ``save()`` folds both overlays into a new snapshot file and empties the
+    journals; replaying a journal over the snapshot it was folded into
+    yields the same state. ``close()`` only syncs the journals unless they
+    hold at least ``fold_after`` records and ``fold_ratio`` times the rows of
+    the snapshot, so exiting after a few changes costs no rewrite.
+    """
+
+    def __init__(self, path: str, *, fold_after: int = 10_000, fold_ratio: float = 0.5) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok = True)
+        self.path = path
+        self.snapshot: Optional[Snapshot] = Snapshot(path) if os.path.exists(path) else None
+        base = os.path.splitext(os.path.basename(path))[0]
+        self.project_log = Journal(directory or ".", f"{base}.projects")
+        self.task_log = Journal(directory or ".", f"{base}.tasks")
+        self.project_repo: Optional[SnapshotProjectRepository] = None
+        self.task_repo: Optional[SnapshotTaskRepository] = None
+        self.fold_after = fold_after
+        self.fold_ratio = fold_ratio
+        self._closed: bool = False
+
+    def save(self) -> None:
+        if self.project_repo is None or self.task_repo is None:
+            raise ValueError("Both repositories must be attached before saving.")
+        projects = list(self.project_repo.list_all_projects())
+        project_ids = {project.id for project in projects}
+        write_snapshot(
+            self.path,
+            projects,
+            # tasks of deleted projects not reclaimed yet would have no project row to reach them by
+            (task for task in self.task_repo.iter_all_tasks() if task.project_id in project_ids),
+            next_project_id = self.project_repo.peek_next_id(),
+            next_task_id = self.task_repo.peek_next_id(),
+        )
+        if self.snapshot is not None:
+            self.snapshot.close()
+        self.snapshot = Snapshot(self.path)
+        self.project_repo.reset()
+        self.task_repo.reset()
+        self.project_log.compact(())
+        self.task_log.compact(())
+
+    def needs_fold(self) -> bool:
+        """Whether replaying the journals would cost about as much as writing a new snapshot."""
+        records = self.project_log.records_since_snapshot + self.task_log.records_since_snapshot
+        rows = self.snapshot.project_count + self.snapshot.task_count if self.snapshot is not None else 0
+        return records >= max(self.fold_after, rows * self.fold_ratio)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        if self.project_repo is not None and self.task_repo is not None and self.needs_fold():
+            self.save()
+        if self.snapshot is not None:
+            self.snapshot.close()
+            self.snapshot = None
+        self.project_log.close()
+        self.task_log.close()
+        self._closed = True
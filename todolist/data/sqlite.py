@@ -0,0 +1,162 @@
+"""Shared SQLite connection used by the sqlite repositories.
+
+Both repositories write on one connection so a project cascade and its
+tasks land in the same transaction. Writes are grouped into transactions of
+``batch_size`` statements, committed at the latest ``commit_interval``
+seconds after the first of them (a timer commits a group left open that
+long); ``commit()`` (also called by ``close()``) makes pending writes
+durable at once. A crash therefore loses at most the writes of the last
+``commit_interval`` seconds, up to ``batch_size - 1`` of them, even though
+they were acknowledged. ``transaction()`` instead runs a block of writes as
+one transaction that is rolled back if the block raises.
+
+The database runs in WAL mode. Each thread reads on a connection of its
+own, without waiting for the writer, whenever no write is uncommitted;
+otherwise reads go to the write connection, so they always see every write
+already made.
+
+Statements are issued with constant SQL text, which lets the ``sqlite3``
+statement cache hand back already-prepared statements.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, Sequence
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS projects (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        name_lower TEXT NOT NULL,
+        description TEXT NOT NULL DEFAULT ''
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_projects_name_lower ON projects (name_lower)",
+    """CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY,
+        project_id INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        description TEXT NOT NULL DEFAULT '',
+        status INTEGER NOT NULL,
+        deadline INTEGER
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_project_id ON tasks (project_id, id)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_deadline ON tasks (deadline)",
+)
+
+
+class SqliteDatabase:
+    """A SQLite write connection with batched transactions, and a read connection per thread."""
+
+    def __init__(self, path: str, *, batch_size: int = 1000, commit_interval: float = 0.05) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._path = path
+        # isolation_level=None: transactions are opened explicitly in write()
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False, cached_statements=256)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self.batch_size = max(1, batch_size)
+        self.commit_interval = commit_interval
+        self.lock = threading.RLock()
+        self._pending: int = 0
+        # open transaction() blocks; batches are not committed inside one
+        self._depth: int = 0
+        self._closed: bool = False
+        self._timer: Optional[threading.Timer] = None
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+
+    def _reader(self) -> sqlite3.Connection:
+        """This thread's read connection; the write connection while a write is uncommitted."""
+        if self._conn.in_transaction:
+            return self._conn
+        reader: Optional[sqlite3.Connection] = getattr(self._local, "reader", None)
+        if reader is None:
+            reader = sqlite3.connect(self._path, isolation_level=None, check_same_thread=False, cached_statements=256)
+            self._local.reader = reader
+            with self.lock:
+                self._readers.append(reader)
+        return reader
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        reader = self._reader()
+        if reader is not self._conn:
+            return reader.execute(sql, params).fetchall()
+        with self.lock:
+            # the write may have been committed meanwhile; the write connection still sees it
+            return self._conn.execute(sql, params).fetchall()
+
+    def query_one(self, sql: str, params: Sequence[Any] = ()) -> Optional[tuple]:
+        reader = self._reader()
+        if reader is not self._conn:
+            return reader.execute(sql, params).fetchone()
+        with self.lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def write(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Execute a write inside the current batch; return affected row count."""
+        with self.lock:
+            if not self._conn.in_transaction:
+                self._conn.execute("BEGIN")
+            rowcount: int = self._conn.execute(sql, params).rowcount
+            self._pending += 1
+            if self._pending >= self.batch_size and not self._depth:
+                self.commit()
+            elif self._timer is None and not self._depth:
+                self._timer = threading.Timer(self.commit_interval, self.commit)
+                self._timer.daemon = True
+                self._timer.start()
+            return rowcount
+
+    def commit(self) -> None:
+        with self.lock:
+            if self._depth:
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._conn.in_transaction and not self._closed:
+                self._conn.execute("COMMIT")
+                self._pending = 0
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Commit the writes of the block together, or roll them back if it raises.
+
+        Blocks nest; only the outermost one commits. The connection lock is
+        held throughout, so other threads' writes cannot join the transaction.
+        """
+        with self.lock:
+            if not self._depth:
+                # close the running batch so it is not rolled back with this block
+                self.commit()
+                self._conn.execute("BEGIN")
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if not self._depth:
+                    self._conn.execute("ROLLBACK")
+                    self._pending = 0
+                raise
+            self._depth -= 1
+            if not self._depth:
+                self.commit()
+
+    def close(self) -> None:
+        with self.lock:
+            if self._closed:
+                return
+            self.commit()
+            self._conn.close()
+            for reader in self._readers:
+                reader.close()
+            self._closed = True
@@ -0,0 +1 @@
+"""Opt-in latency, call and error metrics for service and repository methods."""
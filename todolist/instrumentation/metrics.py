@@ -0,0 +1,138 @@
+"""Latency histograms and counters per instrumented method, in Prometheus text format.
+
+Each (component, method) pair gets a ``Series``: a fixed-bucket latency
+histogram whose count is the number of calls, plus an error counter.
+``Registry.render()`` produces the Prometheus text exposition format, and
+``write_metrics`` puts it on stdout or replaces a file atomically so a
+scraper never reads half a file.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+# upper bounds in seconds, roughly 1-2.5-5 steps from 1 us to 10 s
+BUCKETS: Tuple[float, ...] = tuple(
+    round(m * 10.0 ** e, 9) for e in range(-6, 1) for m in (1, 2.5, 5)
+) + (10.0,)
+
+
+class Series:
+    """Latency histogram and error count of one method.
+
+    Updates take no lock: under the GIL an increment is only lost if a
+    thread switch lands inside a single ``+=``, which is rare enough for
+    metrics and keeps the cost per call down.
+    """
+
+    __slots__ = ("counts", "sum", "errors")
+
+    def __init__(self) -> None:
+        # one slot per bucket plus +Inf
+        self.counts: List[int] = [0] * (len(BUCKETS) + 1)
+        self.sum: float = 0.0
+        self.errors: int = 0
+
+    def observe(self, seconds: float, failed: bool = False) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        if failed:
+            self.errors += 1
+
+    @property
+    def calls(self) -> int:
+        return sum(self.counts)
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        return list(self.counts), self.sum, self.errors
+
+
+class Registry:
+    """All series of a session, keyed by (component, method)."""
+
+    def __init__(self, prefix: str = "todolist") -> None:
+        self.prefix = prefix
+        self._series: Dict[Tuple[str, str], Series] = {}
+        self._lock = threading.Lock()
+
+    def series(self, component: str, method: str) -> Series:
+        with self._lock:
+            return self._series.setdefault((component, method), Series())
+
+    def items(self) -> List[Tuple[Tuple[str, str], Series]]:
+        with self._lock:
+            return sorted(self._series.items())
+
+    def render(self) -> str:
+        """Every series with calls, in the Prometheus text exposition format."""
+        calls = f"{self.prefix}_call_duration_seconds"
+        errors = f"{self.prefix}_call_errors_total"
+        histogram_lines: List[str] = [
+            f"# HELP {calls} Latency of service and repository calls; _count is the number of calls.",
+            f"# TYPE {calls} histogram",
+        ]
+        error_lines: List[str] = [
+            f"# HELP {errors} Calls that raised an exception.",
+            f"# TYPE {errors} counter",
+        ]
+        for (component, method), series in self.items():
+            counts, total, failed = series.snapshot()
+            if not any(counts):
+                continue
+            labels = f'component="{_escape(component)}",method="{_escape(method)}"'
+            cumulative: int = 0
+            for bound, count in zip(BUCKETS, counts):
+                cumulative += count
+                histogram_lines.append(f'{calls}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+            cumulative += counts[-1]
+            histogram_lines.append(f'{calls}_bucket{{{labels},le="+Inf"}} {cumulative}')
+            histogram_lines.append(f"{calls}_sum{{{labels}}} {total:.9g}")
+            histogram_lines.append(f"{calls}_count{{{labels}}} {cumulative}")
+            error_lines.append(f"{errors}{{{labels}}} {failed}")
+        return "\n".join(histogram_lines + error_lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def write_metrics(registry: Registry, path: str) -> None:
+    """Write ``registry`` to ``path``, or to stdout when ``path`` is ``-``."""
+    text: str = registry.render()
+    if path == "-":
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        return
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok = True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding = "utf-8") as f:
+        f.write(text)
+    os.replace(temporary, path)
+
+
+class MetricsWriter:
+    """Background thread rewriting the metrics file every ``interval`` seconds."""
+
+    def __init__(self, registry: Registry, path: str, interval: float) -> None:
+        self._registry = registry
+        self._path = path
+        self._interval = max(0.1, interval)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target = self._run, name = "todolist-metrics", daemon = True)
+
+    def start(self) -> MetricsWriter:
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            write_metrics(self._registry, self._path)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
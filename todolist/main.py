@@ -1,32 +1,182 @@
 """Application entry point for the ToDoList CLI (Phase 1).
 
-Wires configuration, repositories, services, and starts a minimal CLI menu.
+Wires configuration, repositories, services, and starts a minimal CLI menu
+or runs the command given on the command line. ``wire`` builds the
+repositories and services the way the CLI runs them, for benchmarks too. Modules beyond argument
+parsing are imported once a command needs them, so ``--help`` and argument
+errors return quickly.
 """
 from __future__ import annotations
 
-from todolist.cli.menu import run_menu
-from todolist.config.settings import Settings
-from todolist.core.services.project_service import ProjectService
-from todolist.core.services.task_service import TaskService
-from todolist.data.repositories.in_memory_project_repository import InMemoryProjectRepository
-from todolist.data.repositories.in_memory_task_repository import InMemoryTaskRepository
+import argparse
+import sys
+from typing import TYPE_CHECKING, List, NamedTuple, Optional
 
+from todolist.cli.commands import parse_args, run_command
 
-def main() -> None:
+if TYPE_CHECKING:
+    from todolist.config.settings import Settings
+    from todolist.core.repositories.project_repository import ProjectRepository
+    from todolist.core.repositories.task_repository import TaskRepository
+    from todolist.core.services.project_service import ProjectService
+    from todolist.core.services.task_service import TaskService
+    from todolist.core.services.version_service import VersionTracker
+
+
+def main(argv: Optional[List[str]] = None) -> int:
     """Initialize application components and run the CLI."""
+    args = parse_args(argv)
+    if args.profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(_run, args)
+        finally:
+            profiler.dump_stats(args.profile)
+    return _run(args)
+
+
+class Services(NamedTuple):
+    """What ``wire`` builds. ``project_repo`` and ``task_repo`` are the outermost wrappers."""
+
+    projects: ProjectService
+    tasks: TaskService
+    project_repo: ProjectRepository
+    task_repo: TaskRepository
+    versions: Optional[VersionTracker]
+
+    def close(self) -> None:
+        self.task_repo.close()
+        self.project_repo.close()
+        if self.versions is not None:
+            self.versions.close()
+
+
+def wire(
+    settings: Settings,
+    *,
+    thread_safe: bool = False,
+    search: bool = True,
+    deadlines: bool = True,
+    versions: bool = True,
+    reclaim: bool = True,
+    units: bool = True,
+    instrument: bool = False,
+) -> Services:
+    """Repositories and services as the CLI runs them; the flags leave out what a command does not use.
+
+    Persistent backends track versions whatever ``versions`` says, so every
+    write is stamped. ``instrument`` wraps the repositories, search,
+    deadlines and services for the active metrics registry. Raises
+    ValueError if the backend cannot be opened.
+    """
+    from todolist.core.services.project_service import ProjectService
+    from todolist.core.services.task_service import TaskService
+    from todolist.data.factory import create_repositories, create_version_log
+
+    # persistent stores stamp every write, so a later export --since sees it
+    version_log = create_version_log(settings)
+    feed = None
+    if versions or version_log is not None:
+        from todolist.core.repositories.change_feed import ChangeFeed
+
+        # every write is published to the feed, which stamps store versions on it
+        feed = ChangeFeed()
+    try:
+        project_repo, task_repo = create_repositories(settings, thread_safe = thread_safe, feed = feed)
+    except ValueError:
+        if version_log is not None:
+            version_log.close()
+        raise
+    reclaimer = None
+    if reclaim:
+        from todolist.core.repositories.reclaiming import ReclaimingTaskRepository
+
+        # deleted projects' tasks are hidden at once and freed in chunks, on a
+        # background thread when the repositories are shared between threads
+        # tasks of projects deleted by a run that stopped before freeing them are picked up again
+        task_repo = reclaimer = ReclaimingTaskRepository(task_repo, background = thread_safe, project_repo = project_repo)
+    tracker = None
+    if feed is not None:
+        from todolist.core.services.version_service import VersionTracker
+
+        tracker = VersionTracker(feed, project_repo, task_repo, log = version_log)
+
+    wrap = lambda component: component
+    if instrument:
+        from todolist.instrumentation.hooks import instrument as wrap
+
+        project_repo = wrap(project_repo)
+        task_repo = wrap(task_repo)
+
+    search_service = deadline_scheduler = None
+    if search:
+        from todolist.core.services.search_service import SearchService
+
+        search_service = wrap(SearchService(project_repo, task_repo))
+    if deadlines:
+        from todolist.core.services.deadline_service import DeadlineScheduler
+
+        deadline_scheduler = wrap(DeadlineScheduler(task_repo))
+    project_view, task_view, uow = project_repo, task_repo, None
+    if units:
+        from todolist.core.repositories.unit_of_work import UnitOfWork
+
+        # services write through the unit of work so grouped writes commit or roll back together
+        uow = UnitOfWork(project_repo, task_repo)
+        project_view, task_view = uow.projects, uow.tasks
+    project_service = ProjectService(project_view, task_view, settings=settings, search=search_service, uow=uow, deadlines=deadline_scheduler, versions=tracker, reclaimer=reclaimer)
+    task_service = TaskService(task_view, project_view, settings=settings, search=search_service, uow=uow, deadlines=deadline_scheduler, versions=tracker)
+    return Services(wrap(project_service), wrap(task_service), project_repo, task_repo, tracker)
+
+
+def _run(args: argparse.Namespace) -> int:
+    from todolist.config.settings import Settings
+
     settings = Settings.load()
 
-    project_repo = InMemoryProjectRepository()
-    task_repo = InMemoryTaskRepository()
+    registry = None
+    if args.metrics:
+        from todolist.instrumentation.hooks import enable
 
-    project_service = ProjectService(project_repo, task_repo, settings=settings)
-    task_service = TaskService(task_repo, project_repo, settings=settings)
+        registry = enable()
+    # scripts, the server and the menu may run any operation; a single command
+    # gets only the collaborators it uses
+    operation: Optional[str] = getattr(args, "operation", None)
+    everything: bool = args.command in (None, "run", "serve")
+    try:
+        services = wire(
+            settings,
+            # server workers share the repositories between threads
+            thread_safe=args.command == "serve" and args.workers > 1,
+            search=everything or operation == "search",
+            deadlines=everything or operation in ("task.due", "task.overdue"),
+            versions=everything or getattr(args, "since", None) is not None,
+            reclaim=everything or operation == "project.delete",
+            units=everything or args.command == "import" or operation == "project.delete",
+            instrument=registry is not None,
+        )
+    except ValueError as exc:
+        print(f"Error: {exc}", file = sys.stderr)
+        return 2
 
-    print("ToDoList CLI (Phase 1 - In-Memory)")
-    run_menu(project_service, task_service)
+    try:
+        if args.command:
+            return run_command(args, services.projects, services.tasks)
+        from todolist.cli.menu import run_menu
 
+        print(f"ToDoList CLI (Phase 1 - {settings.STORAGE_BACKEND} storage)")
+        run_menu(services.projects, services.tasks)
+        return 0
+    finally:
+        services.close()
+        if registry is not None:
+            from todolist.instrumentation.metrics import write_metrics
+
+            write_metrics(registry, args.metrics)
 
-if __name__ == "__main__":
-    main()
 
+if __name__ == "__main__":
+    sys.exit(main())
 
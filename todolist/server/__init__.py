@@ -0,0 +1 @@
+"""Long-running JSON-RPC server exposing the services over a Unix socket."""
@@ -0,0 +1,108 @@
+"""Blocking client for the JSON-RPC server.
+
+    with Client(".todolist/todolist.sock") as client:
+        project = client.call("project.create", name = "Home")
+        results = client.batch([
+            ("task.add", {"project": project["id"], "name": "Water plants"}),
+            ("task.add", {"project": project["id"], "name": "Fix the door"}),
+        ])
+
+One client holds one persistent connection; it is not meant to be shared
+between threads without a lock, open one client per thread instead.
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import socket
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+Params = Union[Sequence[Any], Dict[str, Any]]
+
+
+class RpcError(ValueError):
+    """Error answer of the server; ``code`` is the JSON-RPC error code."""
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class Client:
+
+    def __init__(self, path: str, *, timeout: Optional[float] = None) -> None:
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        try:
+            self._sock.connect(path)
+        except OSError:
+            self._sock.close()
+            raise
+        self._file = self._sock.makefile("rwb")
+        self._ids = itertools.count(1)
+
+    def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Call ``method`` with positional or keyword params and return its result."""
+        if args and kwargs:
+            raise ValueError("Pass params either by position or by name, not both.")
+        request_id = next(self._ids)
+        self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": kwargs or list(args)})
+        return _result(self._receive(), request_id)
+
+    def notify(self, method: str, *args: Any, **kwargs: Any) -> None:
+        """Call ``method`` without waiting for, or receiving, an answer."""
+        if args and kwargs:
+            raise ValueError("Pass params either by position or by name, not both.")
+        self._send({"jsonrpc": "2.0", "method": method, "params": kwargs or list(args)})
+
+    def batch(self, calls: Iterable[Tuple[str, Params]]) -> List[Any]:
+        """Send (method, params) pairs as one batch; run in order on the server.
+
+        Returns the results in call order. A call that failed yields its
+        ``RpcError`` in place of a result instead of raising, so one rejected
+        call does not hide the outcome of the others.
+        """
+        requests = [{"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params} for method, params in calls]
+        if not requests:
+            return []
+        self._send(requests)
+        answer = self._receive()
+        if isinstance(answer, dict):
+            # the batch as a whole was rejected
+            raise RpcError(answer["error"]["code"], answer["error"]["message"])
+        by_id = {response.get("id"): response for response in answer}
+        results: List[Any] = []
+        for request in requests:
+            try:
+                results.append(_result(by_id[request["id"]], request["id"]))
+            except RpcError as exc:
+                results.append(exc)
+        return results
+
+    def _send(self, message: Any) -> None:
+        self._file.write(json.dumps(message, separators = (",", ":")).encode() + b"\n")
+        self._file.flush()
+
+    def _receive(self) -> Any:
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection.")
+        return json.loads(line)
+
+    def close(self) -> None:
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _result(response: Dict[str, Any], request_id: int) -> Any:
+    if "error" in response:
+        raise RpcError(response["error"]["code"], response["error"]["message"])
+    if response.get("id") != request_id:
+        raise ConnectionError(f"Answer to request {response.get('id')} received while waiting for {request_id}.")
+    return response["result"]
@@ -0,0 +1,89 @@
+"""JSON-RPC 2.0 dispatch of service operations.
+
+Messages are framed one per line: a request object or a batch array per line
+in, a response object or array per line out. Methods are the operations of
+``todolist.core.services.operations``, with parameters passed by name or by
+position. Service errors (``ValueError``) come back with code ``REJECTED``
+and the service message.
+"""
+from __future__ import annotations
+
+import inspect
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+# a service rejected the call; the message is the service's own
+REJECTED = 1
+
+Message = Dict[str, Any]
+
+
+def error_response(request_id: Any, code: int, message: str) -> Message:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+@dataclass
+class _Method:
+    fn: Callable[..., Any]
+    signature: inspect.Signature
+
+
+class Dispatcher:
+    """Runs JSON-RPC requests against a method table.
+
+    A batch is handled in order on the calling thread, so a client can rely on
+    e.g. ``project.create`` taking effect before a ``task.add`` that follows
+    it in the same batch.
+    """
+
+    def __init__(self, methods: Mapping[str, Callable[..., Any]]) -> None:
+        self._methods: Dict[str, _Method] = {name: _Method(fn, inspect.signature(fn)) for name, fn in methods.items()}
+
+    def handle(self, line: bytes) -> Optional[bytes]:
+        """Answer one framed message; ``None`` when it held only notifications."""
+        try:
+            payload = json.loads(line)
+        except ValueError:
+            return encode_message(error_response(None, PARSE_ERROR, "Parse error"))
+        if isinstance(payload, list):
+            if not payload:
+                return encode_message(error_response(None, INVALID_REQUEST, "Invalid Request"))
+            responses = [r for r in map(self.call, payload) if r is not None]
+            return encode_message(responses) if responses else None
+        response = self.call(payload)
+        return None if response is None else encode_message(response)
+
+    def call(self, request: Any) -> Optional[Message]:
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" or not isinstance(request.get("method"), str):
+            return error_response(request.get("id") if isinstance(request, dict) else None, INVALID_REQUEST, "Invalid Request")
+        is_notification: bool = "id" not in request
+        request_id = request.get("id")
+        method = self._methods.get(request["method"])
+        params = request.get("params", [])
+        if method is None:
+            response = error_response(request_id, METHOD_NOT_FOUND, f"Method not found: {request['method']}")
+        elif not isinstance(params, (list, dict)):
+            response = error_response(request_id, INVALID_REQUEST, "Invalid Request")
+        else:
+            try:
+                bound = method.signature.bind(*params) if isinstance(params, list) else method.signature.bind(**params)
+            except TypeError as exc:
+                response = error_response(request_id, INVALID_PARAMS, f"Invalid params: {exc}")
+            else:
+                try:
+                    response = {"jsonrpc": "2.0", "id": request_id, "result": method.fn(*bound.args, **bound.kwargs)}
+                except ValueError as exc:
+                    response = error_response(request_id, REJECTED, str(exc))
+                except Exception as exc:
+                    response = error_response(request_id, INTERNAL_ERROR, f"{type(exc).__name__}: {exc}")
+        return None if is_notification else response
+
+
+def encode_message(message: Union[Message, List[Message]]) -> bytes:
+    return json.dumps(message, separators = (",", ":")).encode()
@@ -0,0 +1,108 @@
+"""Unix socket server answering newline-framed JSON-RPC messages.
+
+Connections are persistent: a client may send any number of messages, and
+may pipeline them without waiting for answers, which come back in order.
+Each message is handled on a bounded worker pool, so a slow call delays only
+its own connection. With more than one worker the services must sit on
+thread-safe repositories (``create_repositories(settings, thread_safe = True)``).
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+import socket
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Set
+
+from todolist.server.rpc import PARSE_ERROR, Dispatcher, error_response, encode_message
+
+# longest message accepted, which bounds the size of a batch
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+class RpcServer:
+
+    def __init__(self, dispatcher: Dispatcher, path: str, *, workers: int = 4) -> None:
+        self.dispatcher = dispatcher
+        self.path = path
+        self.workers: int = max(1, workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._connections: Set[asyncio.Task] = set()
+
+    async def serve(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Listen until ``stop`` is set, or SIGINT/SIGTERM when none is given."""
+        _claim_socket_path(self.path)
+        if stop is None:
+            stop = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(signum, stop.set)
+        self._executor = ThreadPoolExecutor(max_workers = self.workers, thread_name_prefix = "todolist-rpc")
+        server = await asyncio.start_unix_server(self._on_connect, path = self.path, limit = MAX_MESSAGE_BYTES)
+        # the socket is the only access control: keep it private to the owner
+        os.chmod(self.path, 0o600)
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            for connection in list(self._connections):
+                connection.cancel()
+            await asyncio.gather(*self._connections, return_exceptions = True)
+            self._executor.shutdown(wait = True)
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    async def _on_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # over MAX_MESSAGE_BYTES: the framing is lost, so answer and hang up
+                    writer.write(encode_message(error_response(None, PARSE_ERROR, "Message too large")) + b"\n")
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response = await loop.run_in_executor(self._executor, self.dispatcher.handle, line)
+                if response is not None:
+                    writer.write(response + b"\n")
+                    await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(connection)
+            writer.close()
+
+
+def _claim_socket_path(path: str) -> None:
+    """Remove a socket left behind by a dead server; refuse if one still answers."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok = True)
+    if not os.path.exists(path):
+        return
+    if not stat.S_ISSOCK(os.stat(path).st_mode):
+        raise ValueError(f"{path} exists and is not a socket.")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise ValueError(f"A server is already listening on {path}.")
+
+
+def serve(dispatcher: Dispatcher, path: str, *, workers: int = 4) -> None:
+    """Run a server in the foreground until interrupted."""
+    if not hasattr(socket, "AF_UNIX"):
+        raise ValueError("Unix domain sockets are not supported on this platform.")
+    asyncio.run(RpcServer(dispatcher, path, workers = workers).serve())